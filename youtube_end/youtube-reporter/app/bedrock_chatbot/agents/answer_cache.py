@@ -0,0 +1,181 @@
+# agents/answer_cache.py
+import hashlib
+import re
+import sys
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+# 상위 디렉토리의 app.core를 사용하기 위한 경로 설정
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from app.core.redis_client import redis_client
+from retrievers.segment_ranker import hash_embedding
+
+VERSION_KEY = "bedrock:kb_version"
+ANSWER_TTL = 86400          # 정확 일치 캐시 TTL (24시간)
+EMBEDDING_DIM = 512         # 문자 n-gram 해싱 임베딩 차원
+SIMILARITY_THRESHOLD = 0.75 # 의미 유사 질문 판정 코사인 유사도 (내용어 순서열 일치가 전제 - 기능어 차이 허용 한도)
+MAX_SEMANTIC_ENTRIES = 2000 # 워커별 의미 인덱스 최대 크기
+
+# 내용어 비교에서 빼는 기능어 (부정어 not/안/못/없/않, 의문사 what/why/무엇/왜 등은 의미를 바꾸므로 포함하지 않음)
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "do", "does", "did",
+    "please", "can", "could", "would", "you", "me", "i", "tell", "explain", "about",
+    "좀", "혹시", "요", "주세요", "알려주세요", "알려줘", "설명해주세요", "설명해줘", "궁금합니다", "궁금해요"
+})
+
+def normalize_question(question: str) -> str:
+    """캐시 키용 질문 정규화 (NFKC, 소문자, 구두점/공백 정리)"""
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def content_tokens(normalized: str) -> tuple:
+    """기능어를 뺀 내용어 순서열 - 어순이 바뀌면 ("A가 B보다" ↔ "B가 A보다") 달라진다"""
+    return tuple(token for token in normalized.split() if token not in STOPWORDS)
+
+def embed_question(normalized: str) -> np.ndarray:
+    """질문 로컬 임베딩 (문자 n-gram 해싱)"""
+    return hash_embedding(normalized, EMBEDDING_DIM)
+
+class AnswerCache:
+    """챗봇 답변 2단계 캐시
+
+    1단계: 정규화된 질문 정확 일치 (Redis, 워커 간 공유)
+    2단계: 로컬 임베딩 코사인 유사도 기반 근사 일치 (워커별 인메모리 인덱스)
+           - 문자 n-gram 유사도만으로는 "A가 B보다 빠른가"/"B가 A보다 빠른가"가 구분되지 않으므로
+             내용어 순서열이 완전히 같은 질문(기능어만 다른 질문) 중에서만 임계값을 적용한다.
+    모든 키는 KB 콘텐츠 버전에 묶여 있어 Ingestion 완료 시 bump_version()으로 무효화된다.
+    """
+
+    def __init__(self):
+        self.redis = redis_client
+        self._lock = threading.Lock()
+        self._index_version = None
+        self._index = OrderedDict()  # answer_key -> (내용어 순서열, embedding)
+        self._stats = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "hit_latency_ms_total": 0.0,
+            "miss_latency_ms_total": 0.0
+        }
+
+    def _version(self) -> str:
+        try:
+            return str(self.redis.get(VERSION_KEY) or 0)
+        except Exception as e:
+            print(f"⚠️ KB 버전 조회 실패 (캐시 우회): {e}")
+            return None
+
+    def _answer_key(self, version: str, normalized: str) -> str:
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return f"bedrock:answer:{version}:{digest}"
+
+    def _reset_index_if_stale(self, version: str):
+        if self._index_version != version:
+            self._index.clear()
+            self._index_version = version
+
+    def _find_similar(self, tokens: tuple, embedding: np.ndarray):
+        """내용어 순서열이 같은 캐시 질문 중 가장 유사한 것의 answer_key (임계값 미만이면 None)"""
+        if not tokens:
+            return None
+        candidates = [(key, vector) for key, (entry_tokens, vector) in self._index.items() if entry_tokens == tokens]
+        if not candidates:
+            return None
+        similarities = np.stack([vector for _, vector in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] >= SIMILARITY_THRESHOLD:
+            return candidates[best][0]
+        return None
+
+    def get(self, question: str):
+        """캐시된 답변 조회 (없으면 None)"""
+        start = time.perf_counter()
+        version = self._version()
+        if version is None:
+            return None
+
+        normalized = normalize_question(question)
+        answer_key = self._answer_key(version, normalized)
+        hit_type = None
+        try:
+            answer = self.redis.get(answer_key)
+            if answer is not None:
+                hit_type = "exact_hits"
+            else:
+                with self._lock:
+                    self._reset_index_if_stale(version)
+                    similar_key = self._find_similar(content_tokens(normalized), embed_question(normalized))
+                if similar_key:
+                    answer = self.redis.get(similar_key)
+                    if answer is not None:
+                        hit_type = "semantic_hits"
+        except Exception as e:
+            print(f"⚠️ 답변 캐시 조회 실패 (무시됨): {e}")
+            answer = None
+
+        with self._lock:
+            if hit_type:
+                self._stats[hit_type] += 1
+                self._stats["hit_latency_ms_total"] += (time.perf_counter() - start) * 1000
+            else:
+                self._stats["misses"] += 1
+        return answer
+
+    def put(self, question: str, answer: str, elapsed_ms: float = 0.0):
+        """답변 저장 (elapsed_ms: 캐시 미스 시 답변 생성에 걸린 시간)"""
+        with self._lock:
+            self._stats["miss_latency_ms_total"] += elapsed_ms
+
+        version = self._version()
+        if version is None or not answer:
+            return
+
+        normalized = normalize_question(question)
+        answer_key = self._answer_key(version, normalized)
+        try:
+            self.redis.set_with_ttl(answer_key, answer, ANSWER_TTL)
+        except Exception as e:
+            print(f"⚠️ 답변 캐시 저장 실패 (무시됨): {e}")
+            return
+
+        with self._lock:
+            self._reset_index_if_stale(version)
+            self._index[answer_key] = (content_tokens(normalized), embed_question(normalized))
+            self._index.move_to_end(answer_key)
+            while len(self._index) > MAX_SEMANTIC_ENTRIES:
+                self._index.popitem(last=False)
+
+    def bump_version(self):
+        """KB 콘텐츠 변경(Ingestion 완료) 시 호출 - 이전 버전 캐시 전체 무효화"""
+        try:
+            self.redis.redis.incr(VERSION_KEY)
+        except Exception as e:
+            print(f"⚠️ KB 버전 갱신 실패: {e}")
+
+    def stats(self) -> dict:
+        """적중률 / 지연 시간 지표"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["semantic_index_size"] = len(self._index)
+        hits = stats["exact_hits"] + stats["semantic_hits"]
+        total = hits + stats["misses"]
+        return {
+            "kb_version": self._version(),
+            "requests": total,
+            "exact_hits": stats["exact_hits"],
+            "semantic_hits": stats["semantic_hits"],
+            "misses": stats["misses"],
+            "hit_rate": hits / total if total else 0.0,
+            "avg_hit_latency_ms": stats["hit_latency_ms_total"] / hits if hits else 0.0,
+            "avg_miss_latency_ms": stats["miss_latency_ms_total"] / stats["misses"] if stats["misses"] else 0.0,
+            "semantic_index_size": stats["semantic_index_size"]
+        }
+
+answer_cache = AnswerCache()
@@ -1,87 +1,32 @@
 #agents/bedrock_agent.py
 from chains.qa_chain import build_qa_chain
 from retrievers.kb_retriever import get_kb_retriever, get_llm
+from retrievers.local_retriever import get_local_retriever
+from app.core.config import settings
+from retrievers.segment_ranker import select_best_segments
+from retrievers.context_packer import pack_context
+from agents.answer_cache import answer_cache, normalize_question
 import re
+import time
 
 # 검색 score 기준 (이하일 경우 실패로 간주)
 RELEVANCE_THRESHOLD = 0.5
 
-def extract_best_time_and_text_with_ai(content: str, question: str, llm) -> str:
-    """AI를 활용하여 질문과 가장 관련있는 자막 구문을 선택"""
-    pattern = r'\[at (\d+\.?\d*) seconds?\]\s*([^\n\r]+)'
-    matches = re.findall(pattern, content)
-    
-    if not matches:
-        return "시간 정보 없음"
-    
-    if len(matches) == 1:
-        # 하나만 있으면 바로 반환
-        #123.45초를 "2분 3초" 식으로 보기 좋게 바꾸는 거야
-        # 즉, 시간을 사람이 이해하기 쉬운 형식으로 변환
-        sec, txt = matches[0]
-        seconds = float(sec)
-        minutes = int(seconds // 60)
-        remaining_seconds = int(seconds % 60)
-        if minutes > 0:
-            time_str = f"{minutes}:{remaining_seconds:02d}"
-        else:
-            time_str = f"{remaining_seconds}초"
-        return f"{time_str}: {txt.strip()}"
-    
-    # 여러 개가 있으면 AI로 평가
-    try:
-        # 각 구문을 평가할 프롬프트 생성
-        evaluation_prompt = f"""
-다음 질문과 가장 관련있는 자막 구문을 선택해주세요.
-
-질문: {question}
-
-자막 구문들:
-"""
-        for i, (sec, txt) in enumerate(matches, 1):
-            evaluation_prompt += f"{i}. {txt.strip()}\n"
-        
-        evaluation_prompt += """
-위 자막 구문들 중에서 질문과 가장 관련있는 구문의 번호만 숫자로 답해주세요.
-"""
-        # AI 평가
-        response = llm.invoke(evaluation_prompt)
-        if hasattr(response, 'content'):
-            result = response.content.strip()
-        else:
-            result = str(response).strip()
-        
-        # 숫자 추출
-        # 이건 Claude가 준 **"답변 문자열"**에서
-        # 숫자만 뽑아내서 → 몇 번째 문장을 선택했는지 파악
-        # 그 다음에 해당 matches[index]를 다시 꺼내서 위처럼 시간 형식으로 출력
-        number_match = re.search(r'\d+', result)
-        if number_match:
-            selected_idx = int(number_match.group()) - 1
-            if 0 <= selected_idx < len(matches):
-                sec, txt = matches[selected_idx]
-                seconds = float(sec)
-                minutes = int(seconds // 60)
-                remaining_seconds = int(seconds % 60)
-                if minutes > 0:
-                    time_str = f"{minutes}:{remaining_seconds:02d}"
-                else:
-                    time_str = f"{remaining_seconds}초"
-                return f"{time_str}: {txt.strip()}"
-    
-    except Exception as e:
-        print(f"   - ⚠️ AI 평가 중 오류: {e}")
-    
-    # AI 평가 실패시 첫 번째 구문 반환
-    sec, txt = matches[0]
-    seconds = float(sec)
-    minutes = int(seconds // 60)
-    remaining_seconds = int(seconds % 60)
-    if minutes > 0:
-        time_str = f"{minutes}:{remaining_seconds:02d}"
-    else:
-        time_str = f"{remaining_seconds}초"
-    return f"{time_str}: {txt.strip()}"
+# 로컬 자막 인덱스 점수 기준 (이상이면 KB 호출 없이 로컬 결과 사용)
+# 무관한 질문은 일반 어휘("어떻게", "좋습니다")만 겹쳐도 ~0.2까지 나오므로 그 위로 설정
+LOCAL_SCORE_THRESHOLD = 0.25
+
+# 이전 대화를 가리키는 질문 표현 (지시어, "아까/방금" 등) - 이런 질문만 캐시를 우회
+FOLLOW_UP_PATTERN = re.compile(
+    r'(^|\s)(그|저)(\s|것|거|건|게|걸|럼|러면|래서|런데|렇|분|때|중|쪽)'
+    r'|아까|방금|앞서|앞에서|위에서|이전|다시|더\s*자세히|계속'
+    r'|\b(it|that|this|these|those|they|them|he|she|above|previous|earlier|again|more)\b',
+    re.IGNORECASE
+)
+FOLLOW_UP_MAX_TOKENS = 2  # "왜?", "예시는?"처럼 짧은 질문도 맥락 의존으로 간주
+
+# 관련 자막 구문 선택 방식 ("lexical": 로컬 BM25, LLM 호출 없음 / "llm": 전체 문서 1회 일괄 평가 후 context 구간에 반영)
+SEGMENT_RANKER = "lexical"
 
 def extract_video_id_from_content(content: str) -> str:
     """자막 내용에서 비디오 ID나 파일명 추출 시도"""
@@ -94,54 +39,116 @@ def extract_video_id_from_content(content: str) -> str:
     
     return "동영상 정보 없음"
 
-def answer_question(question: str):
-    retriever = get_kb_retriever()
-    llm = get_llm()
+def refers_to_history(question: str) -> bool:
+    """질문이 이전 대화 맥락 없이는 뜻이 정해지지 않는지 (후속 질문이면 캐시 답변을 쓰면 안 됨)"""
+    normalized = normalize_question(question)
+    return len(normalized.split()) <= FOLLOW_UP_MAX_TOKENS or bool(FOLLOW_UP_PATTERN.search(normalized))
 
-    docs = retriever(question)
+def build_retrieval_query(question: str, history: list = None) -> str:
+    """후속 질문("그건 왜?")도 검색되도록 직전 사용자 질문을 검색어에 덧붙임"""
+    previous_questions = [content for role, content in (history or []) if role == "human"]
+    if previous_questions:
+        return f"{previous_questions[-1]} {question}"
+    return question
 
-    # Bedrock에서 반환한 score 확인
-    high_quality_docs = [
-        doc for doc in docs
-        if doc.metadata.get("score", 1.0) >= RELEVANCE_THRESHOLD
-    ]
+def retrieve_context(question: str, llm):
+    """로컬 인덱스 → KB 순으로 검색 후 QA 체인에 넣을 context 구성 (관련 문서가 없으면 None)"""
+    high_quality_docs = []
+    if settings.LOCAL_RETRIEVER_ENABLED:
+        try:
+            local_docs = get_local_retriever().search(question)
+            high_quality_docs = [
+                doc for doc in local_docs
+                if doc.metadata["score"] >= LOCAL_SCORE_THRESHOLD
+            ]
+        except Exception as e:
+            print(f"⚠️ 로컬 자막 검색 실패 (KB 사용): {e}")
 
     if high_quality_docs:
+        print(f"⚡ 로컬 자막 인덱스 적중 ({len(high_quality_docs)}건) → KB 검색 생략")
+    else:
+        retriever = get_kb_retriever()
+        docs = retriever(question)
+
+        # Bedrock에서 반환한 score 확인
+        high_quality_docs = [
+            doc for doc in docs
+            if doc.metadata.get("score", 1.0) >= RELEVANCE_THRESHOLD
+        ]
+
+    if not high_quality_docs:
+        return None
+
+    # LLM 구문 선택 모드면 문서별로 고른 구문을 context 구간의 중심으로 사용
+    # (lexical 모드는 pack_context가 같은 BM25 점수로 직접 구간을 고르므로 따로 돌리지 않음)
+    focus = None
+    if SEGMENT_RANKER == "llm":
+        focus = select_best_segments([doc.page_content for doc in high_quality_docs], question, llm)
+    
+    # 중복 제거 + 관련 구간만 남겨 토큰 예산 안으로 압축한 context 사용
+    return pack_context(high_quality_docs, question, focus=focus) or None
+
+def answer_question(question: str, history: list = None):
+    """질문에 대한 답변 생성 (history: 이전 대화 (role, content) 목록)"""
+    # 동일/유사 질문 캐시 확인 (KB 버전 단위) - 이전 대화를 가리키는 후속 질문만 캐시 우회
+    if not history or not refers_to_history(question):
+        cached = answer_cache.get(question)
+        if cached is not None:
+            print("⚡ 답변 캐시 적중")
+            return cached
+
+    start = time.perf_counter()
+    llm = get_llm()
+    context = retrieve_context(build_retrieval_query(question, history), llm)
+
+    if context is not None:
         print("📚 ✅ KB 검색 성공 → Claude + KB 체인 사용")
-        
-        # 중복 제거: 같은 시간과 텍스트를 가진 문서는 하나만 표시
-        unique_docs = []
-        seen_content = set()
-        
-        for doc in high_quality_docs:
-            time_and_text = extract_best_time_and_text_with_ai(doc.page_content, question, llm)
-            if time_and_text not in seen_content:
-                seen_content.add(time_and_text)
-                unique_docs.append((doc, time_and_text))
-        
-        # 고유한 문서만 표시
-        for i, (doc, time_and_text) in enumerate(unique_docs, 1):
-            print(f"   - 🔗 문서 {i}: {time_and_text}")
-        
-        # KB 검색 결과를 context로 사용
-        context = "\n".join([doc.page_content for doc in high_quality_docs])
         qa_chain = build_qa_chain()
-        response = qa_chain.invoke({"context": context, "question": question})
-        
-        # 응답에서 content만 추출
-        if hasattr(response, 'content'):
-            answer = response.content
-        else:
-            answer = str(response)
-
+        response = qa_chain.invoke({"context": context, "question": question, "history": history or []})
     else:
         print("🌐 ❗ KB 검색 실패 → Claude 단독 응답(Fallback)")
-        response = llm.invoke(question)
+        response = llm.invoke((history or []) + [("human", question)])
         
-        # 응답에서 content만 추출
-        if hasattr(response, 'content'):
-            answer = response.content
-        else:
-            answer = str(response)
+    # 응답에서 content만 추출
+    if hasattr(response, 'content'):
+        answer = response.content
+    else:
+        answer = str(response)
+
+    # 대화 맥락이 반영된 답변은 다른 사용자에게 재사용되지 않도록 맥락 없이 생성한 답변만 저장
+    if not history:
+        answer_cache.put(question, answer, (time.perf_counter() - start) * 1000)
+    return answer
+
+def stream_answer(question: str, history: list = None):
+    """answer_question의 스트리밍 버전 - 생성되는 토큰 조각을 순서대로 yield"""
+    if not history or not refers_to_history(question):
+        cached = answer_cache.get(question)
+        if cached is not None:
+            print("⚡ 답변 캐시 적중")
+            yield cached
+            return
+
+    start = time.perf_counter()
+    answer_parts = []
+    llm = get_llm()
+    context = retrieve_context(build_retrieval_query(question, history), llm)
+
+    if context is not None:
+        print("📚 ✅ KB 검색 성공 → Claude + KB 체인 스트리밍")
+        chunks = build_qa_chain().stream({"context": context, "question": question, "history": history or []})
+    else:
+        print("🌐 ❗ KB 검색 실패 → Claude 단독 스트리밍(Fallback)")
+        chunks = llm.stream((history or []) + [("human", question)])
+
+    for chunk in chunks:
+        text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+        if isinstance(text, list):
+            # 일부 모델은 content block 목록으로 조각을 반환
+            text = "".join(block.get("text", "") for block in text if isinstance(block, dict))
+        if text:
+            answer_parts.append(text)
+            yield text
 
-    return answer
\ No newline at end of file
+    if not history:
+        answer_cache.put(question, "".join(answer_parts), (time.perf_counter() - start) * 1000)
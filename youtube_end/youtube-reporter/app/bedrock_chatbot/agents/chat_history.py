@@ -0,0 +1,84 @@
+# agents/chat_history.py
+import json
+import sys
+import os
+from datetime import datetime
+
+# 상위 디렉토리의 app.core를 사용하기 위한 경로 설정
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+HISTORY_KEY_PREFIX = "bedrock:chat_history"
+CONTEXT_MESSAGE_MAX_CHARS = 2000  # 대화 맥락에 넣을 메시지별 최대 길이
+
+class ChatHistoryStore:
+    """사용자별 챗봇 대화 히스토리 (Redis 리스트, 워커 간 공유)
+
+    - 사용자당 최근 max_messages개만 보관 (LTRIM), 마지막 대화 후 ttl초 뒤 만료
+    - 메시지: {"role": "user"|"assistant", "content": str, "timestamp": ISO 문자열}
+    """
+
+    def __init__(self, max_messages: int = None, ttl: int = None):
+        self.redis = redis_client.redis
+        self.max_messages = max_messages or settings.CHAT_HISTORY_MAX_MESSAGES
+        self.ttl = ttl or settings.CHAT_HISTORY_TTL
+
+    def _key(self, user_id: str) -> str:
+        return f"{HISTORY_KEY_PREFIX}:{user_id}"
+
+    def append_turn(self, user_id: str, question: str, answer: str):
+        """질문/답변 한 쌍 저장 (길이 제한 + TTL 갱신을 한 번의 왕복으로)"""
+        timestamp = datetime.now().isoformat()
+        messages = [
+            json.dumps({"role": "user", "content": question, "timestamp": timestamp}, ensure_ascii=False),
+            json.dumps({"role": "assistant", "content": answer, "timestamp": timestamp}, ensure_ascii=False)
+        ]
+        key = self._key(user_id)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.rpush(key, *messages)
+            pipe.ltrim(key, -self.max_messages, -1)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️ 채팅 히스토리 저장 실패 (무시됨): {e}")
+
+    def get_page(self, user_id: str, offset: int = 0, limit: int = 50) -> dict:
+        """최신 메시지부터 offset만큼 건너뛴 limit개 조회 (페이지 내부는 시간순)"""
+        key = self._key(user_id)
+        pipe = self.redis.pipeline()
+        pipe.llen(key)
+        pipe.lrange(key, -(offset + limit), -(offset + 1))
+        total, raw_messages = pipe.execute()
+
+        next_offset = offset + limit
+        return {
+            "messages": [json.loads(message) for message in raw_messages],
+            "total": total,
+            "next_offset": next_offset if next_offset < total else None
+        }
+
+    def recent_messages(self, user_id: str, max_messages: int = None) -> list:
+        """QA 체인에 넣을 최근 대화 (role, content) 목록 - 조회 실패 시 빈 목록"""
+        max_messages = max_messages or settings.CHAT_CONTEXT_MESSAGES
+        try:
+            raw_messages = self.redis.lrange(self._key(user_id), -max_messages, -1)
+        except Exception as e:
+            print(f"⚠️ 채팅 히스토리 조회 실패 (대화 맥락 없이 진행): {e}")
+            return []
+
+        messages = [json.loads(message) for message in raw_messages]
+        # 질문부터 시작하도록 맞춤 (잘린 앞부분이 답변이면 제외)
+        while messages and messages[0]["role"] != "user":
+            messages.pop(0)
+        return [
+            ("human" if message["role"] == "user" else "ai", message["content"][:CONTEXT_MESSAGE_MAX_CHARS])
+            for message in messages
+        ]
+
+    def clear(self, user_id: str):
+        """사용자 히스토리 삭제"""
+        self.redis.delete(self._key(user_id))
+
+chat_history_store = ChatHistoryStore()
@@ -1,5 +1,5 @@
 # chains/qa_chain.py
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_aws import ChatBedrock
 import boto3
 import sys
@@ -10,7 +10,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.core.config import settings
 
 def build_qa_chain():
-    """QA 체인 빌드"""
+    """QA 체인 빌드 (history: 이전 대화 (role, content) 목록, 생략 가능)"""
     llm = ChatBedrock(
         client=boto3.client("bedrock-runtime", region_name=settings.AWS_REGION),
         model_id=settings.BEDROCK_MODEL_ID,
@@ -19,6 +19,7 @@ def build_qa_chain():
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a helpful assistant. Answer the question based on the provided context."),
+        MessagesPlaceholder("history", optional=True),
         ("human", "Context: {context}\n\nQuestion: {question}")
     ])
     
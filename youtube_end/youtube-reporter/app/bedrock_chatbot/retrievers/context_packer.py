@@ -0,0 +1,114 @@
+# retrievers/context_packer.py
+import math
+
+from retrievers.segment_ranker import HANGUL_PATTERN, parse_segments, score_segments
+
+CONTEXT_TOKEN_BUDGET = 3000   # QA 체인 context 최대 토큰 (추정치)
+WINDOW_SEGMENTS = 2           # 관련 구문 앞뒤로 함께 남길 자막 줄 수
+MAX_SPANS_PER_DOC = 2         # 문서별로 남길 관련 구간 수
+GAP_MARKER = "..."
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (한글 1자 ≈ 1토큰, 그 외 4자 ≈ 1토큰, 토크나이저 호출 없음)"""
+    hangul = len(HANGUL_PATTERN.findall(text))
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+def _format_line(seconds: float, text: str) -> str:
+    return f"[at {seconds:g} seconds] {text}"
+
+def _relevant_indices(question: str, segments: list, window: int, focus: int = None) -> list:
+    """관련 점수가 높은 구문 주변 window 줄만 남긴 인덱스 (시간순)
+
+    focus: 구문 선택기(select_best_segments)가 고른 구문 - 첫 번째 구간의 중심으로 사용
+    """
+    scores = score_segments(question, [text for _, text in segments])
+    ranked = sorted(range(len(segments)), key=lambda i: (-scores[i], i))
+    centers = [i for i in ranked[:MAX_SPANS_PER_DOC] if scores[i] > 0] or [ranked[0]]
+    if focus is not None and 0 <= focus < len(segments) and focus not in centers:
+        centers = [focus] + centers[:MAX_SPANS_PER_DOC - 1]
+
+    keep = set()
+    for center in centers:
+        keep.update(range(max(center - window, 0), min(center + window + 1, len(segments))))
+    return sorted(keep)
+
+def _trim_document(question: str, content: str, window: int, seen_segments: set, seen_texts: list,
+                   focus: int = None):
+    """문서를 관련 구간으로 줄이고 이미 포함된 구문/본문은 제외 (남은 게 없으면 None)"""
+    segments = parse_segments(content)
+    if not segments:
+        normalized = " ".join(content.split())
+        if not normalized or any(normalized in text for text in seen_texts):
+            return None
+        seen_texts.append(normalized)
+        return content.strip()
+
+    lines = []
+    previous = None
+    for i in _relevant_indices(question, segments, window, focus):
+        if segments[i] in seen_segments:
+            # 겹치는 청크의 같은 구문 → 먼저 포함된 쪽만 유지
+            continue
+        seen_segments.add(segments[i])
+        if previous is not None and i != previous + 1:
+            lines.append(GAP_MARKER)
+        lines.append(_format_line(*segments[i]))
+        previous = i
+    return "\n".join(lines) if lines else None
+
+def _truncate_to_budget(text: str, budget: int) -> str:
+    """줄 단위로 budget 토큰까지 자르기"""
+    lines = []
+    used = 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
+
+def pack_context(docs: list, question: str, token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 window: int = WINDOW_SEGMENTS, focus: list = None) -> str:
+    """검색 문서들을 QA 체인용 context로 압축
+
+    1. 문서별로 질문과 관련된 자막 구간(앞뒤 window 줄)만 남김
+       (focus[i]가 있으면 i번째 문서는 그 구문 주변을 우선 포함 - LLM 구문 선택 결과 반영용)
+    2. 겹치는 청크의 중복 구문/본문 제거
+    3. 검색 점수 + 질문 BM25 점수로 순위를 매겨 token_budget 안에 들어가는 만큼 포함
+    """
+    seen_segments = set()
+    seen_texts = []
+    pieces = []
+    for rank, doc in enumerate(docs):
+        doc_focus = focus[rank] if focus else None
+        text = _trim_document(question, doc.page_content, window, seen_segments, seen_texts, doc_focus)
+        if text:
+            pieces.append((rank, doc.metadata.get("score", 0.0), text))
+    if not pieces:
+        return ""
+
+    # 압축된 조각끼리 BM25 (조각 집합을 코퍼스로) → 최댓값으로 정규화해 검색 점수와 합산
+    lexical = score_segments(question, [text for _, _, text in pieces])
+    max_lexical = max(lexical) or 1.0
+    ranked = sorted(
+        zip(pieces, lexical),
+        key=lambda item: (-(item[0][1] + item[1] / max_lexical), item[0][0])
+    )
+
+    packed = []
+    used = 0
+    for (_, _, text), _ in ranked:
+        cost = estimate_tokens(text)
+        if used + cost > token_budget:
+            if packed:
+                continue
+            # 가장 관련 높은 조각 하나가 예산보다 크면 잘라서라도 포함
+            text = _truncate_to_budget(text, token_budget)
+            cost = estimate_tokens(text)
+        packed.append(text)
+        used += cost
+
+    original = sum(estimate_tokens(doc.page_content) for doc in docs)
+    print(f"📦 context 압축: 약 {original} → {used} 토큰 (문서 {len(packed)}/{len(docs)})")
+    return "\n\n".join(packed)
@@ -2,7 +2,12 @@
 import boto3
 import sys
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from langchain_aws import ChatBedrock
+from langchain_core.documents import Document
 
 # 상위 디렉토리의 app.core.config를 사용하기 위한 경로 설정
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -16,43 +21,119 @@ def get_llm():
         model_kwargs={"temperature": 0.0, "max_tokens": 4096}
     )
 
-def get_kb_retriever():
-    """Bedrock Knowledge Base 검색기 반환"""
-    bedrock_client = boto3.client("bedrock-agent-runtime", region_name=settings.AWS_REGION)
-    
-    def retrieve(query: str):
+class KBRetriever:
+    """Bedrock Knowledge Base 검색기 (프로세스 단위 재사용)
+
+    - bedrock-agent-runtime 클라이언트 재사용
+    - (kb_id, query, numberOfResults) 단위 짧은 TTL LRU 캐시
+    - 동일 질의 동시 요청은 한 번만 호출 (single-flight)
+    - retrieve_many()로 여러 하위 질의를 병렬 검색
+    """
+
+    def __init__(self, number_of_results: int = 5, ttl: float = 60.0, max_entries: int = 256, max_workers: int = 4):
+        self.client = boto3.client("bedrock-agent-runtime", region_name=settings.AWS_REGION)
+        self.number_of_results = number_of_results
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # key -> (만료 시각, 문서 목록)
+        self._in_flight = {}         # key -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kb-retrieve")
+
+    def __call__(self, query: str):
+        return self.retrieve(query)
+
+    def _cache_get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, documents = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return documents
+
+    def _cache_put(self, key, documents):
+        self._cache[key] = (time.monotonic() + self.ttl, documents)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def retrieve(self, query: str, number_of_results: int = None):
+        """KB 검색 (캐시 → 진행 중 동일 요청 합류 → 실제 호출)"""
+        number_of_results = number_of_results or self.number_of_results
+        key = (settings.BEDROCK_KB_ID, query, number_of_results)
+
+        with self._lock:
+            documents = self._cache_get(key)
+            if documents is not None:
+                return list(documents)
+
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            return list(future.result())
+
+        documents = []
         try:
-            response = bedrock_client.retrieve(
-                knowledgeBaseId=settings.BEDROCK_KB_ID,
-                retrievalQuery={
-                    "text": query
-                },
-                retrievalConfiguration={
-                    "vectorSearchConfiguration": {
-                        "numberOfResults": 5
-                    }
-                }
-            )
-            
-            # LangChain Document 형식으로 변환
-            from langchain_core.documents import Document
-            documents = []
-            
-            for result in response.get("retrievalResults", []):
-                doc = Document(
-                    page_content=result.get("content", {}).get("text", ""),
-                    metadata={
-                        "score": result.get("score", 0.0),
-                        "location": result.get("location", {}),
-                        "metadata": result.get("metadata", {})
-                    }
-                )
-                documents.append(doc)
-            
-            return documents
-            
+            documents = self._retrieve_remote(query, number_of_results)
+            with self._lock:
+                self._cache_put(key, documents)
         except Exception as e:
+            # 실패 결과는 캐시하지 않음
             print(f"❌ KB 검색 실패: {e}")
-            return []
-    
-    return retrieve
\ No newline at end of file
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_result(documents)
+        return list(documents)
+
+    def retrieve_many(self, queries: list, number_of_results: int = None) -> list:
+        """여러 하위 질의를 병렬 검색 (질의 순서대로 결과 반환)"""
+        futures = [self._executor.submit(self.retrieve, query, number_of_results) for query in queries]
+        return [future.result() for future in futures]
+
+    def _retrieve_remote(self, query: str, number_of_results: int):
+        response = self.client.retrieve(
+            knowledgeBaseId=settings.BEDROCK_KB_ID,
+            retrievalQuery={
+                "text": query
+            },
+            retrievalConfiguration={
+                "vectorSearchConfiguration": {
+                    "numberOfResults": number_of_results
+                }
+            }
+        )
+
+        # LangChain Document 형식으로 변환
+        documents = []
+        for result in response.get("retrievalResults", []):
+            doc = Document(
+                page_content=result.get("content", {}).get("text", ""),
+                metadata={
+                    "score": result.get("score", 0.0),
+                    "location": result.get("location", {}),
+                    "metadata": result.get("metadata", {})
+                }
+            )
+            documents.append(doc)
+
+        return documents
+
+_kb_retriever = None
+_kb_retriever_lock = threading.Lock()
+
+def get_kb_retriever():
+    """Bedrock Knowledge Base 검색기 반환 (프로세스 전역 인스턴스)"""
+    global _kb_retriever
+    if _kb_retriever is None:
+        with _kb_retriever_lock:
+            if _kb_retriever is None:
+                _kb_retriever = KBRetriever()
+    return _kb_retriever
@@ -0,0 +1,341 @@
+# retrievers/local_retriever.py
+import json
+import math
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+
+import boto3
+import numpy as np
+from langchain_core.documents import Document
+
+# 상위 디렉토리의 app.core.config를 사용하기 위한 경로 설정
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from app.core.config import settings
+from retrievers.segment_ranker import tokenize, hash_embedding, strip_timestamps
+
+TRANSCRIPT_PREFIX = "transcripts/"
+INDEX_FORMAT = 2        # 토큰화/임베딩 방식이 바뀌면 증가 - 이전 형식 인덱스는 refresh 시 재구성
+META_SUFFIX = ".meta.json"
+CHUNK_CHARS = 1000      # 청크 최대 길이 (문자)
+CHUNK_OVERLAP_LINES = 2 # 청크 간 겹치는 줄 수
+EMBEDDING_DIM = 256
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_WEIGHT = 0.7       # 하이브리드 점수 = BM25_WEIGHT * bm25 + (1 - BM25_WEIGHT) * cosine
+
+def chunk_transcript(text: str) -> list:
+    """자막을 줄 단위로 묶어 겹치는 청크로 분할 (줄바꿈이 없으면 문자 단위)"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) <= 1:
+        step = CHUNK_CHARS - CHUNK_CHARS // 5
+        return [text[i:i + CHUNK_CHARS] for i in range(0, len(text), step)] if text.strip() else []
+
+    chunks = []
+    current = []
+    size = 0
+    for line in lines:
+        if current and size + len(line) > CHUNK_CHARS:
+            chunks.append("\n".join(current))
+            current = current[-CHUNK_OVERLAP_LINES:]
+            size = sum(len(l) for l in current)
+        current.append(line)
+        size += len(line)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+class LocalTranscriptIndex:
+    """S3 transcripts/ 기반 로컬 하이브리드 검색 인덱스 (BM25 + 선택적 로컬 임베딩)
+
+    디스크 구조 (index_dir/v{n}/, CURRENT 파일이 활성 버전을 가리킴):
+      sources.json        소스 목록 [{s3_key, etag, meta}]
+      vocab.json          용어 → 용어 ID
+      chunks.bin          청크 UTF-8 텍스트 연결
+      chunk_offsets.npy   청크 시작/끝 오프셋 (N+1)
+      chunk_source.npy    청크 → 소스 인덱스
+      doc_len.npy         청크 토큰 수
+      post_ptr.npy        용어별 포스팅 시작 위치 (CSR, V+1)
+      post_doc.npy        포스팅 청크 ID
+      post_tf.npy         포스팅 용어 빈도
+      embeddings.npy      청크 임베딩 (코퍼스 평균을 뺀 뒤 L2 정규화, float16, 선택)
+      embedding_mean.npy  코퍼스 평균 임베딩 (쿼리 임베딩 중심화용, 선택)
+      FORMAT              인덱스 형식 버전 (INDEX_FORMAT)
+    npy 파일은 memory-map으로 열어 워커 간 페이지 캐시를 공유한다.
+    """
+
+    def __init__(self, index_dir: str, use_embeddings: bool = True):
+        self.index_dir = index_dir
+        self.use_embeddings = use_embeddings
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._loaded_version = None
+        self._data = None
+
+    # ---------- 로드 ----------
+
+    def _current_version(self):
+        try:
+            with open(os.path.join(self.index_dir, "CURRENT"), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _ensure_loaded(self):
+        """다른 워커가 인덱스를 갱신했으면 새 버전을 다시 매핑"""
+        version = self._current_version()
+        if version == self._loaded_version:
+            return self._data
+
+        with self._lock:
+            if version != self._loaded_version:
+                self._data = self._load(version) if version else None
+                self._loaded_version = version
+        return self._data
+
+    def _load(self, version: str) -> dict:
+        path = os.path.join(self.index_dir, version)
+        with open(os.path.join(path, "sources.json"), encoding="utf-8") as f:
+            sources = json.load(f)
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            vocab = json.load(f)
+
+        def mmap(name):
+            return np.load(os.path.join(path, name), mmap_mode="r")
+
+        data = {
+            "sources": sources,
+            "vocab": vocab,
+            "chunks": np.memmap(os.path.join(path, "chunks.bin"), dtype=np.uint8, mode="r")
+                      if os.path.getsize(os.path.join(path, "chunks.bin")) else np.zeros(0, dtype=np.uint8),
+            "chunk_offsets": mmap("chunk_offsets.npy"),
+            "chunk_source": mmap("chunk_source.npy"),
+            "doc_len": mmap("doc_len.npy"),
+            "post_ptr": mmap("post_ptr.npy"),
+            "post_doc": mmap("post_doc.npy"),
+            "post_tf": mmap("post_tf.npy"),
+            "embeddings": None
+        }
+        embeddings_path = os.path.join(path, "embeddings.npy")
+        mean_path = os.path.join(path, "embedding_mean.npy")
+        if self.use_embeddings and os.path.exists(embeddings_path) and os.path.exists(mean_path):
+            data["embeddings"] = np.load(embeddings_path, mmap_mode="r")
+            data["embedding_mean"] = np.load(mean_path)
+        data["avg_len"] = float(np.mean(data["doc_len"])) if len(data["doc_len"]) else 1.0
+        try:
+            with open(os.path.join(path, "FORMAT"), encoding="utf-8") as f:
+                data["format"] = int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            data["format"] = 1
+        return data
+
+    def _chunk_text(self, data: dict, chunk_id: int) -> str:
+        start, end = data["chunk_offsets"][chunk_id], data["chunk_offsets"][chunk_id + 1]
+        return bytes(data["chunks"][start:end]).decode("utf-8")
+
+    # ---------- 검색 ----------
+
+    def search(self, query: str, k: int = 5) -> list:
+        """하이브리드 검색 - metadata["score"]는 0~1로 정규화된 점수"""
+        data = self._ensure_loaded()
+        if not data or not len(data["doc_len"]):
+            return []
+
+        total = len(data["doc_len"])
+        doc_len = np.asarray(data["doc_len"], dtype=np.float32)
+        scores = np.zeros(total, dtype=np.float32)
+        max_score = 0.0
+        matched = False
+        query = strip_timestamps(query)
+        for term in set(tokenize(query)):
+            term_id = data["vocab"].get(term)
+            # 인덱스에 없는 용어도 상한에 포함 (df=0의 idf) - 질문 대부분이 코퍼스 밖이면 점수가 낮아지도록
+            df = 0 if term_id is None else int(data["post_ptr"][term_id + 1] - data["post_ptr"][term_id])
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            max_score += idf * (BM25_K1 + 1)
+            if term_id is None:
+                continue
+            start, end = data["post_ptr"][term_id], data["post_ptr"][term_id + 1]
+            docs = np.asarray(data["post_doc"][start:end])
+            tf = np.asarray(data["post_tf"][start:end], dtype=np.float32)
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (
+                tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_len[docs] / data["avg_len"])
+            )
+            matched = True
+
+        if not matched:
+            return []
+
+        # 질문 전체 용어의 BM25 상한으로 나눠 0~1 정규화 (KB fallback 임계값과 비교 가능하도록)
+        scores /= max_score
+        if data["embeddings"] is not None:
+            # 해싱 임베딩은 모두 양수라 무관한 텍스트끼리도 코사인이 높음 → 코퍼스 평균을 빼고 비교
+            query_vector = hash_embedding(query.lower(), EMBEDDING_DIM) - data["embedding_mean"]
+            norm = np.linalg.norm(query_vector)
+            if norm:
+                cosine = np.asarray(data["embeddings"], dtype=np.float32) @ (query_vector / norm)
+                scores = BM25_WEIGHT * scores + (1 - BM25_WEIGHT) * np.clip(cosine, 0.0, 1.0)
+
+        k = min(k, total)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        documents = []
+        for chunk_id in top:
+            if scores[chunk_id] <= 0:
+                continue
+            source = data["sources"][int(data["chunk_source"][chunk_id])]
+            documents.append(Document(
+                page_content=self._chunk_text(data, int(chunk_id)),
+                metadata={
+                    "score": float(scores[chunk_id]),
+                    "location": {"type": "S3", "s3Location": {"uri": f"s3://{settings.S3_BUCKET}/{source['s3_key']}"}},
+                    "metadata": source.get("meta", {}),
+                    "retriever": "local"
+                }
+            ))
+        return documents
+
+    # ---------- 빌드 ----------
+
+    def _existing_chunks(self) -> dict:
+        """현재 인덱스의 소스별 (etag, meta, 청크 목록) - 증분 빌드 시 재다운로드 방지"""
+        data = self._ensure_loaded()
+        if not data:
+            return {}
+        by_source = {}
+        for chunk_id in range(len(data["doc_len"])):
+            by_source.setdefault(int(data["chunk_source"][chunk_id]), []).append(self._chunk_text(data, chunk_id))
+        return {
+            source["s3_key"]: (source["etag"], source.get("meta", {}), by_source.get(idx, []))
+            for idx, source in enumerate(data["sources"])
+        }
+
+    def refresh(self, s3_client=None, bucket: str = None) -> dict:
+        """S3 transcripts/를 스캔해 새로 추가/변경된 자막만 내려받아 인덱스 재구성"""
+        with self._build_lock:
+            return self._refresh(s3_client, bucket)
+
+    def _refresh(self, s3_client, bucket: str) -> dict:
+        s3_client = s3_client or boto3.client("s3", region_name=settings.AWS_REGION)
+        bucket = bucket or settings.S3_BUCKET
+        existing = self._existing_chunks()
+
+        objects = {}
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=TRANSCRIPT_PREFIX):
+            for obj in page.get("Contents", []):
+                objects[obj["Key"]] = obj["ETag"]
+
+        sources = []
+        fetched = 0
+        for key, etag in sorted(objects.items()):
+            if key.endswith(META_SUFFIX) or not key.endswith(".txt"):
+                continue
+            if key in existing and existing[key][0] == etag:
+                _, meta, chunks = existing[key]
+            else:
+                body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read().decode("utf-8")
+                chunks = chunk_transcript(body)
+                meta = {}
+                if key + META_SUFFIX in objects:
+                    try:
+                        meta = json.loads(s3_client.get_object(Bucket=bucket, Key=key + META_SUFFIX)["Body"].read())
+                    except Exception as e:
+                        print(f"⚠️ 자막 메타데이터 조회 실패: {key} - {e}")
+                fetched += 1
+            sources.append({"s3_key": key, "etag": etag, "meta": meta, "chunks": chunks})
+
+        data = self._ensure_loaded()
+        if fetched == 0 and len(sources) == len(existing) and (not data or data["format"] == INDEX_FORMAT):
+            return {"sources": len(sources), "fetched": 0, "rebuilt": False}
+
+        self.write(sources)
+        return {"sources": len(sources), "fetched": fetched, "rebuilt": True}
+
+    def write(self, sources: list):
+        """소스 목록 [{s3_key, etag, meta, chunks}]으로 새 인덱스 버전 기록 후 CURRENT 교체"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        version = f"v{int(time.time() * 1000)}"
+        path = os.path.join(self.index_dir, version)
+        os.makedirs(path)
+
+        vocab = {}
+        postings = []
+        doc_len = []
+        chunk_source = []
+        offsets = [0]
+        embeddings = []
+        with open(os.path.join(path, "chunks.bin"), "wb") as chunks_file:
+            for source_idx, source in enumerate(sources):
+                for chunk in source["chunks"]:
+                    chunk_id = len(doc_len)
+                    searchable = strip_timestamps(chunk)
+                    counts = Counter(tokenize(searchable))
+                    for term, tf in counts.items():
+                        term_id = vocab.setdefault(term, len(vocab))
+                        if term_id == len(postings):
+                            postings.append([])
+                        postings[term_id].append((chunk_id, min(tf, 65535)))
+                    doc_len.append(sum(counts.values()))
+                    chunk_source.append(source_idx)
+
+                    encoded = chunk.encode("utf-8")
+                    chunks_file.write(encoded)
+                    offsets.append(offsets[-1] + len(encoded))
+                    if self.use_embeddings:
+                        embeddings.append(hash_embedding(searchable.lower(), EMBEDDING_DIM))
+
+        post_ptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        post_ptr[1:] = np.cumsum([len(p) for p in postings])
+        post_doc = np.fromiter((doc for p in postings for doc, _ in p), dtype=np.int32, count=int(post_ptr[-1]))
+        post_tf = np.fromiter((tf for p in postings for _, tf in p), dtype=np.uint16, count=int(post_ptr[-1]))
+
+        np.save(os.path.join(path, "chunk_offsets.npy"), np.asarray(offsets, dtype=np.int64))
+        np.save(os.path.join(path, "chunk_source.npy"), np.asarray(chunk_source, dtype=np.int32))
+        np.save(os.path.join(path, "doc_len.npy"), np.asarray(doc_len, dtype=np.int32))
+        np.save(os.path.join(path, "post_ptr.npy"), post_ptr)
+        np.save(os.path.join(path, "post_doc.npy"), post_doc)
+        np.save(os.path.join(path, "post_tf.npy"), post_tf)
+        if self.use_embeddings:
+            matrix = np.stack(embeddings) if embeddings else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            mean = matrix.mean(axis=0) if len(matrix) else np.zeros(EMBEDDING_DIM, dtype=np.float32)
+            centered = matrix - mean
+            norms = np.linalg.norm(centered, axis=1, keepdims=True)
+            centered = np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 0)
+            np.save(os.path.join(path, "embeddings.npy"), centered.astype(np.float16))
+            np.save(os.path.join(path, "embedding_mean.npy"), mean.astype(np.float32))
+        with open(os.path.join(path, "FORMAT"), "w", encoding="utf-8") as f:
+            f.write(str(INDEX_FORMAT))
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(vocab, f, ensure_ascii=False)
+        with open(os.path.join(path, "sources.json"), "w", encoding="utf-8") as f:
+            json.dump([{k: v for k, v in s.items() if k != "chunks"} for s in sources], f, ensure_ascii=False)
+
+        # CURRENT 원자적 교체 후 이전 버전 정리 (이미 매핑된 파일은 리눅스에서 안전)
+        previous = self._current_version()
+        tmp_current = os.path.join(self.index_dir, "CURRENT.tmp")
+        with open(tmp_current, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_current, os.path.join(self.index_dir, "CURRENT"))
+        if previous and previous != version:
+            shutil.rmtree(os.path.join(self.index_dir, previous), ignore_errors=True)
+        print(f"✅ 로컬 자막 인덱스 갱신: {version} (소스 {len(sources)}개, 청크 {len(doc_len)}개)")
+
+_local_index = None
+_local_index_lock = threading.Lock()
+
+def get_local_retriever() -> LocalTranscriptIndex:
+    """로컬 자막 인덱스 반환 (프로세스 전역 인스턴스)"""
+    global _local_index
+    if _local_index is None:
+        with _local_index_lock:
+            if _local_index is None:
+                _local_index = LocalTranscriptIndex(
+                    settings.LOCAL_RETRIEVER_INDEX_DIR,
+                    use_embeddings=settings.LOCAL_RETRIEVER_EMBEDDINGS
+                )
+    return _local_index
@@ -0,0 +1,126 @@
+# retrievers/segment_ranker.py
+import math
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+
+# 자막 타임스탬프 구문 패턴 ([at 12.5 seconds] 텍스트)
+SEGMENT_PATTERN = re.compile(r'\[at (\d+\.?\d*) seconds?\]\s*([^\n\r]+)')
+TIMESTAMP_PATTERN = re.compile(r'\[at \d+\.?\d* seconds?\]')
+HANGUL_PATTERN = re.compile(r'[가-힣]')
+
+def parse_segments(content: str) -> list:
+    """자막에서 (초, 텍스트) 구문 목록 추출"""
+    return [(float(sec), txt.strip()) for sec, txt in SEGMENT_PATTERN.findall(content)]
+
+def strip_timestamps(text: str) -> str:
+    """[at N seconds] 표기 제거 (모든 청크에 반복되는 표기가 검색 점수에 섞이지 않도록)"""
+    return TIMESTAMP_PATTERN.sub(" ", text)
+
+def tokenize(text: str) -> list:
+    """검색용 토큰화 - 단어 + 한글 단어의 문자 바이그램 (조사/어미 변화에 강하도록)"""
+    tokens = []
+    for word in re.findall(r'\w+', text.lower()):
+        tokens.append(word)
+        if HANGUL_PATTERN.search(word) and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+def hash_embedding(text: str, dim: int = 512) -> np.ndarray:
+    """로컬 임베딩 - 문자 2/3-gram 특징 해싱 후 L2 정규화 (모델 호출 없음)"""
+    vector = np.zeros(dim, dtype=np.float32)
+    text = f" {text} "
+    for n in (2, 3):
+        for i in range(len(text) - n + 1):
+            vector[zlib.crc32(text[i:i + n].encode("utf-8")) % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def score_segments(question: str, segments: list, k1: float = 1.2, b: float = 0.75) -> list:
+    """질문 대비 구문 BM25 점수 (구문 집합 자체를 코퍼스로 사용, LLM 호출 없음)"""
+    query_terms = set(tokenize(question))
+    docs = [Counter(tokenize(text)) for text in segments]
+    if not docs or not query_terms:
+        return [0.0] * len(segments)
+
+    avg_len = sum(sum(doc.values()) for doc in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for doc in docs for term in query_terms if term in doc)
+
+    scores = []
+    for doc in docs:
+        length = sum(doc.values())
+        score = 0.0
+        for term in query_terms:
+            tf = doc.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+        scores.append(score)
+    return scores
+
+def _rank_with_llm(question: str, candidates: list, llm) -> dict:
+    """전체 문서의 구문을 한 번의 LLM 호출로 평가 → {문서 인덱스: 구문 인덱스}"""
+    prompt = f"""
+다음 질문과 가장 관련있는 자막 구문을 문서별로 하나씩 선택해주세요.
+
+질문: {question}
+
+자막 구문들:
+"""
+    numbered = []
+    for doc_idx, segments in enumerate(candidates):
+        if not segments:
+            continue
+        prompt += f"\n[문서 {doc_idx + 1}]\n"
+        for seg_idx, (_, txt) in enumerate(segments):
+            numbered.append((doc_idx, seg_idx))
+            prompt += f"{len(numbered)}. {txt}\n"
+
+    prompt += """
+각 문서에서 질문과 가장 관련있는 구문의 번호만 쉼표로 구분해 숫자로 답해주세요.
+"""
+    response = llm.invoke(prompt)
+    result = response.content if hasattr(response, 'content') else str(response)
+
+    selected = {}
+    for number in re.findall(r'\d+', result):
+        idx = int(number) - 1
+        if 0 <= idx < len(numbered):
+            doc_idx, seg_idx = numbered[idx]
+            selected.setdefault(doc_idx, seg_idx)
+    return selected
+
+def select_best_segments(contents: list, question: str, llm=None) -> list:
+    """문서별로 질문과 가장 관련있는 자막 구문 인덱스 (parse_segments 기준, 구문이 없는 문서는 None)
+
+    기본은 로컬 BM25 점수(LLM 호출 없음)이며, llm을 넘기면 모든 문서의 구문을
+    한 번의 호출로 일괄 평가한다. LLM이 고르지 못한 문서는 로컬 점수로 채운다.
+    결과는 context_packer.pack_context(focus=...)에 넘겨 해당 구문 주변을 context에 반드시 포함시킨다.
+    """
+    candidates = [parse_segments(content) for content in contents]
+    all_texts = [txt for segments in candidates for _, txt in segments]
+    all_scores = score_segments(question, all_texts)
+
+    selected = {}
+    if llm is not None and any(len(segments) > 1 for segments in candidates):
+        try:
+            selected = _rank_with_llm(question, candidates, llm)
+        except Exception as e:
+            print(f"   - ⚠️ AI 일괄 평가 중 오류: {e}")
+
+    results = []
+    offset = 0
+    for doc_idx, segments in enumerate(candidates):
+        if not segments:
+            results.append(None)
+            continue
+
+        scores = all_scores[offset:offset + len(segments)]
+        offset += len(segments)
+
+        # 점수가 모두 0이면 첫 번째 구문
+        results.append(selected.get(doc_idx, max(range(len(segments)), key=lambda i: (scores[i], -i))))
+    return results
@@ -0,0 +1,21 @@
+# tool/build_local_index.py
+import sys
+import os
+
+# 상위 디렉토리 경로 설정 (app.core.config, retrievers 모듈 사용)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from retrievers.local_retriever import get_local_retriever
+
+def build_local_index() -> dict:
+    """S3 transcripts/ 기준 로컬 자막 인덱스 증분 갱신"""
+    try:
+        result = get_local_retriever().refresh()
+        print(f"📚 로컬 자막 인덱스: {result}")
+        return result
+    except Exception as e:
+        print(f"❌ 로컬 자막 인덱스 갱신 실패: {e}")
+        return {"rebuilt": False, "error": str(e)}
+
+if __name__ == "__main__":
+    build_local_index()
@@ -0,0 +1,127 @@
+# tool/ingestion_scheduler.py
+import asyncio
+import sys
+import os
+import uuid
+from datetime import datetime
+from botocore.exceptions import ClientError
+
+# 상위 디렉토리의 app.core를 사용하기 위한 경로 설정
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from .sync_kb import find_running_ingestion_job, start_ingestion_job, STARTING_STATUSES
+from .wait_until_kb_sync_complete import ingestion_tracker
+
+BATCH_KEY_PREFIX = "kb_ingestion:batch"
+BATCH_TTL = 86400
+
+class IngestionScheduler:
+    """업로드별 start_ingestion_job 대신 일정 시간 동안 모아서 한 번에 동기화
+
+    - 첫 업로드부터 debounce_sec 동안 들어온 업로드를 하나의 배치로 묶음
+    - 아직 S3 스캔 전(STARTING)인 Job이 있으면 재사용, 진행 중이면 끝난 뒤 새로 시작
+    - 요청은 기다리지 않고 batch_id를 받아 상태 엔드포인트로 확인
+    - 완료 시 등록된 콜백 실행 (답변 캐시 무효화, 로컬 인덱스 갱신 등)
+    """
+
+    def __init__(self, debounce_sec: float = 15.0, poll_interval_sec: float = 5.0, max_wait_sec: float = 1800.0):
+        self.debounce_sec = debounce_sec
+        self.poll_interval_sec = poll_interval_sec
+        self.max_wait_sec = max_wait_sec
+        self._batch_id = None
+        self._pending = []
+        self._flush_task = None
+        self._callbacks = []
+
+    def add_completion_callback(self, callback):
+        """동기화 완료(COMPLETE) 시 호출할 콜백 등록 - callback(batch_state)"""
+        self._callbacks.append(callback)
+
+    def _save_batch(self, batch_id: str, **fields) -> dict:
+        state = self.get_batch_status(batch_id) or {"batch_id": batch_id}
+        state.update(fields)
+        state["updated_at"] = datetime.utcnow().isoformat()
+        try:
+            redis_client.set_with_ttl(f"{BATCH_KEY_PREFIX}:{batch_id}", state, BATCH_TTL)
+        except Exception as e:
+            print(f"⚠️ KB 동기화 배치 상태 저장 실패 (무시됨): {e}")
+        return state
+
+    def get_batch_status(self, batch_id: str):
+        """배치 상태 조회 (워커 간 공유)"""
+        try:
+            return redis_client.get(f"{BATCH_KEY_PREFIX}:{batch_id}")
+        except Exception as e:
+            print(f"⚠️ KB 동기화 배치 상태 조회 실패: {e}")
+            return None
+
+    def request_sync(self, s3_key: str) -> str:
+        """업로드된 파일 동기화 요청 → batch_id (이벤트 루프 안에서 호출)"""
+        if self._batch_id is None:
+            self._batch_id = uuid.uuid4().hex
+        self._pending.append(s3_key)
+        self._save_batch(self._batch_id, status="SCHEDULED", s3_keys=list(self._pending))
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_after_window())
+        return self._batch_id
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.debounce_sec)
+        batch_id, s3_keys = self._batch_id, self._pending
+        self._batch_id, self._pending, self._flush_task = None, [], None
+        try:
+            await self._run_batch(batch_id, s3_keys)
+        except Exception as e:
+            print(f"❌ KB 동기화 배치 실패: {batch_id} - {e}")
+            self._save_batch(batch_id, status="FAILED", error=str(e))
+
+    async def _acquire_job(self, batch_id: str) -> str:
+        """배치를 반영할 Ingestion Job 확보 (재사용 또는 새로 시작)"""
+        while True:
+            running = await asyncio.to_thread(find_running_ingestion_job)
+            if running:
+                job_id, status = running
+                if status in STARTING_STATUSES:
+                    print(f"♻️ 시작 대기 중인 KB 동기화 Job 재사용: {job_id}")
+                    return job_id
+                # 이미 S3 스캔이 시작된 Job은 이번 업로드를 놓칠 수 있으므로 끝난 뒤 새로 시작
+                self._save_batch(batch_id, status="WAITING_FOR_RUNNING_JOB", running_job_id=job_id)
+                await self.wait_for_job(job_id)
+
+            try:
+                return await asyncio.to_thread(start_ingestion_job)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConflictException":
+                    raise
+                # 다른 워커가 먼저 시작함 → 다시 확인
+                await asyncio.sleep(self.poll_interval_sec)
+
+    async def wait_for_job(self, job_id: str) -> str:
+        """Job 종료까지 비동기 대기 (같은 Job의 공유 폴러에 합류)"""
+        return await ingestion_tracker.wait(job_id, self.max_wait_sec)
+
+    async def _run_batch(self, batch_id: str, s3_keys: list):
+        if not settings.BEDROCK_KB_ID or not settings.BEDROCK_DS_ID:
+            self._save_batch(batch_id, status="FAILED", error="BEDROCK_KB_ID 또는 BEDROCK_DS_ID 미설정")
+            return
+
+        print(f"🔄 KB 동기화 배치 시작: {batch_id} (파일 {len(s3_keys)}개)")
+        job_id = await self._acquire_job(batch_id)
+        self._save_batch(batch_id, status="IN_PROGRESS", ingestion_job_id=job_id)
+
+        final_status = await self.wait_for_job(job_id)
+        state = self._save_batch(batch_id, status=final_status, completed_at=datetime.utcnow().isoformat())
+        print(f"{'✅' if final_status == 'COMPLETE' else '❌'} KB 동기화 배치 종료: {batch_id} → {final_status}")
+
+        if final_status == "COMPLETE":
+            for callback in self._callbacks:
+                try:
+                    result = callback(state)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    print(f"⚠️ KB 동기화 완료 콜백 실패 (무시됨): {e}")
+
+ingestion_scheduler = IngestionScheduler()
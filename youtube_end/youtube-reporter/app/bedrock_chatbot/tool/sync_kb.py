@@ -10,87 +10,67 @@ from botocore.exceptions import ClientError
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.core.config import settings
 
-def sync_kb():
-    """Bedrock Knowledge Base 동기화 Job 시작"""
-    try:
-        bedrock_client = boto3.client("bedrock-agent", region_name=settings.AWS_REGION)
-        
-        response = bedrock_client.start_ingestion_job(
-            knowledgeBaseId=settings.BEDROCK_KB_ID,
-            dataSourceId=settings.BEDROCK_DS_ID
-        )
-        
-        job_id = response["ingestionJob"]["ingestionJobId"]
-        print(f"📋 KB 동기화 Job 시작: {job_id}")
-        return job_id
-        
-    except Exception as e:
-        print(f"❌ KB 동기화 Job 시작 실패: {e}")
-        return None
+# 아직 S3를 스캔하기 전이라 새로 올린 파일도 반영되는 상태
+STARTING_STATUSES = ["STARTING"]
+RUNNING_STATUSES = ["STARTING", "IN_PROGRESS", "STOPPING"]
+
+_kb_client = None
+
+def get_bedrock_agent_client():
+    """bedrock-agent 클라이언트 (프로세스 단위 재사용)"""
+    global _kb_client
+    if _kb_client is None:
+        _kb_client = boto3.client("bedrock-agent", region_name=settings.AWS_REGION)
+    return _kb_client
 
-    print("===== Lambda sync_kb ENTRY =====")
-    print("MODULE FILE:", __file__)
-    print("BEDROCK_DS_ID current:", settings.BEDROCK_DS_ID, type(settings.BEDROCK_DS_ID))
-    print("BEDROCK_KB_ID current:", settings.BEDROCK_KB_ID, type(settings.BEDROCK_KB_ID))
-    print("AWS_REGION current:", settings.AWS_REGION, type(settings.AWS_REGION))
+def find_running_ingestion_job():
+    """진행 중인 Ingestion Job 조회 → (job_id, status) 또는 None"""
+    response = get_bedrock_agent_client().list_ingestion_jobs(
+        knowledgeBaseId=settings.BEDROCK_KB_ID,
+        dataSourceId=settings.BEDROCK_DS_ID,
+        filters=[{"attribute": "STATUS", "operator": "EQ", "values": RUNNING_STATUSES}],
+        sortBy={"attribute": "STARTED_AT", "order": "DESCENDING"},
+        maxResults=5
+    )
+    for job in response.get("ingestionJobSummaries", []):
+        if job.get("status") in RUNNING_STATUSES:
+            return str(job["ingestionJobId"]), job["status"]
+    return None
 
+def start_ingestion_job():
+    """새 Ingestion Job 시작 → job_id (다른 Job 진행 중이면 ClientError ConflictException)"""
+    response = get_bedrock_agent_client().start_ingestion_job(
+        knowledgeBaseId=str(settings.BEDROCK_KB_ID),
+        dataSourceId=str(settings.BEDROCK_DS_ID)
+    )
+    job_id = response["ingestionJob"]["ingestionJobId"]
+    print(f"📋 KB 동기화 Job 시작: {job_id}")
+    return str(job_id)
+
+def sync_kb():
+    """Bedrock Knowledge Base 동기화 Job 시작 (진행 중인 Job이 있으면 재사용)"""
     # 환경 변수 검증
     if not settings.BEDROCK_KB_ID or not settings.BEDROCK_DS_ID:
         print("❌ KB 동기화 실패: BEDROCK_KB_ID 또는 BEDROCK_DS_ID가 설정되지 않음")
-        print(f"BEDROCK_KB_ID: {settings.BEDROCK_KB_ID}")
-        print(f"BEDROCK_DS_ID: {settings.BEDROCK_DS_ID}")
         return None
 
-    print("✅ 환경 변수 검증 통과")
-    kb_client = boto3.client("bedrock-agent", region_name=settings.AWS_REGION)
-    print("✅ Bedrock Agent 클라이언트 생성 완료")
-
     # ① 진행 중인 Job 확인
     try:
-        print("🔍 기존 Job 확인 중...")
-        jobs = kb_client.list_ingestion_jobs(
-            knowledgeBaseId=settings.BEDROCK_KB_ID,
-            dataSourceId=settings.BEDROCK_DS_ID
-        )
-        print(f"📋 발견된 Job 수: {len(jobs.get('ingestionJobSummaries', []))}")
-        
-        for job in jobs.get("ingestionJobSummaries", []):
-            print(f"  - Job ID: {job.get('ingestionJobId')}, Status: {job.get('status')}")
-            if (
-                str(job.get("dataSourceId")) == str(settings.BEDROCK_DS_ID) and
-                job.get("status") in ["STARTING", "IN_PROGRESS", "COMPLETE"]
-            ):
-                job_id = job["ingestionJobId"]
-                print(f"⚠️ 진행 중인 Job이 있습니다: {job_id} → 재사용")
-                return str(job_id)
+        running = find_running_ingestion_job()
+        if running:
+            job_id, status = running
+            print(f"⚠️ 진행 중인 Job이 있습니다: {job_id} ({status}) → 재사용")
+            return job_id
     except Exception as e:
         print(f"⚠️ 기존 Job 확인 중 오류: {e}")
 
     # ② 새로 요청
     try:
-        # AWS Bedrock Agent API의 정확한 파라미터명 사용 (camelCase)
-        params = {
-            "knowledgeBaseId": str(settings.BEDROCK_KB_ID),
-            "dataSourceId": str(settings.BEDROCK_DS_ID)
-        }
-        print("🚀 새로운 Ingestion Job 시작 요청...")
-        print("Calling start_ingestion_job params:", params)
-        print("파라미터 타입:", {k: type(v) for k, v in params.items()})
-        print("파라미터 값 확인:")
-        print(f"  knowledgeBaseId: '{params['knowledgeBaseId']}' (길이: {len(params['knowledgeBaseId'])})")
-        print(f"  dataSourceId: '{params['dataSourceId']}' (길이: {len(params['dataSourceId'])})")
-
-        response = kb_client.start_ingestion_job(**params)
-        job_id = response["ingestionJob"]["ingestionJobId"]
-        print("✅ Job Started:", job_id)
-        return str(job_id)
-
+        return start_ingestion_job()
     except ClientError as e:
-        print("❌ AWS CLIENT ERROR 발생")
-        print("💥", str(e))
-        print("🧪 RAW AWS RESPONSE:", json.dumps(e.response, indent=2, ensure_ascii=False))
+        print("❌ KB 동기화 Job 시작 실패 (AWS CLIENT ERROR)")
+        print("🧪 RAW AWS RESPONSE:", json.dumps(e.response, indent=2, ensure_ascii=False, default=str))
         return None
     except Exception as e:
-        print("❌ 일반 EXCEPTION 발생")
-        print("💥", str(e))
-        return None
\ No newline at end of file
+        print(f"❌ KB 동기화 Job 시작 실패: {e}")
+        return None
@@ -1,18 +1,24 @@
 #tool/wait_until_kb_sync_complete.py
-import boto3
-import time
+import asyncio
 import sys
 import os
+from datetime import datetime
 
-# 상위 디렉토리의 app.core.config를 사용하기 위한 경로 설정
+# 상위 디렉토리의 app.core를 사용하기 위한 경로 설정
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.core.config import settings
+from app.core.redis_client import redis_client
+from .sync_kb import get_bedrock_agent_client
+
+JOB_KEY_PREFIX = "kb_ingestion:job"
+TERMINAL_STATUSES = ["COMPLETE", "FAILED", "STOPPED"]
+RUNNING_JOB_TTL = 60        # 진행 중 상태 캐시 TTL (폴링 주기보다 길게)
+TERMINAL_JOB_TTL = 86400    # 종료 상태는 바뀌지 않으므로 길게 보관
 
 def get_ingestion_job_status(job_id: str) -> str:
-    """KB 동기화 Job 상태 조회"""
+    """KB 동기화 Job 상태 조회 (bedrock-agent 클라이언트 재사용)"""
     try:
-        bedrock_client = boto3.client("bedrock-agent", region_name=settings.AWS_REGION)
-        response = bedrock_client.get_ingestion_job(
+        response = get_bedrock_agent_client().get_ingestion_job(
             knowledgeBaseId=settings.BEDROCK_KB_ID,
             dataSourceId=settings.BEDROCK_DS_ID,
             ingestionJobId=job_id
@@ -22,27 +28,84 @@ def get_ingestion_job_status(job_id: str) -> str:
         print(f"⚠️ Job 상태 조회 실패: {e}")
         return "UNKNOWN"
 
-def wait_until_kb_sync_complete(job_id: str, max_wait_sec: int = 60) -> str:
-    """KB 동기화 Job 완료까지 대기"""
-    print(f"⏳ KB 동기화 완료 대기 중... (최대 {max_wait_sec}초)")
-    
-    start_time = time.time()
-    while time.time() - start_time < max_wait_sec:
+class IngestionJobTracker:
+    """Ingestion Job 상태 비동기 추적기
+
+    - Job별 폴러 하나만 실행하고, 같은 Job을 기다리는 요청은 모두 그 결과를 공유
+    - 지수 백오프로 폴링 (initial_interval_sec → max_interval_sec)
+    - 조회한 상태는 Redis에 캐시해 다른 워커/상태 엔드포인트가 API 호출 없이 확인
+    - 이미 종료 상태가 캐시된 Job은 API를 호출하지 않음
+    """
+
+    def __init__(self, initial_interval_sec: float = 2.0, max_interval_sec: float = 30.0,
+                 backoff_factor: float = 2.0, max_poll_sec: float = 1800.0):
+        self.initial_interval_sec = initial_interval_sec
+        self.max_interval_sec = max_interval_sec
+        self.backoff_factor = backoff_factor
+        self.max_poll_sec = max_poll_sec
+        self._pollers = {}  # job_id -> asyncio.Task
+
+    def get_cached_status(self, job_id: str):
+        """캐시된 Job 상태 조회 ({"status", "checked_at", "polls"} 또는 None)"""
         try:
-            status = get_ingestion_job_status(job_id)
-            if status in ["COMPLETE", "FAILED", "STOPPED"]:
-                if status == "COMPLETE":
-                    print("✅ KB 동기화 완료!")
-                else:
-                    print(f"❌ KB 동기화 실패: {status}")
-                return status
-            
-            # 5초 대기
-            time.sleep(5)
-            
+            return redis_client.get(f"{JOB_KEY_PREFIX}:{job_id}")
         except Exception as e:
-            print(f"⚠️ 상태 확인 중 오류: {e}")
-            time.sleep(2)
-    
-    print(f"⏰ 시간 초과 ({max_wait_sec}초)")
-    return "TIMEOUT"
\ No newline at end of file
+            print(f"⚠️ KB 동기화 Job 상태 캐시 조회 실패: {e}")
+            return None
+
+    def _cache_status(self, job_id: str, status: str, polls: int):
+        ttl = TERMINAL_JOB_TTL if status in TERMINAL_STATUSES else RUNNING_JOB_TTL
+        state = {"job_id": job_id, "status": status, "checked_at": datetime.utcnow().isoformat(), "polls": polls}
+        try:
+            redis_client.set_with_ttl(f"{JOB_KEY_PREFIX}:{job_id}", state, ttl)
+        except Exception as e:
+            print(f"⚠️ KB 동기화 Job 상태 캐시 저장 실패 (무시됨): {e}")
+
+    async def _poll(self, job_id: str) -> str:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_poll_sec
+        interval = self.initial_interval_sec
+        polls = 0
+        try:
+            while loop.time() < deadline:
+                cached = self.get_cached_status(job_id)
+                if cached and cached.get("status") in TERMINAL_STATUSES:
+                    return cached["status"]
+
+                status = await asyncio.to_thread(get_ingestion_job_status, job_id)
+                polls += 1
+                if status != "UNKNOWN":
+                    self._cache_status(job_id, status, polls)
+                if status in TERMINAL_STATUSES:
+                    print(f"{'✅' if status == 'COMPLETE' else '❌'} KB 동기화 Job 종료: {job_id} → {status} (조회 {polls}회)")
+                    return status
+
+                await asyncio.sleep(min(interval, max(deadline - loop.time(), 0)))
+                interval = min(interval * self.backoff_factor, self.max_interval_sec)
+            return "TIMEOUT"
+        finally:
+            self._pollers.pop(job_id, None)
+
+    async def wait(self, job_id: str, max_wait_sec: float = None) -> str:
+        """Job 종료까지 비동기 대기 → 최종 상태 (max_wait_sec 초과 시 "TIMEOUT")
+
+        대기하던 요청이 시간 초과되거나 취소돼도 공유 폴러는 계속 실행된다.
+        """
+        poller = self._pollers.get(job_id)
+        if poller is None:
+            poller = asyncio.get_running_loop().create_task(self._poll(job_id))
+            self._pollers[job_id] = poller
+        try:
+            return await asyncio.wait_for(asyncio.shield(poller), timeout=max_wait_sec)
+        except asyncio.TimeoutError:
+            return "TIMEOUT"
+
+ingestion_tracker = IngestionJobTracker()
+
+async def wait_until_kb_sync_complete(job_id: str, max_wait_sec: int = 60) -> str:
+    """KB 동기화 Job 완료까지 대기 (이벤트 루프를 막지 않음)"""
+    print(f"⏳ KB 동기화 완료 대기 중... (최대 {max_wait_sec}초)")
+    status = await ingestion_tracker.wait(job_id, max_wait_sec)
+    if status == "TIMEOUT":
+        print(f"⏰ 시간 초과 ({max_wait_sec}초)")
+    return status
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import datetime
+import asyncio
+import json
 import os
 import sys
 import jwt
@@ -10,11 +12,13 @@ import jwt
 sys.path.append(os.path.join(os.path.dirname(__file__), 'bedrock_chatbot'))
 
 # 상대 경로로 import
-from .bedrock_chatbot.agents.bedrock_agent import answer_question
-from .bedrock_chatbot.tool.sync_kb import sync_kb
-from .bedrock_chatbot.tool.wait_until_kb_sync_complete import wait_until_kb_sync_complete
+from .bedrock_chatbot.agents.bedrock_agent import answer_question, stream_answer, answer_cache
+from .bedrock_chatbot.agents.chat_history import chat_history_store
+from .bedrock_chatbot.tool.ingestion_scheduler import ingestion_scheduler
+from .bedrock_chatbot.tool.wait_until_kb_sync_complete import ingestion_tracker
+from .bedrock_chatbot.tool.build_local_index import build_local_index
 from app.core.config import settings  # 통합된 config 사용
-from app.services.cognito_service import get_user_info
+from app.services.cognito_service import get_user_info, verify_access_token
 import boto3
 import requests
 import uuid
@@ -44,8 +48,8 @@ class ChatMessage(BaseModel):
     content: str
     timestamp: str
 
-# 전역 변수로 채팅 히스토리 저장
-chat_history: List[ChatMessage] = []
+# KB 동기화 완료 시 이전 KB 버전 기준 답변 캐시 무효화
+ingestion_scheduler.add_completion_callback(lambda state: answer_cache.bump_version())
 
 def get_current_user_email(authorization: Optional[str] = Header(None)) -> str:
     """인증된 사용자의 이메일 가져오기 - JWT 디코딩 사용"""
@@ -71,6 +75,22 @@ def get_current_user_email(authorization: Optional[str] = Header(None)) -> str:
         print(f"⚠️ JWT 디코딩 실패: {e}")
         return "anonymous@example.com"
 
+def get_verified_user_id(authorization: Optional[str], required: bool = True) -> Optional[str]:
+    """채팅 히스토리 소유자 - 서명/만료/폐기 검증을 통과한 액세스 토큰의 username
+
+    토큰이 없으면 required일 때 401, 아니면 None(익명). 토큰이 있는데 검증에 실패하면 항상 401.
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        if required:
+            raise HTTPException(status_code=401, detail="Authorization header required")
+        return None
+
+    result = verify_access_token(authorization.split(" ")[1])
+    if not result.get("valid"):
+        print(f"⚠️ 액세스 토큰 검증 실패: {result.get('error')}")
+        raise HTTPException(status_code=401, detail="Invalid token", headers={"WWW-Authenticate": "Bearer"})
+    return result["username"]
+
 # 공통 YouTube 처리 함수
 async def process_youtube_common(youtube_url: str, user_email: str = "anonymous@example.com"):
     """YouTube URL을 처리하는 공통 함수 - 새로운 YouTubeProcessingService 사용"""
@@ -87,34 +107,20 @@ async def process_youtube_common(youtube_url: str, user_email: str = "anonymous@
         
         print(f"✅ YouTube 처리 완료: {result['s3_key']}")
         
-        # KB 동기화는 별도로 처리 (기존 로직 유지)
-        print(f"🔄 KB 동기화 시작...")
+        # 로컬 자막 인덱스 증분 갱신 (백그라운드 스레드, 요청을 막지 않음)
+        asyncio.get_running_loop().run_in_executor(None, build_local_index)
         
-        # KB 동기화 활성화
-        try:
-            job_id = sync_kb()
-            if job_id:
-                print(f"📋 KB 동기화 Job 시작: {job_id}")
-                # Job 완료 대기
-                final_status = wait_until_kb_sync_complete(job_id, max_wait_sec=60)
-                if final_status == "COMPLETE":
-                    kb_sync_result = "SUCCESS"
-                    print("✅ KB 동기화 완료")
-                else:
-                    kb_sync_result = f"FAILED: {final_status}"
-                    print(f"❌ KB 동기화 실패: {final_status}")
-            else:
-                kb_sync_result = "FAILED: No job_id"
-                print("❌ KB 동기화 Job ID를 받지 못함")
-        except Exception as kb_error:
-            kb_sync_result = f"ERROR: {str(kb_error)}"
-            print(f"❌ KB 동기화 에러: {kb_error}")
+        # KB 동기화는 배치 스케줄러에 맡기고 요청은 기다리지 않음
+        batch_id = ingestion_scheduler.request_sync(result["s3_key"])
+        kb_sync_result = f"SCHEDULED: {batch_id}"
+        print(f"🔄 KB 동기화 예약: {batch_id}")
         
         print(f"🎉 분석 완료 - S3: {result['s3_key']}, KB: {kb_sync_result}")
         
         return {
             "s3_key": result["s3_key"],
             "kb_sync_result": kb_sync_result,
+            "kb_sync_batch_id": batch_id,
             "content_length": result["content_length"]
         }
         
@@ -131,28 +137,22 @@ async def chat(request: QuestionRequest, authorization: Optional[str] = Header(N
     try:
         print(f"🤖 챗봇 질문 받음: {request.question}")
         
-        # Cognito 인증된 사용자 이메일 가져오기
-        user_email = get_current_user_email(authorization)
-        print(f"👤 사용자: {user_email}")
+        # 검증된 Cognito 사용자 (토큰이 없으면 익명 - 히스토리 없이 답변)
+        user_id = await asyncio.to_thread(get_verified_user_id, authorization, False)
+        print(f"👤 사용자: {user_id or '익명'}")
         
-        # 질문에 대한 답변 생성
+        # 질문에 대한 답변 생성 (최근 대화를 맥락으로 사용)
         print("🔍 answer_question 함수 호출 시작...")
-        answer = answer_question(request.question)
+        history = get_context_history(user_id)
+        answer = answer_question(request.question, history)
         print(f"✅ 답변 생성 완료: {answer[:100]}...")
         
         # 채팅 히스토리에 추가
-        chat_history.append(ChatMessage(
-            role="user",
-            content=request.question,
-            timestamp=datetime.datetime.now().isoformat()
-        ))
-        chat_history.append(ChatMessage(
-            role="assistant",
-            content=answer,
-            timestamp=datetime.datetime.now().isoformat()
-        ))
+        save_chat_turn(user_id, request.question, answer)
         
         return QuestionResponse(answer=answer, success=True)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ 챗봇 오류 발생: {str(e)}")
         print(f"❌ 오류 타입: {type(e)}")
@@ -164,6 +164,52 @@ async def chat(request: QuestionRequest, authorization: Optional[str] = Header(N
             error=str(e)
         )
 
+def get_context_history(user_id: Optional[str]) -> list:
+    """QA 체인에 넣을 최근 대화 (익명 사용자는 서로 섞이지 않도록 사용 안 함)"""
+    if not user_id:
+        return []
+    return chat_history_store.recent_messages(user_id)
+
+def save_chat_turn(user_id: Optional[str], question: str, answer: str):
+    """사용자별 채팅 히스토리에 질문/답변 저장"""
+    if user_id:
+        chat_history_store.append_turn(user_id, question, answer)
+
+@router.post("/bedrock/api/chat/stream")
+async def chat_stream(request: QuestionRequest, authorization: Optional[str] = Header(None)):
+    """챗봇 답변 스트리밍 (SSE) - 토큰이 생성되는 대로 전송
+
+    이벤트: data: {"token": "..."} 반복 후 data: {"done": true, "answer": "..."}
+    오류 시 data: {"done": true, "error": "..."}
+    기존 /bedrock/api/chat 응답 형식은 그대로 유지된다.
+    """
+    print(f"🤖 챗봇 스트리밍 질문 받음: {request.question}")
+    user_id = await asyncio.to_thread(get_verified_user_id, authorization, False)
+    print(f"👤 사용자: {user_id or '익명'}")
+
+    def event_stream():
+        # 동기 제너레이터 → StreamingResponse가 스레드풀에서 순회하므로 이벤트 루프를 막지 않음
+        answer_parts = []
+        try:
+            history = get_context_history(user_id)
+            for token in stream_answer(request.question, history):
+                answer_parts.append(token)
+                yield f"data: {json.dumps({'token': token}, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            print(f"❌ 챗봇 스트리밍 오류 발생: {str(e)}")
+            yield f"data: {json.dumps({'done': True, 'error': str(e)}, ensure_ascii=False)}\n\n"
+            return
+
+        answer = "".join(answer_parts)
+        save_chat_turn(user_id, request.question, answer)
+        yield f"data: {json.dumps({'done': True, 'answer': answer}, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/bedrock/api/process-youtube", response_model=YouTubeProcessResponse)
 async def process_youtube(request: YouTubeProcessRequest, authorization: Optional[str] = Header(None)):
     try:
@@ -200,14 +246,41 @@ async def process_youtube_get(youtube_url: str, authorization: Optional[str] = H
         print(f"❌ YouTube 처리 에러: {str(e)}")
         raise HTTPException(status_code=500, detail=f"YouTube 처리 중 오류가 발생했습니다: {str(e)}")
 
+@router.get("/bedrock/api/kb-sync/{batch_id}")
+async def get_kb_sync_status(batch_id: str):
+    """KB 동기화 배치 상태 조회 (SCHEDULED → IN_PROGRESS → COMPLETE/FAILED/STOPPED/TIMEOUT)"""
+    state = ingestion_scheduler.get_batch_status(batch_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="KB 동기화 배치를 찾을 수 없습니다.")
+    # 진행 중이면 공유 폴러가 캐시한 Job 상태 포함 (AWS API 추가 호출 없음)
+    job_id = state.get("ingestion_job_id") or state.get("running_job_id")
+    if job_id:
+        state["ingestion_job"] = ingestion_tracker.get_cached_status(job_id)
+    return state
+
+@router.get("/bedrock/api/cache-stats")
+async def get_answer_cache_stats():
+    """답변 캐시 적중률 / 지연 시간 지표"""
+    return answer_cache.stats()
+
 @router.get("/bedrock/api/chat-history")
-async def get_chat_history():
-    return {"messages": chat_history}
+async def get_chat_history(offset: int = 0, limit: int = 50, authorization: Optional[str] = Header(None)):
+    """사용자 채팅 히스토리 조회 (최신 메시지 기준 offset/limit 페이지, 페이지 내부는 시간순)"""
+    if offset < 0 or not 1 <= limit <= 200:
+        raise HTTPException(status_code=400, detail="offset은 0 이상, limit은 1~200 범위여야 합니다.")
+    user_id = await asyncio.to_thread(get_verified_user_id, authorization)
+    try:
+        page = await asyncio.to_thread(chat_history_store.get_page, user_id, offset, limit)
+    except Exception as e:
+        print(f"❌ 채팅 히스토리 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail="채팅 히스토리 조회 중 오류가 발생했습니다.")
+    page["messages"] = [ChatMessage(**message) for message in page["messages"]]
+    return page
 
 @router.delete("/bedrock/api/chat-history")
-async def clear_chat_history():
-    global chat_history
-    chat_history = []
+async def clear_chat_history(authorization: Optional[str] = Header(None)):
+    user_id = await asyncio.to_thread(get_verified_user_id, authorization)
+    await asyncio.to_thread(chat_history_store.clear, user_id)
     return {"message": "채팅 히스토리가 삭제되었습니다."}
 
 @router.post("/youtube/analysis")
@@ -24,6 +24,16 @@ class Settings(BaseSettings):
     BEDROCK_MODEL_ID: Optional[str] = None
     YOUTUBE_LAMBDA_NAME: Optional[str] = None
 
+    # 로컬 자막 검색 인덱스 (Bedrock KB 이전 빠른 경로)
+    LOCAL_RETRIEVER_ENABLED: bool = True
+    LOCAL_RETRIEVER_INDEX_DIR: str = "data/local_index"
+    LOCAL_RETRIEVER_EMBEDDINGS: bool = True
+
+    # 챗봇 대화 히스토리 (사용자별 Redis 리스트)
+    CHAT_HISTORY_MAX_MESSAGES: int = 200
+    CHAT_HISTORY_TTL: int = 604800
+    CHAT_CONTEXT_MESSAGES: int = 6
+
     # Polly 설정
     POLLY_VOICE_ID: str = "Seoyeon"
 
@@ -50,9 +60,20 @@ class Settings(BaseSettings):
     COGNITO_USER_POOL_ID: Optional[str] = None
     COGNITO_CLIENT_ID: Optional[str] = None
     COGNITO_CLIENT_SECRET: Optional[str] = None
+    # 액세스 토큰 로컬 검증 (JWKS 캐시 주기, 원격 폐기 확인 여부/주기)
+    COGNITO_JWKS_REFRESH_SEC: int = 3600
+    COGNITO_REVOCATION_CHECK: bool = False
+    COGNITO_REVOCATION_CHECK_INTERVAL: int = 300
     
     # 데이터베이스 설정
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # 비동기 엔진 URL (미설정 시 DATABASE_URL에서 asyncpg 드라이버로 변환)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
     
     # Redis 설정
     REDIS_HOST: str = "35.94.188.189"
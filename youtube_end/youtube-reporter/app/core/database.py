@@ -1,16 +1,76 @@
+from contextlib import contextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+engine = create_engine(settings.DATABASE_URL, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# libpq(psycopg2) 전용 URL 파라미터 - asyncpg.connect()가 모르는 인자라 비동기 URL에서 제거
+LIBPQ_ONLY_PARAMS = {
+    "sslrootcert", "sslcert", "sslkey", "sslcrl", "sslpassword", "sslcompression",
+    "connect_timeout", "application_name", "options", "gssencmode", "channel_binding",
+    "keepalives", "keepalives_idle", "keepalives_interval", "keepalives_count",
+}
+
+def get_async_database_url() -> str:
+    """비동기 엔진 URL (postgresql:// → postgresql+asyncpg://, sslmode → ssl, libpq 전용 파라미터 제거)"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    if url.drivername.split("+")[0] not in ("postgresql", "postgres"):
+        return settings.DATABASE_URL
+
+    query = {key: value for key, value in url.query.items() if key not in LIBPQ_ONLY_PARAMS}
+    sslmode = query.pop("sslmode", None)
+    if sslmode is not None and "ssl" not in query:
+        # asyncpg는 같은 이름의 모드(disable/allow/prefer/require/verify-ca/verify-full)를 ssl 인자로 받음
+        query["ssl"] = sslmode
+    url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url.render_as_string(hide_password=False)
+
+# 비동기 엔진은 첫 사용 시 생성 (asyncpg는 조회 핫패스에서만 필요)
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(get_async_database_url(), **POOL_OPTIONS)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def session_scope():
+    """요청 범위 밖(백그라운드 작업 등)에서 사용하는 독립 세션"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """이벤트 루프를 막지 않는 읽기 전용 조회용 세션"""
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
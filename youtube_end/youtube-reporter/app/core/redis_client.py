@@ -1,6 +1,6 @@
 import redis
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from app.core.config import settings
 
 class RedisClient:
@@ -21,6 +21,12 @@ class RedisClient:
         value = self.redis.get(key)
         return json.loads(value) if value else None
     
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """여러 키 한 번에 조회 (MGET)"""
+        if not keys:
+            return []
+        return [json.loads(value) if value else None for value in self.redis.mget(keys)]
+    
     def delete(self, key: str):
         """키 삭제"""
         self.redis.delete(key)
@@ -86,6 +86,7 @@ async def root():
             "s3_list": "/s3/list",
             "health": "/health",
             "bedrock_chat": "/bedrock/api/chat",
+            "bedrock_chat_stream": "/bedrock/api/chat/stream",
             "bedrock_youtube": "/bedrock/api/process-youtube"
         }
     }
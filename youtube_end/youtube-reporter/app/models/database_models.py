@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,7 +26,7 @@ class UserReport(Base):
     __tablename__ = "user_reports"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("user_analysis_jobs.id"))
+    job_id = Column(UUID(as_uuid=True), ForeignKey("user_analysis_jobs.id"), index=True)
     user_id = Column(String(255), nullable=False, index=True)
     title = Column(String(500))
     s3_key = Column(String(500))
@@ -40,11 +40,44 @@ class UserAudioFile(Base):
     __tablename__ = "user_audio_files"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("user_analysis_jobs.id"))
+    job_id = Column(UUID(as_uuid=True), ForeignKey("user_analysis_jobs.id"), index=True)
     user_id = Column(String(255), nullable=False, index=True)
     s3_key = Column(String(500))
     duration = Column(Integer)  # 재생 시간(초)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # 관계
-    job = relationship("UserAnalysisJob", back_populates="audio_files")
\ No newline at end of file
+    job = relationship("UserAnalysisJob", back_populates="audio_files")
+
+# 목록 조회용 복합 인덱스 (user_id 필터 + created_at DESC, id DESC 키셋 페이지네이션)
+Index(
+    "ix_user_analysis_jobs_user_type_created",
+    UserAnalysisJob.user_id,
+    UserAnalysisJob.job_type,
+    UserAnalysisJob.created_at.desc(),
+    UserAnalysisJob.id.desc()
+)
+Index(
+    "ix_user_analysis_jobs_user_created",
+    UserAnalysisJob.user_id,
+    UserAnalysisJob.created_at.desc(),
+    UserAnalysisJob.id.desc()
+)
+Index(
+    "ix_user_analysis_jobs_type_created",
+    UserAnalysisJob.job_type,
+    UserAnalysisJob.created_at.desc(),
+    UserAnalysisJob.id.desc()
+)
+Index(
+    "ix_user_reports_user_created",
+    UserReport.user_id,
+    UserReport.created_at.desc(),
+    UserReport.id.desc()
+)
+Index(
+    "ix_user_audio_files_user_created",
+    UserAudioFile.user_id,
+    UserAudioFile.created_at.desc(),
+    UserAudioFile.id.desc()
+)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Form, Query, Header
 from typing import List, Optional
+import asyncio
 from datetime import datetime
-import uuid
 import jwt
 
 from app.models.analysis import (
@@ -11,15 +11,13 @@ from app.models.analysis import (
 from app.services.s3_service import s3_service
 from app.services.audio_service import audio_service
 from app.services.analysis_service import analysis_service
+from app.services.analysis_job_store import analysis_job_store
 from app.services.youtube_processing_service import youtube_processing_service
 from app.services.cognito_service import get_user_info
 from app.core.config import settings
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
-# 분석 작업 저장소
-analysis_jobs = {}
-
 def get_current_user_email(authorization: Optional[str] = Header(None)) -> str:
     """인증된 사용자의 이메일 가져오기 - JWT 디코딩 사용"""
     if not authorization or not authorization.startswith("Bearer "):
@@ -43,12 +41,20 @@ def get_current_user_email(authorization: Optional[str] = Header(None)) -> str:
         return "anonymous@example.com"
 
 @router.get("/")
-async def list_analysis_jobs():
-    """모든 분석 작업 목록 조회"""
+async def list_analysis_jobs(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(50, ge=1, le=100, description="페이지 크기")
+):
+    """모든 분석 작업 목록 조회 (최신순 커서 페이지네이션)"""
+    try:
+        jobs, next_cursor = await asyncio.to_thread(analysis_job_store.list, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     jobs_list = []
-    for job_id, job in analysis_jobs.items():
+    for job in jobs:
         job_info = {
-            "job_id": job_id,
+            "job_id": job["request_id"],
             "status": job["status"],
             "current_step": job.get("current_step"),
             "progress": job.get("progress", 0),
@@ -76,25 +82,27 @@ async def list_analysis_jobs():
         
         jobs_list.append(job_info)
     
+    status_counts = await asyncio.to_thread(analysis_job_store.count_by_status)
+    
     return {
-        "total_jobs": len(jobs_list),
-        "jobs": sorted(jobs_list, key=lambda x: x["created_at"], reverse=True),
+        "total_jobs": sum(status_counts.values()),
+        "jobs": jobs_list,
+        "next_cursor": next_cursor,
         "summary": {
             "with_s3_reports": len([j for j in jobs_list if j["has_s3_report"]]),
             "with_audio": len([j for j in jobs_list if j["has_audio"]]),
-            "completed": len([j for j in jobs_list if j["status"] == "completed"]),
-            "processing": len([j for j in jobs_list if j["status"] == "processing"])
+            "completed": status_counts.get("completed", 0),
+            "processing": status_counts.get("processing", 0)
         }
     }
 
 @router.get("/{job_id}", response_model=AnalysisResponse)
 async def get_analysis_status(job_id: str):
     """분석 작업 상태 및 결과 조회"""
-    if job_id not in analysis_jobs:
+    job = await asyncio.to_thread(analysis_job_store.get, job_id)
+    if not job:
         raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
     
-    job = analysis_jobs[job_id]
-    
     return AnalysisResponse(
         request_id=job["request_id"],
         status=job["status"],
@@ -112,10 +120,10 @@ async def get_analysis_status(job_id: str):
 @router.delete("/{job_id}")
 async def delete_analysis_job(job_id: str, delete_s3_files: bool = Query(False)):
     """분석 작업 삭제 (선택적으로 S3 파일도 삭제)"""
-    if job_id not in analysis_jobs:
+    job = await asyncio.to_thread(analysis_job_store.get, job_id)
+    if not job:
         raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
     
-    job = analysis_jobs[job_id]
     deleted_files = []
     
     # S3 파일 삭제 (옵션)
@@ -142,7 +150,7 @@ async def delete_analysis_job(job_id: str, delete_s3_files: bool = Query(False))
             print(f"S3 파일 삭제 중 오류: {e}")
     
     # 작업 삭제
-    del analysis_jobs[job_id]
+    await asyncio.to_thread(analysis_job_store.delete, job_id)
     
     return {
         "message": f"작업 {job_id}가 삭제되었습니다.",
@@ -169,6 +177,8 @@ async def health_check():
     except:
         polly_status = False
     
+    status_counts = await asyncio.to_thread(analysis_job_store.count_by_status)
+    
     return {
         "status": "healthy",
         "services": {
@@ -184,8 +194,8 @@ async def health_check():
             "default_voice": settings.POLLY_VOICE_ID,
             "supported_voices": ["Seoyeon"] if polly_status else []
         },
-        "active_jobs": len([job for job in analysis_jobs.values() if job["status"] == "processing"]),
-        "total_jobs": len(analysis_jobs),
+        "active_jobs": status_counts.get("processing", 0),
+        "total_jobs": sum(status_counts.values()),
         "supported_formats": [".pdf", ".docx", ".xlsx", ".csv", ".txt"],
         "timestamp": datetime.now().isoformat()
     }
@@ -197,34 +207,26 @@ async def analyze_youtube(
     authorization: Optional[str] = Header(None)
 ):
     """YouTube URL 분석 - Cognito 인증된 사용자 이메일 사용"""
-    job_id = str(uuid.uuid4())
-    
     # Cognito 인증된 사용자 이메일 가져오기
     user_email = get_current_user_email(authorization)
     user_id = request.user_id or user_email.split("@")[0]  # 이메일에서 사용자 ID 추출
     
     print(f"🔐 인증된 사용자: {user_email}")
     
-    # 작업 초기화
-    analysis_jobs[job_id] = {
-        "request_id": job_id,
-        "status": "processing",
-        "current_step": "YouTube 처리 시작",
-        "progress": 0,
-        "input_type": "youtube",
-        "youtube_url": request.youtube_url,
-        "user_email": user_email,
-        "user_id": user_id,
-        "created_at": datetime.now(),
-        "result": None,
-        "error": None
-    }
+    # 작업 초기화 (DB + Redis)
+    job = await asyncio.to_thread(
+        analysis_job_store.create,
+        user_id=user_id,
+        input_type="youtube",
+        input_data={"youtube_url": request.youtube_url, "user_email": user_email}
+    )
+    job_id = job["request_id"]
+    analysis_job_store.update(job_id, current_step="YouTube 처리 시작")
     
     async def process_youtube_analysis():
         try:
             # 진행률 업데이트
-            analysis_jobs[job_id]["current_step"] = "YouTube 자막 추출 및 S3 저장"
-            analysis_jobs[job_id]["progress"] = 20
+            analysis_job_store.update(job_id, current_step="YouTube 자막 추출 및 S3 저장", progress=20)
             
             # 1. YouTubeProcessingService로 YouTube 처리 (Cognito 사용자 이메일 사용)
             youtube_result = await youtube_processing_service.process_youtube_to_s3(
@@ -232,8 +234,7 @@ async def analyze_youtube(
                 user_email=user_email
             )
             
-            analysis_jobs[job_id]["current_step"] = "LangGraph FSM 분석 실행"
-            analysis_jobs[job_id]["progress"] = 50
+            analysis_job_store.update(job_id, current_step="LangGraph FSM 분석 실행", progress=50)
             
             # 2. LangGraph FSM 분석
             analysis_result = await analysis_service.analyze_youtube_with_fsm(
@@ -243,20 +244,15 @@ async def analyze_youtube(
                 user_email=user_email
             )
             
-            analysis_jobs[job_id]["current_step"] = "분석 완료"
-            analysis_jobs[job_id]["progress"] = 100
-            analysis_jobs[job_id]["status"] = "completed"
-            analysis_jobs[job_id]["completed_at"] = datetime.now()
-            analysis_jobs[job_id]["result"] = analysis_result.analysis_results
+            analysis_job_store.update(job_id, current_step="분석 완료")
+            await asyncio.to_thread(analysis_job_store.complete, job_id, user_id, analysis_result.analysis_results)
             
             print(f"✅ YouTube 분석 완료: {job_id}")
             print(f"📧 사용자 이메일: {user_email}")
             print(f"📁 S3 저장 경로: {youtube_result['s3_key']}")
             
         except Exception as e:
-            analysis_jobs[job_id]["status"] = "failed"
-            analysis_jobs[job_id]["error"] = str(e)
-            analysis_jobs[job_id]["completed_at"] = datetime.now()
+            await asyncio.to_thread(analysis_job_store.fail, job_id, user_id, str(e))
             print(f"❌ YouTube 분석 실패: {job_id} - {str(e)}")
     
     # 백그라운드에서 분석 실행
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import Dict, Any
 from app.services.document_service import document_service
+from app.services.analysis_service import analysis_service
 from app.models.document import DocumentAnalysisRequest, DocumentAnalysisResponse
 from datetime import datetime
 import uuid
@@ -22,8 +23,19 @@ async def analyze_document(
     - **request**: 분석 요청 옵션 (메타데이터, 오디오 포함 여부 등)
     """
     try:
-        # 문서 처리
+        created_at = datetime.now()
+
+        # 문서 처리 (같은 내용의 파일은 캐시된 추출 결과 재사용)
         result = await document_service.process_document(file)
+
+        # 문서 분석 (같은 내용 + 메타데이터는 캐시된 분석 결과 재사용 - LLM 호출 생략)
+        metadata = {
+            "filename": result["filename"],
+            "content_type": result["content_type"],
+            **(result.get("metadata") or {}),
+            **((request.metadata or {}) if request else {})
+        }
+        analysis = await analysis_service.analyze_document(result["text"], metadata)
         
         # 응답 생성
         response = DocumentAnalysisResponse(
@@ -32,18 +44,25 @@ async def analyze_document(
             document_info={
                 "filename": result["filename"],
                 "content_type": result["content_type"],
-                "size": result["size"]
+                "size": result["size"],
+                "pages": result.get("pages"),
+                "word_count": result["word_count"]
             },
-            analysis_results={
+            analysis_result={
                 "text": result["text"],
                 "word_count": result["word_count"],
-                "metadata": result.get("metadata", {})
+                "metadata": result.get("metadata", {}),
+                "content_hash": result["content_hash"],
+                "extraction_cached": result["cached"],
+                **analysis.analysis_results
             },
-            created_at=datetime.now(),
-            completed_at=datetime.now()
+            created_at=created_at.isoformat(),
+            completed_at=datetime.now().isoformat()
         )
         
         return response.dict()
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
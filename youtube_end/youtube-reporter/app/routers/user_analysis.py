@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import uuid
 
 from app.core.auth import get_current_user
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db, session_scope
 from app.models.database_models import UserAnalysisJob, UserReport, UserAudioFile
 from app.services.database_service import database_service
 from app.services.state_manager import state_manager
@@ -50,8 +51,7 @@ async def create_youtube_analysis(
             run_youtube_analysis,
             str(job.id),
             user_id,
-            youtube_url,
-            db
+            youtube_url
         )
         
         return {
@@ -63,8 +63,8 @@ async def create_youtube_analysis(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 작업 생성 실패: {str(e)}")
 
-async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str, db: Session):
-    """백그라운드 YouTube 분석 실행"""
+async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str):
+    """백그라운드 YouTube 분석 실행 (완료 처리는 자체 세션에서 단일 트랜잭션)"""
     try:
         # LangGraph FSM 분석 실행
         result = await langgraph_service.analyze_youtube_with_fsm(
@@ -74,6 +74,8 @@ async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str, db:
         )
         
         # 보고서 S3 업로드
+        s3_key = None
+        report_row = None
         if result.get("final_output"):
             report_content = str(result["final_output"])
             s3_key = user_s3_service.upload_user_report(
@@ -82,37 +84,42 @@ async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str, db:
                 content=report_content,
                 file_type="json"
             )
-            
-            # 데이터베이스에 보고서 정보 저장
-            database_service.create_user_report(
-                db=db,
-                job_id=job_id,
-                user_id=user_id,
-                title=f"YouTube Analysis - {job_id}",
-                s3_key=s3_key,
-                file_type="json"
-            )
+            report_row = {
+                "title": f"YouTube Analysis - {job_id}",
+                "s3_key": s3_key,
+                "file_type": "json"
+            }
         
-        # 작업 상태 업데이트
-        database_service.update_job_status(db, job_id, "completed", s3_key)
+        # 작업 상태 / 보고서 정보 저장
+        with session_scope() as db:
+            database_service.finalize_job(db, job_id, user_id, "completed", s3_key, report=report_row)
         
         # Redis에서 활성 작업 제거
         state_manager.remove_user_active_job(user_id, job_id)
         
     except Exception as e:
         # 실패 시 상태 업데이트
-        database_service.update_job_status(db, job_id, "failed")
+        with session_scope() as db:
+            database_service.finalize_job(db, job_id, user_id, "failed")
         state_manager.remove_user_active_job(user_id, job_id)
         print(f"YouTube 분석 실패: {e}")
 
 @router.get("/jobs")
 async def get_my_jobs(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(50, ge=1, le=100, description="페이지 크기"),
+    job_type: Optional[str] = Query(None, description="작업 유형 필터"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """사용자 작업 목록 조회"""
+    """사용자 작업 목록 조회 (커서 페이지네이션)"""
     user_id = current_user["user_id"]
-    jobs = database_service.get_user_jobs(db, user_id)
+    try:
+        jobs, next_cursor = await database_service.aget_user_jobs_page(
+            db, user_id, cursor=cursor, limit=limit, job_type=job_type
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "jobs": [
@@ -125,20 +132,21 @@ async def get_my_jobs(
                 "completed_at": job.completed_at.isoformat() if job.completed_at else None
             }
             for job in jobs
-        ]
+        ],
+        "next_cursor": next_cursor
     }
 
 @router.get("/jobs/{job_id}/progress")
 async def get_job_progress(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """작업 진행률 조회"""
     user_id = current_user["user_id"]
     
     # 권한 확인
-    job = database_service.get_job_by_id(db, job_id, user_id)
+    job = await database_service.aget_job_by_id(db, job_id, user_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -154,12 +162,17 @@ async def get_job_progress(
 
 @router.get("/reports")
 async def get_my_reports(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(50, ge=1, le=100, description="페이지 크기"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """사용자 보고서 목록"""
+    """사용자 보고서 목록 (커서 페이지네이션)"""
     user_id = current_user["user_id"]
-    reports = database_service.get_user_reports(db, user_id)
+    try:
+        reports, next_cursor = database_service.get_user_reports_page(db, user_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "reports": [
@@ -171,7 +184,36 @@ async def get_my_reports(
                 "created_at": report.created_at.isoformat()
             }
             for report in reports
-        ]
+        ],
+        "next_cursor": next_cursor
+    }
+
+@router.get("/audio")
+async def get_my_audio_files(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(50, ge=1, le=100, description="페이지 크기"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """사용자 오디오 파일 목록 (커서 페이지네이션)"""
+    user_id = current_user["user_id"]
+    try:
+        audio_files, next_cursor = database_service.get_user_audio_files_page(db, user_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "audio_files": [
+            {
+                "id": str(audio.id),
+                "job_id": str(audio.job_id),
+                "s3_key": audio.s3_key,
+                "duration": audio.duration,
+                "created_at": audio.created_at.isoformat()
+            }
+            for audio in audio_files
+        ],
+        "next_cursor": next_cursor
     }
 
 @router.get("/reports/{report_id}/download")
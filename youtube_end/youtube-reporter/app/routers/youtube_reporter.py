@@ -1,13 +1,16 @@
 # app/routers/youtube_reporter.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.core.auth import get_current_user, get_current_user_optional
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.services.youtube_reporter_service import youtube_reporter_service
 from app.services.database_service import database_service
 from app.models.youtube_reporter import YouTubeReporterRequest, YouTubeReporterResponse
+from app.workflows.visualization_validator import visualization_validator
+from app.services.llm_json import json_extraction_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,14 +18,13 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/youtube-reporter", tags=["YouTube Reporter"])
 
 
-async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str, include_audio: bool, db: Session):
-    """백그라운드에서 YouTube 분석 실행"""
+async def run_youtube_analysis(job_id: str, user_id: str, youtube_url: str, include_audio: bool):
+    """백그라운드에서 YouTube 분석 실행 (요청 세션은 이미 닫혀 있으므로 전달하지 않음)"""
     try:
         await youtube_reporter_service.process_youtube_analysis(
             job_id=job_id,
             user_id=user_id,
             youtube_url=youtube_url,
-            db=db,
             include_audio=include_audio
         )
     except Exception as e:
@@ -64,8 +66,7 @@ async def create_youtube_analysis(
             job_id=job_id,
             user_id=user_id,
             youtube_url=youtube_url,
-            include_audio=include_audio,
-            db=db
+            include_audio=include_audio
         )
 
         return YouTubeReporterResponse(
@@ -87,7 +88,7 @@ async def create_youtube_analysis(
 async def get_analysis_status(
         job_id: str,
         current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     YouTube Reporter 분석 작업 상태 조회
@@ -98,7 +99,7 @@ async def get_analysis_status(
         user_id = current_user["user_id"]
 
         # 데이터베이스에서 작업 정보 조회
-        job = database_service.get_job_by_id(db, job_id, user_id)
+        job = await database_service.aget_job_by_id(db, job_id, user_id)
         if not job:
             raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
@@ -129,7 +130,7 @@ async def get_analysis_status(
 async def get_analysis_result(
         job_id: str,
         current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     YouTube Reporter 분석 결과 조회
@@ -140,7 +141,7 @@ async def get_analysis_result(
         user_id = current_user["user_id"]
 
         # 작업 상태 확인
-        job = database_service.get_job_by_id(db, job_id, user_id)
+        job = await database_service.aget_job_by_id(db, job_id, user_id)
         if not job:
             raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
 
@@ -161,8 +162,7 @@ async def get_analysis_result(
             )
 
         # 보고서 조회
-        reports = database_service.get_user_reports(db, user_id)
-        job_report = next((r for r in reports if str(r.job_id) == job_id), None)
+        job_report = await database_service.aget_report_by_job_id(db, job_id, user_id)
 
         if not job_report:
             raise HTTPException(status_code=404, detail="분석 결과를 찾을 수 없습니다")
@@ -226,8 +226,10 @@ async def get_analysis_result(
 
 @router.get("/jobs")
 async def list_my_analyses(
+        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+        limit: int = Query(50, ge=1, le=100, description="페이지 크기"),
         current_user: dict = Depends(get_current_user_optional),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     내 YouTube Reporter 분석 작업 목록 조회 (로그인 선택적)
@@ -235,13 +237,17 @@ async def list_my_analyses(
     try:
         # 로그인하지 않은 경우 빈 목록 반환
         if not current_user:
-            return {"jobs": [], "total": 0}
+            return {"jobs": [], "total": 0, "next_cursor": None}
             
         user_id = current_user["user_id"]
 
-        # YouTube Reporter 작업만 필터링
-        all_jobs = database_service.get_user_jobs(db, user_id)
-        youtube_jobs = [job for job in all_jobs if job.job_type == "youtube_reporter"]
+        # YouTube Reporter 작업만 DB에서 필터링
+        try:
+            youtube_jobs, next_cursor = await database_service.aget_user_jobs_page(
+                db, user_id, cursor=cursor, limit=limit, job_type="youtube_reporter"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         return {
             "jobs": [
@@ -255,9 +261,12 @@ async def list_my_analyses(
                 }
                 for job in youtube_jobs
             ],
-            "total": len(youtube_jobs)
+            "total": len(youtube_jobs),
+            "next_cursor": next_cursor
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"작업 목록 조회 실패: {str(e)}")
         raise HTTPException(
@@ -297,6 +306,18 @@ async def delete_analysis_job(
         )
 
 
+@router.get("/visualization/stats")
+async def get_visualization_stats():
+    """시각화 데이터 로컬 보정 지표 (보정/거부 횟수, 보정 종류별 누적)"""
+    return visualization_validator.stats()
+
+
+@router.get("/llm-json/stats")
+async def get_llm_json_stats():
+    """LLM 응답 JSON 추출 지표 (그대로/추출/보정 후 파싱, 실패, 스트림 조기 중단 횟수)"""
+    return json_extraction_stats()
+
+
 @router.get("/health")
 async def health_check():
     """YouTube Reporter 서비스 상태 확인"""
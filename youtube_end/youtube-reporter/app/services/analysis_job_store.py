@@ -0,0 +1,167 @@
+import json
+import uuid
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+from app.core.database import session_scope
+from app.core.redis_client import redis_client
+from app.models.database_models import UserAnalysisJob
+from app.services.database_service import database_service
+from app.services.user_s3_service import user_s3_service
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisJobStore:
+    """routers/analysis.py 작업 저장소 - DB(UserAnalysisJob) 영속 + Redis 핫 상태 (TTL 만료)"""
+
+    JOB_TYPE = "analysis_youtube"
+    KEY_PREFIX = "analysis_job"
+    TTL = 86400  # 24시간 후 Redis 핫 상태 만료 (DB 행은 유지)
+
+    def __init__(self):
+        self.redis = redis_client
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def _save_hot(self, job_id: str, state: Dict[str, Any]):
+        try:
+            self.redis.set_with_ttl(self._key(job_id), state, self.TTL)
+        except Exception as e:
+            logger.warning(f"Redis 작업 상태 저장 실패 (무시됨): {e}")
+
+    def _get_hot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.redis.get(self._key(job_id))
+        except Exception as e:
+            logger.warning(f"Redis 작업 상태 조회 실패 (무시됨): {e}")
+            return None
+
+    def _to_job(self, row: UserAnalysisJob, hot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """DB 행 + Redis 핫 상태를 라우터 작업 dict로 변환"""
+        input_data = row.input_data or {}
+        job = {
+            "request_id": str(row.id),
+            "status": row.status,
+            "current_step": None,
+            "progress": 100 if row.status == "completed" else 0,
+            "input_type": input_data.get("input_type"),
+            "youtube_url": input_data.get("youtube_url"),
+            "search_query": input_data.get("search_query"),
+            "file_name": input_data.get("file_name"),
+            "user_email": input_data.get("user_email"),
+            "user_id": row.user_id,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+            "result": None,
+            "error": None
+        }
+        if hot:
+            job.update(hot)
+        return job
+
+    def create(self, user_id: str, input_type: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """작업 생성 (DB 행 + Redis 초기 상태)"""
+        with session_scope() as db:
+            row = database_service.create_analysis_job(
+                db=db,
+                user_id=user_id,
+                job_type=self.JOB_TYPE,
+                input_data={"input_type": input_type, **input_data}
+            )
+            job = self._to_job(row)
+
+        self._save_hot(job["request_id"], {"status": "processing", "progress": 0, "current_step": None})
+        return job
+
+    def update(self, job_id: str, **fields):
+        """진행 상태 갱신 (Redis만 - 진행 중 잦은 갱신이 DB를 거치지 않도록)"""
+        state = self._get_hot(job_id) or {}
+        state.update(fields)
+        self._save_hot(job_id, state)
+
+    def complete(self, job_id: str, user_id: str, result: Optional[Dict[str, Any]]):
+        """작업 완료 (결과 전체를 S3에 저장하고 그 키로 DB 상태 확정 + Redis에 결과 보관)
+
+        Redis 결과는 TTL 후 만료되므로 DB 행의 result_s3_key가 결과의 영속 위치가 된다.
+        """
+        result_s3_key = None
+        if result is not None:
+            try:
+                result_s3_key = user_s3_service.upload_analysis_result(user_id, job_id, result)
+            except Exception as e:
+                logger.warning(f"분석 결과 S3 저장 실패 (무시됨): {e}")
+        with session_scope() as db:
+            database_service.finalize_job(db, job_id, user_id, "completed", result_s3_key=result_s3_key)
+        self.update(job_id, status="completed", progress=100,
+                    completed_at=datetime.utcnow().isoformat(), result=result)
+
+    def fail(self, job_id: str, user_id: str, error: str):
+        """작업 실패 (DB 상태 확정 + Redis에 에러 보관)"""
+        with session_scope() as db:
+            database_service.finalize_job(db, job_id, user_id, "failed")
+        self.update(job_id, status="failed", completed_at=datetime.utcnow().isoformat(), error=error)
+
+    def _load_result(self, result_s3_key: str) -> Optional[Dict[str, Any]]:
+        """S3에 저장된 결과 로드 (Redis 핫 상태가 만료된 완료 작업용)"""
+        content = user_s3_service.get_file_content(result_s3_key)
+        if not content:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            logger.warning(f"분석 결과 파싱 실패 (무시됨): {result_s3_key} - {e}")
+            return None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (DB 행 + Redis 핫 상태, 핫 상태 만료 시 결과는 S3에서 복원)"""
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return None
+
+        with session_scope() as db:
+            row = database_service.get_job(db, job_id)
+            if not row or row.job_type != self.JOB_TYPE:
+                return None
+            job = self._to_job(row, self._get_hot(job_id))
+            result_s3_key = row.result_s3_key
+
+        if job["result"] is None and job["status"] == "completed" and result_s3_key:
+            job["result"] = self._load_result(result_s3_key)
+        return job
+
+    def list(self, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """작업 목록 (job_type 인덱스 키셋 페이지 + Redis MGET)"""
+        with session_scope() as db:
+            rows, next_cursor = database_service.get_jobs_by_type_page(db, self.JOB_TYPE, cursor=cursor, limit=limit)
+            try:
+                hot_states = self.redis.get_many([self._key(str(row.id)) for row in rows])
+            except Exception as e:
+                logger.warning(f"Redis 작업 상태 일괄 조회 실패 (무시됨): {e}")
+                hot_states = [None] * len(rows)
+            return [self._to_job(row, hot) for row, hot in zip(rows, hot_states)], next_cursor
+
+    def count_by_status(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with session_scope() as db:
+            return database_service.count_jobs_by_status(db, self.JOB_TYPE)
+
+    def delete(self, job_id: str) -> bool:
+        """작업 삭제 (DB 행 + Redis 상태)"""
+        job = self.get(job_id)
+        if not job:
+            return False
+
+        with session_scope() as db:
+            database_service.delete_job(db, job_id, job["user_id"])
+        try:
+            self.redis.delete(self._key(job_id))
+        except Exception as e:
+            logger.warning(f"Redis 작업 상태 삭제 실패 (무시됨): {e}")
+        return True
+
+
+analysis_job_store = AnalysisJobStore()
@@ -1,12 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+import asyncio
+import hashlib
+import json
+import re
 import uuid
+import xxhash
 from fastapi import HTTPException
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from app.models.analysis import AnalysisResponse
 from app.services.langgraph_service import langgraph_service
 from app.services.rouge_service import rouge_service
 from app.services.youtube_processing_service import youtube_processing_service
+from app.core.redis_client import redis_client
+
+# 문서 map-reduce 분석 설정
+DOCUMENT_MAP_CONCURRENCY = 4          # 동시에 요약할 청크 수
+DOCUMENT_CHUNK_MIN_CHARS = 2000       # 내용 기반 청크 경계를 허용하는 최소 길이
+DOCUMENT_CHUNK_MAX_CHARS = 6000       # 청크 최대 길이 (경계 조건과 무관하게 끊음)
+DOCUMENT_BOUNDARY_MODULUS = 4         # 문단 해시 % 4 == 0 인 문단 뒤에서 청크를 끊음
+DOCUMENT_REDUCE_MAX_CHARS = 12000     # reduce 단계 프롬프트 하나에 넣을 요약 최대 길이
+CHUNK_SUMMARY_PROMPT_VERSION = "v1"   # 청크 요약 프롬프트 변경 시 올려서 캐시 무효화
+CHUNK_SUMMARY_TTL = 604800            # 청크 요약 캐시 TTL (7일)
+DOCUMENT_ANALYSIS_TTL = 604800        # 동일 문서 분석 결과 캐시 TTL (7일)
 
 class AnalysisService:
     def __init__(self):
@@ -54,9 +70,9 @@ class AnalysisService:
                     elif isinstance(final_output, str):
                         summary_text = final_output
                     
-                    # ROUGE 점수 계산 (원본과 요약이 모두 있을 때만)
+                    # ROUGE 점수 계산 (원본과 요약이 모두 있을 때만, 긴 자막의 LCS 계산이 이벤트 루프를 막지 않도록 스레드에서 실행)
                     if original_text and summary_text:
-                        rouge_scores = rouge_service.calculate_rouge_scores(original_text, summary_text)
+                        rouge_scores = await asyncio.to_thread(rouge_service.calculate_rouge_scores, original_text, summary_text)
                         print(f"\n🎯 YouTube URL: {youtube_url}")
                         
                 except Exception as rouge_error:
@@ -84,25 +100,50 @@ class AnalysisService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"YouTube FSM 분석 실패: {str(e)}")
 
+    def _document_analysis_key(self, content: str, metadata: Dict[str, Any]) -> str:
+        content_hash = xxhash.xxh3_128_hexdigest(content.encode("utf-8"))
+        metadata_hash = xxhash.xxh3_64_hexdigest(json.dumps(metadata, sort_keys=True, default=str).encode("utf-8"))
+        return f"document_analysis:{CHUNK_SUMMARY_PROMPT_VERSION}:{content_hash}:{metadata_hash}"
+
     async def analyze_document(self, content: str, metadata: Dict[str, Any]) -> AnalysisResponse:
-        """문서 분석"""
+        """문서 분석 (같은 내용 + 메타데이터는 캐시된 분석 결과 재사용)"""
         try:
-            # 문서 분할
-            docs = self.text_splitter.split_text(content)
+            cache_key = self._document_analysis_key(content, metadata)
+            try:
+                cached_results = redis_client.get(cache_key)
+            except Exception as e:
+                print(f"⚠️ 문서 분석 캐시 조회 실패 (다시 분석): {e}")
+                cached_results = None
+            if cached_results is not None:
+                print("⚡ 문서 분석 캐시 적중 - 분석 생략")
+                return AnalysisResponse(
+                    id=str(uuid.uuid4()),
+                    status="completed",
+                    analysis_results=cached_results,
+                    created_at=datetime.now(),
+                    completed_at=datetime.now()
+                )
+
+            # 문서 분할 (내용 기반 경계 - 일부 수정 시 바뀐 청크만 다시 분석)
+            docs = self._split_for_analysis(content)
             
             # 문서 분석
             analysis_results = await self._analyze_document_content(docs, metadata)
             
-            # ROUGE 평가 (문서 요약이 있는 경우)
+            # ROUGE 평가 (문서 요약이 있는 경우, CPU 작업이므로 스레드에서 실행)
             rouge_scores = None
             if analysis_results.get('analysis') and content:
                 try:
-                    rouge_scores = rouge_service.calculate_rouge_scores(content, analysis_results['analysis'])
+                    rouge_scores = await asyncio.to_thread(rouge_service.calculate_rouge_scores, content, analysis_results['analysis'])
                     print(f"\n📄 문서 분석 ROUGE 평가 완료")
                 except Exception as rouge_error:
                     print(f"⚠️ 문서 ROUGE 계산 중 오류: {rouge_error}")
             
             analysis_results['rouge_scores'] = rouge_scores
+            try:
+                redis_client.set_with_ttl(cache_key, analysis_results, DOCUMENT_ANALYSIS_TTL)
+            except Exception as e:
+                print(f"⚠️ 문서 분석 캐시 저장 실패 (무시됨): {e}")
             
             return AnalysisResponse(
                 id=str(uuid.uuid4()),
@@ -119,20 +160,131 @@ class AnalysisService:
 
 
 
-    async def _analyze_document_content(self, docs: List[str], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """문서 내용 분석 - LangGraph Service의 Claude 사용"""
+    def _split_for_analysis(self, content: str) -> List[str]:
+        """문단을 모아 내용 기반 경계로 청크 분할
+
+        문단 해시로 경계를 정하므로 문서 앞부분을 고쳐도 뒤쪽 청크 경계가 밀리지 않는다.
+        (고정 길이 분할은 삽입 한 번에 이후 모든 청크가 바뀌어 캐시가 무용지물이 됨)
+        """
+        paragraphs = []
+        for paragraph in re.split(r'\n\s*\n', content):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if len(paragraph) > DOCUMENT_CHUNK_MAX_CHARS:
+                paragraphs.extend(self.text_splitter.split_text(paragraph))
+            else:
+                paragraphs.append(paragraph)
+
+        chunks, current, size = [], [], 0
+        for paragraph in paragraphs:
+            if current and size + len(paragraph) > DOCUMENT_CHUNK_MAX_CHARS:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(paragraph)
+            size += len(paragraph)
+            digest = hashlib.sha1(paragraph.encode("utf-8")).digest()
+            if size >= DOCUMENT_CHUNK_MIN_CHARS and digest[0] % DOCUMENT_BOUNDARY_MODULUS == 0:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _chunk_cache_key(self, chunk: str) -> str:
+        digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+        return f"document_chunk_summary:{CHUNK_SUMMARY_PROMPT_VERSION}:{digest}"
+
+    def _get_cached_summaries(self, chunks: List[str]) -> List[Optional[str]]:
+        try:
+            return redis_client.get_many([self._chunk_cache_key(chunk) for chunk in chunks])
+        except Exception as e:
+            print(f"⚠️ 청크 요약 캐시 조회 실패 (전체 분석): {e}")
+            return [None] * len(chunks)
+
+    def _cache_summary(self, chunk: str, summary: str):
+        try:
+            redis_client.set_with_ttl(self._chunk_cache_key(chunk), summary, CHUNK_SUMMARY_TTL)
+        except Exception as e:
+            print(f"⚠️ 청크 요약 캐시 저장 실패 (무시됨): {e}")
+
+    async def _map_chunks(self, chunks: List[str], llm, use_cache: bool) -> List[str]:
+        """청크별 요약 (동시 실행 수 제한, 캐시 적중 청크는 LLM 호출 생략)"""
+        from langchain.prompts import ChatPromptTemplate
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", "You are an expert document analyzer. Summarize the key facts, arguments and figures of this document section concisely."),
+            ("user", "Document Section ({index}/{total}):\n{content}")
+        ])
+        summaries = self._get_cached_summaries(chunks) if use_cache else [None] * len(chunks)
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        print(f"🧩 문서 청크 {len(chunks)}개 중 {len(missing)}개 분석 (캐시 적중 {len(chunks) - len(missing)}개)")
+
+        semaphore = asyncio.Semaphore(DOCUMENT_MAP_CONCURRENCY)
+
+        async def summarize(i: int):
+            async with semaphore:
+                messages = prompt.format_messages(index=i + 1, total=len(chunks), content=chunks[i])
+                result = await llm.ainvoke(messages)
+            summaries[i] = result.content
+            if use_cache:
+                self._cache_summary(chunks[i], result.content)
+
+        await asyncio.gather(*(summarize(i) for i in missing))
+        return summaries
+
+    async def _reduce_summaries(self, summaries: List[str], llm) -> List[str]:
+        """요약이 DOCUMENT_REDUCE_MAX_CHARS 안에 들어갈 때까지 묶어서 다시 요약 (계층적 reduce)"""
+        from langchain.prompts import ChatPromptTemplate
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", "You are an expert document analyzer. Merge these consecutive section summaries into one concise summary, keeping important details."),
+            ("user", "Section Summaries:\n{content}")
+        ])
+        semaphore = asyncio.Semaphore(DOCUMENT_MAP_CONCURRENCY)
+
+        async def merge(group: List[str]) -> str:
+            async with semaphore:
+                result = await llm.ainvoke(prompt.format_messages(content="\n\n".join(group)))
+            return result.content
+
+        while sum(len(summary) for summary in summaries) > DOCUMENT_REDUCE_MAX_CHARS and len(summaries) > 1:
+            groups, current, size = [], [], 0
+            for summary in summaries:
+                if current and size + len(summary) > DOCUMENT_REDUCE_MAX_CHARS:
+                    groups.append(current)
+                    current, size = [], 0
+                current.append(summary)
+                size += len(summary)
+            groups.append(current)
+            if len(groups) == len(summaries):
+                # 요약 하나하나가 한도를 넘어 더 묶을 수 없음 → 둘씩 병합
+                groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            print(f"🔁 요약 {len(summaries)}개 → {len(groups)}개로 병합")
+            summaries = list(await asyncio.gather(*(merge(group) for group in groups)))
+        return summaries
+
+    async def _analyze_document_content(self, docs: List[str], metadata: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """문서 내용 분석 - 청크별 요약(map) → 계층적 병합(reduce) → 최종 분석 (LangGraph Service의 Claude 사용)"""
         from app.services.langgraph_service import llm
         from langchain.prompts import ChatPromptTemplate
         
+        if len(docs) > 1:
+            summaries = await self._map_chunks(docs, llm, use_cache)
+            summaries = await self._reduce_summaries(summaries, llm)
+        else:
+            # 청크 하나짜리 짧은 문서는 요약 단계 없이 바로 분석
+            summaries = docs
+        
         prompt = ChatPromptTemplate.from_messages([
             ("system", "You are an expert document analyzer. Analyze the following document content and provide a comprehensive summary and insights."),
             ("user", "Document Content: {content}\nMetadata: {metadata}\n\nPlease provide a detailed analysis and summary.")
         ])
         
-        messages = prompt.format_messages(content=docs, metadata=metadata)
-        result = llm.invoke(messages)
+        messages = prompt.format_messages(content="\n\n".join(summaries), metadata=metadata)
+        result = await llm.ainvoke(messages)
         
-        return {"analysis": result.content}
+        return {"analysis": result.content, "chunks": len(docs)}
 
 
 
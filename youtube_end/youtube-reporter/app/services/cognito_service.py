@@ -2,7 +2,12 @@ import boto3
 import hmac
 import hashlib
 import base64
+import threading
+import time
+import requests
+from collections import OrderedDict
 from botocore.exceptions import ClientError
+from jose import JWTError, jwk, jwt
 from app.core.config import settings
 
 client = boto3.client("cognito-idp", region_name=settings.AWS_REGION)
@@ -100,10 +105,124 @@ def get_user_info(access_token: str):
     except ClientError as e:
         raise e
 
+class AccessTokenVerifier:
+    """Cognito 액세스 토큰 로컬 검증 (요청마다 get_user 호출 대신)
+
+    - User Pool JWKS를 캐시하고 refresh_sec마다 갱신, 모르는 kid가 오면 즉시 갱신 (키 교체 대응)
+    - 검증된 클레임은 토큰 만료(exp)까지 캐시
+    - revocation_check가 켜져 있으면 토큰별로 revocation_interval마다 get_user로 폐기 여부 확인
+    """
+
+    MAX_CACHED_TOKENS = 10000
+    MIN_JWKS_REFETCH_SEC = 60  # 모르는 kid로 인한 재조회 최소 간격
+
+    def __init__(self):
+        self.region = settings.AWS_REGION
+        self.user_pool_id = settings.COGNITO_USER_POOL_ID
+        self.client_id = settings.COGNITO_CLIENT_ID
+        self.refresh_sec = settings.COGNITO_JWKS_REFRESH_SEC
+        self.revocation_check = settings.COGNITO_REVOCATION_CHECK
+        self.revocation_interval = settings.COGNITO_REVOCATION_CHECK_INTERVAL
+        self._keys = {}
+        self._keys_fetched_at = 0.0
+        self._claims = OrderedDict()  # 토큰 해시 -> (claims, 마지막 원격 확인 시각)
+        self._lock = threading.Lock()
+        self._keys_lock = threading.Lock()  # JWKS 조회 중에도 클레임 캐시 조회는 막지 않도록 분리
+
+    @property
+    def issuer(self) -> str:
+        return f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}"
+
+    def _fetch_jwks(self):
+        response = requests.get(f"{self.issuer}/.well-known/jwks.json", timeout=5)
+        response.raise_for_status()
+        self._keys = {key["kid"]: key for key in response.json()["keys"]}
+        self._keys_fetched_at = time.time()
+
+    def _get_key(self, kid: str):
+        with self._keys_lock:
+            age = time.time() - self._keys_fetched_at
+            stale = age > self.refresh_sec
+            unknown_kid = kid not in self._keys and age > self.MIN_JWKS_REFETCH_SEC
+            if stale or unknown_kid:
+                try:
+                    self._fetch_jwks()
+                except Exception as e:
+                    # 갱신 실패 시 기존 키로 계속 검증 (처음 조회 실패면 아래에서 검증 실패)
+                    print(f"⚠️ Cognito JWKS 조회 실패: {e}")
+            return self._keys.get(kid)
+
+    def _decode(self, access_token: str) -> dict:
+        kid = jwt.get_unverified_header(access_token).get("kid")
+        key = self._get_key(kid)
+        if key is None:
+            raise JWTError("알 수 없는 서명 키")
+        claims = jwt.decode(
+            access_token,
+            jwk.construct(key),
+            algorithms=[key.get("alg", "RS256")],
+            issuer=self.issuer,
+            # Cognito 액세스 토큰에는 aud가 없고 client_id 클레임으로 확인
+            options={"verify_aud": False}
+        )
+        if claims.get("token_use") != "access":
+            raise JWTError("액세스 토큰이 아님")
+        if self.client_id and claims.get("client_id") != self.client_id:
+            raise JWTError("다른 앱 클라이언트의 토큰")
+        return claims
+
+    def _is_revoked(self, access_token: str) -> bool:
+        try:
+            client.get_user(AccessToken=access_token)
+            return False
+        except ClientError as e:
+            # 스로틀링 등 다른 오류는 폐기로 보지 않음 (로컬 서명 검증은 이미 통과)
+            return e.response["Error"]["Code"] == "NotAuthorizedException"
+
+    def verify(self, access_token: str) -> dict:
+        """토큰 검증 → 클레임 (실패 시 JWTError)"""
+        token_key = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(token_key)
+            if entry and entry[0]["exp"] <= now:
+                del self._claims[token_key]
+                entry = None
+            if entry:
+                self._claims.move_to_end(token_key)
+
+        if entry is None:
+            claims, checked_at = self._decode(access_token), now
+        else:
+            claims, checked_at = entry
+
+        if self.revocation_check and (entry is None or now - checked_at > self.revocation_interval):
+            if self._is_revoked(access_token):
+                with self._lock:
+                    self._claims.pop(token_key, None)
+                raise JWTError("폐기된 토큰")
+            checked_at = now
+
+        with self._lock:
+            self._claims[token_key] = (claims, checked_at)
+            while len(self._claims) > self.MAX_CACHED_TOKENS:
+                self._claims.popitem(last=False)
+        return claims
+
+access_token_verifier = AccessTokenVerifier()
+
 def verify_access_token(access_token: str):
-    """토큰 검증"""
+    """토큰 검증 (User Pool 설정 시 JWKS 로컬 검증, 아니면 Cognito get_user)"""
+    if not settings.COGNITO_USER_POOL_ID:
+        try:
+            response = client.get_user(AccessToken=access_token)
+            return {"valid": True, "username": response['Username']}
+        except ClientError as e:
+            return {"valid": False, "error": e.response["Error"]["Message"]}
+
     try:
-        response = client.get_user(AccessToken=access_token)
-        return {"valid": True, "username": response['Username']}
-    except ClientError as e:
-        return {"valid": False, "error": e.response["Error"]["Message"]}
\ No newline at end of file
+        claims = access_token_verifier.verify(access_token)
+        # get_user의 Username과 같은 값 (user_id로 저장된 기존 데이터와 호환)
+        return {"valid": True, "username": claims["username"], "claims": claims}
+    except (JWTError, KeyError) as e:
+        return {"valid": False, "error": str(e)}
\ No newline at end of file
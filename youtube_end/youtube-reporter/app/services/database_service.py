@@ -1,12 +1,48 @@
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+import base64
+import json
 import uuid
 
 from app.models.database_models import UserAnalysisJob, UserReport, UserAudioFile
 from app.core.database import get_db
 
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """(created_at, id) 키셋 커서 인코딩"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(row_id)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """키셋 커서 디코딩 (잘못된 커서는 ValueError)"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), uuid.UUID(payload["i"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 class DatabaseService:
+    def _keyset(self, query, model, cursor: Optional[str], limit: int):
+        """created_at DESC, id DESC 키셋 조건 적용 (Query / Select 공용, 다음 페이지 확인용 limit + 1)"""
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+        return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    
+    def _split_page(self, rows: list, limit: int) -> Tuple[list, Optional[str]]:
+        """페이지 행과 다음 페이지 커서 분리"""
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    def _paginate(self, query, model, cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+        """키셋 페이지네이션 (다음 페이지 커서 함께 반환)"""
+        return self._split_page(self._keyset(query, model, cursor, limit).all(), limit)
+    
     def create_analysis_job(self, db: Session, user_id: str, job_type: str, input_data: dict) -> UserAnalysisJob:
         """분석 작업 생성"""
         job = UserAnalysisJob(
@@ -31,11 +67,61 @@ class DatabaseService:
                 job.completed_at = datetime.utcnow()
             db.commit()
     
-    def get_user_jobs(self, db: Session, user_id: str, limit: int = 50) -> List[UserAnalysisJob]:
-        """사용자 작업 목록 조회"""
-        return db.query(UserAnalysisJob).filter(
-            UserAnalysisJob.user_id == user_id
-        ).order_by(UserAnalysisJob.created_at.desc()).limit(limit).all()
+    def finalize_job(self, db: Session, job_id: str, user_id: str, status: str, result_s3_key: str = None,
+                     report: Optional[Dict[str, Any]] = None, audio: Optional[Dict[str, Any]] = None):
+        """작업 완료 처리 - 상태 / 보고서 / 오디오를 단일 트랜잭션으로 기록 (refresh 없음)"""
+        values = {"status": status}
+        if result_s3_key:
+            values["result_s3_key"] = result_s3_key
+        if status == "completed":
+            values["completed_at"] = datetime.utcnow()
+        
+        try:
+            db.query(UserAnalysisJob).filter(
+                UserAnalysisJob.id == job_id
+            ).update(values, synchronize_session=False)
+            
+            if report:
+                db.add(UserReport(job_id=job_id, user_id=user_id, **report))
+            if audio:
+                db.add(UserAudioFile(job_id=job_id, user_id=user_id, **audio))
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    
+    def get_user_jobs(self, db: Session, user_id: str, limit: int = 50, job_type: Optional[str] = None) -> List[UserAnalysisJob]:
+        """사용자 작업 목록 조회 (job_type 지정 시 DB에서 필터링)"""
+        query = db.query(UserAnalysisJob).filter(UserAnalysisJob.user_id == user_id)
+        if job_type:
+            query = query.filter(UserAnalysisJob.job_type == job_type)
+        return query.order_by(UserAnalysisJob.created_at.desc()).limit(limit).all()
+    
+    def get_user_jobs_page(self, db: Session, user_id: str, cursor: Optional[str] = None, limit: int = 50,
+                           job_type: Optional[str] = None) -> Tuple[List[UserAnalysisJob], Optional[str]]:
+        """사용자 작업 목록 커서 페이지 조회"""
+        query = db.query(UserAnalysisJob).filter(UserAnalysisJob.user_id == user_id)
+        if job_type:
+            query = query.filter(UserAnalysisJob.job_type == job_type)
+        return self._paginate(query, UserAnalysisJob, cursor, limit)
+    
+    def get_jobs_by_type_page(self, db: Session, job_type: str, cursor: Optional[str] = None,
+                              limit: int = 50) -> Tuple[List[UserAnalysisJob], Optional[str]]:
+        """작업 유형별 전체 목록 커서 페이지 조회"""
+        query = db.query(UserAnalysisJob).filter(UserAnalysisJob.job_type == job_type)
+        return self._paginate(query, UserAnalysisJob, cursor, limit)
+    
+    def count_jobs_by_status(self, db: Session, job_type: str) -> Dict[str, int]:
+        """작업 유형별 상태 집계"""
+        rows = db.query(UserAnalysisJob.status, func.count(UserAnalysisJob.id)).filter(
+            UserAnalysisJob.job_type == job_type
+        ).group_by(UserAnalysisJob.status).all()
+        return {status: count for status, count in rows}
+    
+    def get_job(self, db: Session, job_id: str) -> Optional[UserAnalysisJob]:
+        """작업 ID로 조회 (사용자 확인 없음)"""
+        return db.query(UserAnalysisJob).filter(UserAnalysisJob.id == job_id).first()
     
     def get_job_by_id(self, db: Session, job_id: str, user_id: str) -> Optional[UserAnalysisJob]:
         """작업 ID로 조회 (사용자 권한 확인)"""
@@ -77,12 +163,38 @@ class DatabaseService:
             UserReport.user_id == user_id
         ).order_by(UserReport.created_at.desc()).limit(limit).all()
     
+    def get_user_reports_page(self, db: Session, user_id: str, cursor: Optional[str] = None,
+                              limit: int = 50) -> Tuple[List[UserReport], Optional[str]]:
+        """사용자 보고서 목록 커서 페이지 조회"""
+        query = db.query(UserReport).filter(UserReport.user_id == user_id)
+        return self._paginate(query, UserReport, cursor, limit)
+    
+    def get_report_by_job_id(self, db: Session, job_id: str, user_id: str) -> Optional[UserReport]:
+        """작업 ID로 보고서 조회 (user_reports.job_id 인덱스 사용)"""
+        return db.query(UserReport).filter(
+            UserReport.job_id == job_id,
+            UserReport.user_id == user_id
+        ).order_by(UserReport.created_at.desc()).first()
+    
+    def get_audio_by_job_id(self, db: Session, job_id: str, user_id: str) -> Optional[UserAudioFile]:
+        """작업 ID로 오디오 파일 조회 (user_audio_files.job_id 인덱스 사용)"""
+        return db.query(UserAudioFile).filter(
+            UserAudioFile.job_id == job_id,
+            UserAudioFile.user_id == user_id
+        ).order_by(UserAudioFile.created_at.desc()).first()
+    
     def get_user_audio_files(self, db: Session, user_id: str, limit: int = 50) -> List[UserAudioFile]:
         """사용자 오디오 파일 목록"""
         return db.query(UserAudioFile).filter(
             UserAudioFile.user_id == user_id
         ).order_by(UserAudioFile.created_at.desc()).limit(limit).all()
     
+    def get_user_audio_files_page(self, db: Session, user_id: str, cursor: Optional[str] = None,
+                                  limit: int = 50) -> Tuple[List[UserAudioFile], Optional[str]]:
+        """사용자 오디오 파일 목록 커서 페이지 조회"""
+        query = db.query(UserAudioFile).filter(UserAudioFile.user_id == user_id)
+        return self._paginate(query, UserAudioFile, cursor, limit)
+    
     def delete_job(self, db: Session, job_id: str, user_id: str) -> bool:
         """작업 삭제 (사용자 권한 확인)"""
         job = db.query(UserAnalysisJob).filter(
@@ -99,6 +211,32 @@ class DatabaseService:
             return True
         return False
 
+    # 비동기 조회 (작업 상태 / 작업 목록 / 보고서 조회 핫패스용)
+    async def aget_job_by_id(self, db: AsyncSession, job_id: str, user_id: str) -> Optional[UserAnalysisJob]:
+        """작업 ID로 조회 (비동기)"""
+        result = await db.execute(select(UserAnalysisJob).where(
+            UserAnalysisJob.id == job_id,
+            UserAnalysisJob.user_id == user_id
+        ))
+        return result.scalars().first()
+    
+    async def aget_user_jobs_page(self, db: AsyncSession, user_id: str, cursor: Optional[str] = None, limit: int = 50,
+                                  job_type: Optional[str] = None) -> Tuple[List[UserAnalysisJob], Optional[str]]:
+        """사용자 작업 목록 커서 페이지 조회 (비동기)"""
+        stmt = select(UserAnalysisJob).where(UserAnalysisJob.user_id == user_id)
+        if job_type:
+            stmt = stmt.where(UserAnalysisJob.job_type == job_type)
+        result = await db.execute(self._keyset(stmt, UserAnalysisJob, cursor, limit))
+        return self._split_page(list(result.scalars().all()), limit)
+    
+    async def aget_report_by_job_id(self, db: AsyncSession, job_id: str, user_id: str) -> Optional[UserReport]:
+        """작업 ID로 보고서 조회 (비동기)"""
+        result = await db.execute(select(UserReport).where(
+            UserReport.job_id == job_id,
+            UserReport.user_id == user_id
+        ).order_by(UserReport.created_at.desc()).limit(1))
+        return result.scalars().first()
+
 database_service = DatabaseService()
 
 # 비동기 함수들 (프론트엔드 호환성을 위해)
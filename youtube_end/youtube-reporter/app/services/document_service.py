@@ -1,23 +1,26 @@
 import os
+import asyncio
 import tempfile
+import threading
+from collections import Counter
 from typing import Dict, Any, Optional, Tuple
 from fastapi import UploadFile, HTTPException
-import PyPDF2
-from docx import Document
-import pandas as pd
-from datetime import datetime
+import xxhash
+from app.core.redis_client import redis_client
+from app.services.extractors import extractor_registry
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024    # 업로드 스풀링 단위 (1MB)
+EXTRACT_CACHE_TTL = 604800          # 추출 결과 캐시 TTL (7일)
+EXTRACT_CACHE_MAX_CHARS = 5_000_000 # 이보다 긴 텍스트는 캐시하지 않음 (Redis 메모리 보호)
 
 class DocumentService:
-    SUPPORTED_EXTENSIONS = {
-        '.pdf': 'application/pdf',
-        '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        '.csv': 'text/csv',
-        '.txt': 'text/plain'
-    }
+    # 형식별 추출기는 app.services.extractors에 등록 (등록 시 자동 반영)
+    SUPPORTED_EXTENSIONS = extractor_registry.extensions
 
     def __init__(self):
         self.temp_dir = tempfile.mkdtemp()
+        self._file_refs = Counter()  # 내용 해시 경로 -> 처리 중인 요청 수
+        self._file_refs_lock = threading.Lock()
 
     def validate_file(self, file: UploadFile) -> Tuple[str, str]:
         """파일 유효성 검사 및 확장자 확인"""
@@ -30,132 +33,111 @@ class DocumentService:
         return ext, self.SUPPORTED_EXTENSIONS[ext]
 
     async def save_upload_file(self, file: UploadFile) -> str:
-        """업로드된 파일을 임시 저장"""
+        """업로드된 파일을 내용 해시 이름({xxh3-128}{ext})으로 임시 저장
+
+        청크 단위로 디스크에 스풀링하면서 해시를 계산하고, 같은 내용의 파일이 이미 처리 중이면
+        그 파일을 함께 사용한다. 다 쓴 뒤에는 release_upload_file()로 반환해야 한다.
+        """
         try:
             ext, _ = self.validate_file(file)
-            temp_path = os.path.join(self.temp_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}")
+            fd, temp_path = tempfile.mkstemp(suffix=ext, dir=self.temp_dir)
+            hasher = xxhash.xxh3_128()
             
-            with open(temp_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
+            with os.fdopen(fd, "wb") as buffer:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    buffer.write(chunk)
             
-            return temp_path
+            file_path = os.path.join(self.temp_dir, f"{hasher.hexdigest()}{ext}")
+            with self._file_refs_lock:
+                if self._file_refs[file_path]:
+                    os.remove(temp_path)
+                else:
+                    os.replace(temp_path, file_path)
+                self._file_refs[file_path] += 1
+            return file_path
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"파일 저장 실패: {str(e)}")
 
-    def extract_text_from_pdf(self, file_path: str) -> Dict[str, Any]:
-        """PDF 파일에서 텍스트 추출"""
-        try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                
-                return {
-                    "text": text,
-                    "pages": len(reader.pages),
-                    "word_count": len(text.split())
-                }
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"PDF 텍스트 추출 실패: {str(e)}")
+    def release_upload_file(self, file_path: str):
+        """save_upload_file로 받은 파일 반환 (마지막 사용자가 반환하면 삭제)"""
+        with self._file_refs_lock:
+            self._file_refs[file_path] -= 1
+            if self._file_refs[file_path] > 0:
+                return
+            del self._file_refs[file_path]
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
-    def extract_text_from_docx(self, file_path: str) -> Dict[str, Any]:
-        """DOCX 파일에서 텍스트 추출"""
-        try:
-            doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            
-            return {
-                "text": text,
-                "paragraphs": len(doc.paragraphs),
-                "word_count": len(text.split())
-            }
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"DOCX 텍스트 추출 실패: {str(e)}")
+    def content_hash(self, file_path: str) -> str:
+        """save_upload_file이 저장한 파일의 내용 해시"""
+        return os.path.splitext(os.path.basename(file_path))[0]
 
-    def extract_text_from_excel(self, file_path: str) -> Dict[str, Any]:
-        """Excel 파일에서 텍스트 추출"""
+    def _get_cached_extraction(self, content_hash: str) -> Optional[Dict[str, Any]]:
         try:
-            df = pd.read_excel(file_path)
-            text = df.to_string()
-            
-            return {
-                "text": text,
-                "rows": len(df),
-                "columns": len(df.columns),
-                "word_count": len(text.split())
-            }
+            return redis_client.get(f"document_extract:{content_hash}")
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Excel 텍스트 추출 실패: {str(e)}")
+            print(f"⚠️ 문서 추출 캐시 조회 실패 (다시 추출): {e}")
+            return None
 
-    def extract_text_from_csv(self, file_path: str) -> Dict[str, Any]:
-        """CSV 파일에서 텍스트 추출"""
+    def _cache_extraction(self, content_hash: str, result: Dict[str, Any]):
+        if len(result.get("text", "")) > EXTRACT_CACHE_MAX_CHARS:
+            return
         try:
-            df = pd.read_csv(file_path)
-            text = df.to_string()
-            
-            return {
-                "text": text,
-                "rows": len(df),
-                "columns": len(df.columns),
-                "word_count": len(text.split())
-            }
+            redis_client.set_with_ttl(f"document_extract:{content_hash}", result, EXTRACT_CACHE_TTL)
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"CSV 텍스트 추출 실패: {str(e)}")
+            print(f"⚠️ 문서 추출 캐시 저장 실패 (무시됨): {e}")
 
-    def extract_text_from_txt(self, file_path: str) -> Dict[str, Any]:
-        """TXT 파일에서 텍스트 추출"""
+    def extract_text(self, file_path: str) -> Dict[str, Any]:
+        """파일 형식별 텍스트 추출 (동기 - 이벤트 루프 밖에서 호출)"""
+        extractor = extractor_registry.resolve(file_path)
+        if extractor is None:
+            raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다")
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-            
-            return {
-                "text": text,
-                "lines": len(text.splitlines()),
-                "word_count": len(text.split())
-            }
+            return extractor.extract(file_path)
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"TXT 텍스트 추출 실패: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"{extractor.label} 텍스트 추출 실패: {str(e)}")
 
     async def process_document(self, file: UploadFile) -> Dict[str, Any]:
-        """문서 처리 및 텍스트 추출"""
+        """문서 처리 및 텍스트 추출 (같은 내용의 파일은 캐시된 추출 결과 재사용)"""
+        file_path = None
         try:
             # 파일 저장
             file_path = await self.save_upload_file(file)
             ext = os.path.splitext(file_path)[1].lower()
+            content_hash = self.content_hash(file_path)
             
             # 파일 크기
             file_size = os.path.getsize(file_path)
             
-            # 파일 형식별 텍스트 추출
-            if ext == '.pdf':
-                result = self.extract_text_from_pdf(file_path)
-            elif ext == '.docx':
-                result = self.extract_text_from_docx(file_path)
-            elif ext == '.xlsx':
-                result = self.extract_text_from_excel(file_path)
-            elif ext == '.csv':
-                result = self.extract_text_from_csv(file_path)
-            elif ext == '.txt':
-                result = self.extract_text_from_txt(file_path)
+            # 동일 파일 추출 결과 캐시 (확장자가 다르면 해석도 다르므로 해시와 함께 키로 사용)
+            cache_key = f"{content_hash}{ext}"
+            result = self._get_cached_extraction(cache_key)
+            cached = result is not None
+            if cached:
+                print(f"⚡ 문서 추출 캐시 적중: {file.filename} ({content_hash})")
             else:
-                raise HTTPException(status_code=400, detail="지원하지 않는 파일 형식입니다")
-            
-            # 임시 파일 삭제
-            os.remove(file_path)
+                # 파일 형식별 텍스트 추출 (CPU 작업이므로 스레드에서 실행해 이벤트 루프를 막지 않음)
+                result = await asyncio.to_thread(self.extract_text, file_path)
+                self._cache_extraction(cache_key, result)
             
             return {
                 "filename": file.filename,
                 "content_type": self.SUPPORTED_EXTENSIONS[ext],
                 "size": file_size,
+                "content_hash": content_hash,
+                "cached": cached,
                 **result
             }
             
         except Exception as e:
-            # 임시 파일 정리
-            if os.path.exists(file_path):
-                os.remove(file_path)
             raise HTTPException(status_code=500, detail=f"문서 처리 실패: {str(e)}")
+        finally:
+            # 임시 파일 정리
+            if file_path:
+                self.release_upload_file(file_path)
 
 document_service = DocumentService() 
\ No newline at end of file
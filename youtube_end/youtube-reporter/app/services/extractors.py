@@ -0,0 +1,187 @@
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+
+PARALLEL_PDF_MIN_PAGES = 32        # 이 쪽수 이상이면 프로세스 풀로 페이지 병렬 추출
+PDF_PAGES_PER_TASK = 8             # 프로세스 작업 하나가 처리할 페이지 수
+PDF_MAX_WORKERS = min(4, os.cpu_count() or 1)
+SNIFF_BYTES = 8192
+
+class Extractor:
+    """형식 하나의 텍스트 추출기 (백엔드 라이브러리는 extract 호출 시점에 import)"""
+
+    def __init__(self, ext: str, mime: str, label: str, extract: Callable[[str], Dict[str, Any]]):
+        self.ext = ext
+        self.mime = mime
+        self.label = label
+        self.extract = extract
+
+class ExtractorRegistry:
+    """확장자/MIME 스니핑 기반 추출기 선택
+
+    같은 확장자로 다시 register하면 나중 것이 우선한다 (더 빠른 백엔드로 교체할 때 디스패치 코드 수정 불필요).
+    """
+
+    def __init__(self):
+        self._extractors: Dict[str, Extractor] = {}
+        self.extensions: Dict[str, str] = {}  # 확장자 -> MIME (업로드 검증용, 등록 시 갱신)
+
+    def register(self, ext: str, mime: str, label: str):
+        """추출 함수 등록 데코레이터 - extract(file_path) -> {"text", "word_count", ...}"""
+        def decorator(extract: Callable[[str], Dict[str, Any]]):
+            self._extractors[ext] = Extractor(ext, mime, label, extract)
+            self.extensions[ext] = mime
+            return extract
+        return decorator
+
+    def resolve(self, file_path: str) -> Optional[Extractor]:
+        """파일 내용(매직 바이트)을 우선하고, 판별이 안 되면 확장자로 추출기 선택"""
+        ext = os.path.splitext(file_path)[1].lower()
+        sniffed = sniff_extension(file_path)
+        if sniffed and sniffed != ext and sniffed in self._extractors:
+            print(f"🔎 파일 형식 보정: {ext} → {sniffed}")
+            ext = sniffed
+        return self._extractors.get(ext)
+
+def sniff_extension(file_path: str) -> Optional[str]:
+    """매직 바이트로 실제 형식 판별 (텍스트 형식이나 알 수 없는 형식은 None)"""
+    with open(file_path, 'rb') as file:
+        head = file.read(SNIFF_BYTES)
+    if head.startswith(b"%PDF-"):
+        return ".pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return None
+        if "word/document.xml" in names:
+            return ".docx"
+        if "xl/workbook.xml" in names:
+            return ".xlsx"
+    return None
+
+extractor_registry = ExtractorRegistry()
+
+# --- PDF -------------------------------------------------------------------
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """PDF 페이지 추출용 프로세스 풀 (처음 큰 PDF가 들어올 때 생성, 워커 단위 재사용)"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                _pdf_pool = ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS)
+    return _pdf_pool
+
+def _extract_pdf_page_range(file_path: str, start: int, end: int) -> list:
+    """프로세스 풀 작업 - [start, end) 페이지 텍스트 목록"""
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+def iter_pdf_pages(file_path: str) -> Iterator[str]:
+    """PDF 페이지 텍스트를 순서대로 하나씩 yield
+
+    PARALLEL_PDF_MIN_PAGES 이상이면 페이지 묶음을 프로세스 풀에 나눠 추출하고,
+    앞쪽 묶음이 끝나는 대로 바로 내보낸다 (뒤쪽 페이지 추출과 후속 처리가 겹침).
+    """
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        page_count = len(reader.pages)
+        if page_count < PARALLEL_PDF_MIN_PAGES:
+            for page in reader.pages:
+                yield page.extract_text() or ""
+            return
+
+    pool = _get_pdf_pool()
+    futures = [
+        pool.submit(_extract_pdf_page_range, file_path, start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # 소비자가 중간에 멈추면 아직 시작 안 한 작업 취소
+        for future in futures:
+            future.cancel()
+
+@extractor_registry.register(".pdf", "application/pdf", "PDF")
+def extract_pdf(file_path: str) -> Dict[str, Any]:
+    """PDF 파일에서 텍스트 추출"""
+    pages = list(iter_pdf_pages(file_path))
+    text = "\n".join(pages) + "\n" if pages else ""
+    return {
+        "text": text,
+        "pages": len(pages),
+        "word_count": len(text.split())
+    }
+
+# --- DOCX ------------------------------------------------------------------
+
+@extractor_registry.register(".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "DOCX")
+def extract_docx(file_path: str) -> Dict[str, Any]:
+    """DOCX 파일에서 텍스트 추출"""
+    from docx import Document
+
+    doc = Document(file_path)
+    text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+    return {
+        "text": text,
+        "paragraphs": len(doc.paragraphs),
+        "word_count": len(text.split())
+    }
+
+# --- 표 형식 (pandas/openpyxl은 table_summary import 시점에 로드) ----------------
+
+@extractor_registry.register(".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "Excel")
+def extract_excel(file_path: str) -> Dict[str, Any]:
+    """Excel 파일에서 텍스트 추출 (read-only 스트리밍 - 시트별 열 통계 + 샘플 행 마크다운)"""
+    from app.services.table_summary import summarize_excel
+
+    summaries = summarize_excel(file_path)
+    text = "\n\n".join(summary.to_markdown() for summary in summaries)
+    return {
+        "text": text,
+        "rows": sum(summary.rows for summary in summaries),
+        "columns": max((len(summary.columns) for summary in summaries), default=0),
+        "sheets": len(summaries),
+        "word_count": len(text.split())
+    }
+
+@extractor_registry.register(".csv", "text/csv", "CSV")
+def extract_csv(file_path: str) -> Dict[str, Any]:
+    """CSV 파일에서 텍스트 추출 (청크 단위 read_csv - 열 통계 + 샘플 행 마크다운)"""
+    from app.services.table_summary import summarize_csv
+
+    summary = summarize_csv(file_path)
+    text = summary.to_markdown()
+    return {
+        "text": text,
+        "rows": summary.rows,
+        "columns": len(summary.columns),
+        "word_count": len(text.split())
+    }
+
+# --- TXT -------------------------------------------------------------------
+
+@extractor_registry.register(".txt", "text/plain", "TXT")
+def extract_txt(file_path: str) -> Dict[str, Any]:
+    """TXT 파일에서 텍스트 추출"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        text = file.read()
+    return {
+        "text": text,
+        "lines": len(text.splitlines()),
+        "word_count": len(text.split())
+    }
@@ -14,6 +14,7 @@ from app.core.config import settings
 from app.services.user_s3_service import user_s3_service
 from app.services.s3_service import s3_service  # S3 서비스 추가
 from app.services.state_manager import state_manager
+from app.services.llm_json import parse_json_stream
 from app.services.youtube_processing_service import youtube_processing_service
 
 # ========== 1. 상태 정의 ==========
@@ -255,26 +256,16 @@ visual_split_prompt = ChatPromptTemplate.from_messages([
 ])
 
 def _split_report(report_text: str) -> List[dict]:
-    """보고서를 시각화 블록으로 분해"""
-    response = llm.invoke(visual_split_prompt.format_messages(input=report_text))
-    try:
-        content = response.content.strip()
-        if '```json' in content:
-            content = content.split('```json')[1].split('```')[0].strip()
-        elif '```' in content:
-            content = content.split('```')[1].split('```')[0].strip()
-        raw = json.loads(content)
-        if not isinstance(raw, list):
-            return []
-        parsed = []
-        for item in raw:
-            if isinstance(item, dict) and 'type' in item and 'text' in item:
-                parsed.append(item)
-        return parsed
-    except Exception as e:
-        print(f"시각화 블록 파싱 실패: {e}")
-        print(f"원본 응답: {response.content[:200]}...")
+    """보고서를 시각화 블록으로 분해 (스트리밍 증분 파싱 - 배열이 닫히면 바로 중단)"""
+    raw = parse_json_stream(llm.stream(visual_split_prompt.format_messages(input=report_text)), expect=list)
+    if raw is None:
+        print("시각화 블록 파싱 실패: 응답에서 JSON 배열을 찾을 수 없음")
         return []
+    parsed = []
+    for item in raw:
+        if isinstance(item, dict) and 'type' in item and 'text' in item:
+            parsed.append(item)
+    return parsed
 
 class WrapVisualSplitToState(Runnable):
     def invoke(self, state: dict, config=None):
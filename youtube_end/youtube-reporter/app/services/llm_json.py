@@ -0,0 +1,388 @@
+import json
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+CLOSERS = {"{": "}", "[": "]"}
+LITERALS = {"true": "true", "false": "false", "null": "null",
+            "True": "true", "False": "false", "None": "null", "NaN": "null"}
+FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+NUMBER_CHARS = set("+-0123456789.eE")
+MAX_CANDIDATES = 20   # 한 응답에서 시도할 최대 JSON 후보 수 (산문 속 괄호가 많을 때 상한)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _record(outcome: str):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def json_extraction_stats() -> dict:
+    """LLM 응답 JSON 추출 결과 누적 (direct: 그대로 파싱, extracted: 앞뒤 텍스트 제거 후 파싱,
+    repaired: 쉼표/잘림 보정 후 파싱, failed: 실패, stream_early_stop: JSON 완료 시점에 스트림 중단)"""
+    with _stats_lock:
+        stats = dict(_stats)
+    attempts = sum(stats.get(key, 0) for key in ("direct", "extracted", "repaired", "failed"))
+    stats["failure_rate"] = stats.get("failed", 0) / attempts if attempts else 0.0
+    return stats
+
+
+def _loads(text: str) -> Any:
+    # strict=False: LLM이 문자열 안에 넣은 날 줄바꿈/탭 허용
+    return json.loads(text, strict=False)
+
+
+def _parse_quiet(text: str) -> Any:
+    """지표를 남기지 않는 파싱 (스트리밍 중 배열 요소 검증용)"""
+    try:
+        return _loads(text)
+    except ValueError:
+        try:
+            return _loads(repair_json(text))
+        except ValueError:
+            return None
+
+
+def _matches(value: Any, expect: Optional[type]) -> bool:
+    return expect is None or isinstance(value, expect)
+
+
+def iter_json_spans(text: str, start: int = 0) -> Iterable[Tuple[int, Optional[int]]]:
+    """괄호 짝 맞춤 스캐너 - 최상위 {...}/[...] 구간 (시작, 끝+1)을 순서대로 yield
+
+    문자열 안의 괄호와 이스케이프는 무시한다. 끝까지 닫히지 않은(잘린) 구간은 끝을 None으로 내보낸다.
+    """
+    position = start
+    length = len(text)
+    while position < length:
+        opener = min((index for index in (text.find("{", position), text.find("[", position)) if index != -1),
+                     default=-1)
+        if opener == -1:
+            return
+        depth, in_string, escape = 0, False, False
+        for index in range(opener, length):
+            char = text[index]
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    yield opener, index + 1
+                    break
+        else:
+            yield opener, None
+            return
+        position = opener + 1
+
+
+def repair_json(raw: str) -> str:
+    """흔한 LLM JSON 오류 보정
+
+    - 닫는 괄호 앞/연속 쉼표, // 및 /* */ 주석 제거
+    - True/False/None → true/false/null, 따옴표 없는 키와 작은따옴표 문자열을 큰따옴표로
+    - 짝이 안 맞는 닫는 괄호는 열린 괄호에 맞춰 교체
+    - 잘린 출력: 값 문자열은 닫고, 미완성 키/값은 마지막 완결 지점까지 잘라낸 뒤 열린 괄호를 닫음
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    safe = (0, [])          # 여기서 자르고 스택을 닫으면 유효한 JSON인 지점 (출력 길이, 스택)
+    in_string = escape = string_is_key = False
+    quote = '"'             # 현재 문자열을 연 따옴표 (작은따옴표 문자열은 큰따옴표로 바꿔 출력)
+    previous = ""           # 문자열 밖에서 마지막으로 출력한 공백 아닌 문자
+    index, length = 0, len(raw)
+
+    def strip_trailing(chars: str):
+        while out and (out[-1].isspace() or out[-1] in chars):
+            out.pop()
+
+    while index < length:
+        char = raw[index]
+        if in_string:
+            if escape:
+                escape = False
+                out.append(char)
+            elif char == "\\":
+                escape = True
+                if quote == "'" and raw.startswith("'", index + 1):
+                    index += 1  # \' -> '
+                    escape = False
+                    out.append("'")
+                else:
+                    out.append(char)
+            elif char == quote:
+                in_string = False
+                previous = '"'
+                out.append('"')
+                if not string_is_key:
+                    safe = (len(out), list(stack))
+            else:
+                out.append('\\"' if char == '"' else char)
+            index += 1
+            continue
+
+        if char in ('"', "'"):
+            in_string = True
+            quote = char
+            string_is_key = bool(stack) and stack[-1] == "{" and previous in ("{", ",")
+            out.append('"')
+        elif char in "{[":
+            stack.append(char)
+            out.append(char)
+            previous = char
+            safe = (len(out), list(stack))
+        elif char in "}]":
+            if stack:
+                strip_trailing(",")
+                previous = CLOSERS[stack.pop()]
+                out.append(previous)
+                safe = (len(out), list(stack))
+                if not stack:
+                    break  # 최상위 값 완료 - 뒤따르는 설명 문장 무시
+        elif char == ",":
+            if previous not in ("", ",", "[", "{", ":"):  # 빈 요소를 만드는 쉼표는 버림
+                strip_trailing("")
+                safe = (len(out), list(stack))
+                out.append(char)
+                previous = char
+        elif char == "/" and raw.startswith("//", index):
+            newline = raw.find("\n", index)
+            index = length if newline == -1 else newline
+            continue
+        elif char == "/" and raw.startswith("/*", index):
+            end = raw.find("*/", index + 2)
+            index = length if end == -1 else end + 2
+            continue
+        elif char.isalpha() or char == "_":
+            end = index
+            while end < length and (raw[end].isalnum() or raw[end] == "_"):
+                end += 1
+            word = raw[index:end]
+            rest = raw[end:].lstrip()
+            if stack and stack[-1] == "{" and rest.startswith(":") and previous in ("{", ","):
+                out.append(f'"{word}"')
+            elif word in LITERALS:
+                out.append(LITERALS[word])
+                if end < length:
+                    safe = (len(out), list(stack))
+            else:
+                out.append(word)
+            previous = word[-1]
+            index = end
+            continue
+        elif char in NUMBER_CHARS:
+            end = index
+            while end < length and raw[end] in NUMBER_CHARS:
+                end += 1
+            out.append(raw[index:end])
+            previous = raw[end - 1]
+            if end < length:
+                safe = (len(out), list(stack))
+            index = end
+            continue
+        else:
+            out.append(char)
+            if not char.isspace():
+                previous = char
+        index += 1
+
+    if not stack and not in_string:
+        return "".join(out)
+
+    # 잘린 출력 처리
+    if in_string and not string_is_key:
+        if escape:
+            out.pop()
+        out.append('"')
+        cut, open_stack = len(out), stack
+    else:
+        cut, open_stack = safe
+    text = "".join(out[:cut]).rstrip().rstrip(",:").rstrip()
+    return text + "".join(CLOSERS[opener] for opener in reversed(open_stack))
+
+
+def extract_json(text: str, expect: Optional[type] = None) -> Any:
+    """LLM 응답에서 JSON 값 추출 (실패 시 None)
+
+    1) 전체를 그대로 파싱  2) 코드 펜스 안쪽 우선, 괄호 짝 맞춤으로 찾은 후보를 순서대로 파싱
+    3) 후보를 repair_json으로 보정 후 파싱 (닫히지 않은 잘린 출력 포함)
+    expect(dict/list)를 주면 그 타입인 첫 값만 인정한다.
+    """
+    if not text:
+        _record("failed")
+        return None
+    stripped = text.strip()
+    try:
+        value = _loads(stripped)
+        if _matches(value, expect):
+            _record("direct")
+            return value
+    except ValueError:
+        pass
+
+    sources = [match.group(1) for match in FENCE_RE.finditer(stripped)] + [stripped]
+    repaired_value = None
+    for source in sources:
+        for count, (start, end) in enumerate(iter_json_spans(source)):
+            if count >= MAX_CANDIDATES:
+                break
+            candidate = source[start:end] if end is not None else source[start:]
+            if end is not None:
+                try:
+                    value = _loads(candidate)
+                    if _matches(value, expect):
+                        _record("extracted")
+                        return value
+                    continue
+                except ValueError:
+                    pass
+            if repaired_value is None:
+                try:
+                    value = _loads(repair_json(candidate))
+                    if _matches(value, expect):
+                        repaired_value = value
+                except ValueError:
+                    pass
+
+    if repaired_value is not None:
+        _record("repaired")
+        return repaired_value
+    _record("failed")
+    return None
+
+
+class IncrementalJSONParser:
+    """스트리밍 중인 LLM 출력을 조각 단위로 받아 JSON 완료 여부를 바로 판단
+
+    feed()는 이번 조각에서 완성된 배열 요소(item_depth 깊이, 부모가 배열인 값)를 파싱해 돌려준다.
+    예) item_depth=2: [{...}, {...}]의 각 객체, item_depth=3: {"sections": [{...}]}의 각 섹션.
+    값의 시작으로 보는 여는 괄호는 응답 맨 앞(공백 제외)의 괄호이거나 코드 펜스(```) 뒤의 괄호뿐이다.
+    설명 문장 속 괄호("Sections [1] and [2]", "[00:12]")로 스트림을 끊지 않도록, 그런 응답은 끝까지 받은 뒤
+    finish()의 extract_json이 값을 고른다. 닫힌 최상위 값이 파싱되지 않거나 expect와 다르면 버리고 계속 찾으며,
+    맞는 값이 닫혀야 done이 True가 되고 이후 텍스트는 무시한다.
+    """
+
+    def __init__(self, item_depth: int = 2, expect: Optional[type] = None):
+        self.item_depth = item_depth
+        self.expect = expect
+        self.done = False
+        self.value = None
+        self._text = ""
+        self._position = 0
+        self._fenced = False     # 설명 문장에서 코드 펜스를 지났는지
+        self._prose = False      # 펜스 밖에서 공백이 아닌 글자(설명 문장, 버린 값)를 지났는지
+        self._reset()
+
+    def _reset(self):
+        """최상위 값 탐색 상태 초기화 (맞지 않는 값을 버리고 다시 찾을 때)"""
+        self._start = None
+        self._stack: List[Tuple[str, int]] = []   # (여는 괄호, 시작 위치)
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        if self.done or not chunk:
+            return []
+        self._text += chunk
+        text, items = self._text, []
+        index = self._position
+        while index < len(text):
+            char = text[index]
+            if self._start is None:
+                # 최상위 값이 시작되기 전 (설명 문장, 코드 펜스)
+                if char == "`":
+                    if len(text) - index < 3:
+                        break  # 펜스가 조각 경계에 걸림 - 다음 조각에서 다시 확인
+                    if text.startswith("```", index):
+                        self._fenced = True
+                        index += 3
+                        continue
+                if char in "{[" and (self._fenced or not self._prose):
+                    self._start = index
+                    self._stack.append((char, index))
+                    self._prose = True
+                elif not char.isspace():
+                    self._prose = True
+                index += 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append((char, index))
+            elif char in "}]" and self._stack:
+                _, start = self._stack.pop()
+                if not self._stack:
+                    candidate = text[self._start:index + 1]
+                    value = _parse_quiet(candidate)
+                    if value is not None and _matches(value, self.expect):
+                        self.value = extract_json(candidate, self.expect)
+                        self.done = True
+                        self._position = index + 1
+                        return items
+                    # 설명 속 괄호 등 맞지 않는 값 - 버리고 그 다음부터 다시 찾음
+                    self._reset()
+                elif len(self._stack) + 1 == self.item_depth and self._stack[-1][0] == "[":
+                    item = _parse_quiet(text[start:index + 1])
+                    if item is not None:
+                        items.append(item)
+            index += 1
+        self._position = index
+        return items
+
+    def finish(self) -> Any:
+        """완료된 값, 아직 닫히지 않았으면 잘린 출력을 보정한 값 (불가능하면 None)"""
+        if self.done:
+            return self.value
+        if self._start is None:
+            return extract_json(self._text, self.expect)
+        return extract_json(self._text[self._start:], self.expect)
+
+
+def chunk_text(chunk: Any) -> str:
+    """LangChain 메시지 조각 -> 텍스트 (content block 목록 형식 포함)"""
+    content = chunk.content if hasattr(chunk, "content") else chunk
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content if isinstance(content, str) else str(content)
+
+
+def parse_json_stream(chunks: Iterable[Any], expect: Optional[type] = None, item_depth: int = 2,
+                      on_item: Optional[Callable[[Any], None]] = None) -> Any:
+    """llm.stream() 조각을 증분 파싱 - 최상위 JSON이 닫히는 즉시 스트림을 끊고 값을 반환
+
+    모델이 JSON 뒤에 붙이는 설명을 기다리지 않고, 토큰 한도로 잘린 출력도 완결된 부분까지 살린다.
+    on_item은 배열 요소가 완성될 때마다 호출된다 (스트리밍 중 검증/진행 표시용).
+    """
+    parser = IncrementalJSONParser(item_depth=item_depth, expect=expect)
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            for item in parser.feed(chunk_text(chunk)):
+                if on_item is not None:
+                    on_item(item)
+            if parser.done:
+                _record("stream_early_stop")
+                break
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+    return parser.finish()
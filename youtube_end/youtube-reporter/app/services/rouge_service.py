@@ -1,10 +1,23 @@
 import re
+import csv
+import hashlib
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ROUGE-Lsum 문장 분리 (줄바꿈 또는 문장부호 뒤 공백)
+SENTENCE_SPLIT_PATTERN = re.compile(r'\n+|(?<=[.!?。])\s+')
+LSUM_MAX_SENTENCE_TOKENS = 1000
+
+# 일괄 평가 결과 컬럼
+METRIC_PREFIXES = {"ROUGE-1": "rouge1", "ROUGE-2": "rouge2", "ROUGE-L": "rougeL", "ROUGE-Lsum": "rougeLsum"}
+RESULT_COLUMNS = ["id"] + [
+    f"{prefix}_{field}" for prefix in METRIC_PREFIXES.values() for field in ("precision", "recall", "f1")
+] + ["reference_length", "summary_length", "error"]
+
 class RougeService:
     def __init__(self):
         pass
@@ -47,69 +60,173 @@ class RougeService:
             "f1": round(f1, 4)
         }
     
-    def _calculate_rouge_l(self, reference_tokens: List[str], summary_tokens: List[str]) -> Dict[str, float]:
-        """ROUGE-L (Longest Common Subsequence) 점수를 계산합니다."""
-        def lcs_length(x, y):
-            m, n = len(x), len(y)
-            dp = [[0] * (n + 1) for _ in range(m + 1)]
-            
-            for i in range(1, m + 1):
-                for j in range(1, n + 1):
-                    if x[i-1] == y[j-1]:
-                        dp[i][j] = dp[i-1][j-1] + 1
-                    else:
-                        dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-            
-            return dp[m][n]
-        
-        if not reference_tokens or not summary_tokens:
-            return {"precision": 0.0, "recall": 0.0, "f1": 0.0}
-        
-        lcs_len = lcs_length(reference_tokens, summary_tokens)
-        
-        precision = lcs_len / len(summary_tokens) if summary_tokens else 0.0
-        recall = lcs_len / len(reference_tokens) if reference_tokens else 0.0
+    def _match_masks(self, tokens: List[str]) -> Dict[str, int]:
+        """토큰별 등장 위치 비트마스크"""
+        masks = {}
+        for j, token in enumerate(tokens):
+            masks[token] = masks.get(token, 0) | (1 << j)
+        return masks
+
+    def _lcs_rows(self, x: List[str], y: List[str], masks: Dict[str, int] = None) -> List[int]:
+        """비트 병렬 LCS (Hyyrö) - y 위치를 비트로 둔 행 벡터를 x 토큰마다 하나씩 반환
+
+        rows[i]의 하위 j비트 중 0의 개수 = LCS(x[:i], y[:j]) 길이.
+        DP 표 대신 길이 len(y) 비트 정수 하나로 행을 표현해 파이썬 반복은 len(x)번뿐이다.
+        masks: 미리 계산한 _match_masks(y) (같은 y를 여러 번 비교할 때 재사용)
+        """
+        if masks is None:
+            masks = self._match_masks(y)
+        full = (1 << len(y)) - 1
+        row = full
+        rows = [row]
+        for token in x:
+            matched = row & masks.get(token, 0)
+            row = ((row + matched) | (row - matched)) & full
+            rows.append(row)
+        return rows
+
+    def _lcs_length(self, x: List[str], y: List[str]) -> int:
+        """LCS 길이 (메모리 O(len(y)) 비트 - 마지막 행만 유지)"""
+        if len(x) > len(y):
+            x, y = y, x
+        masks = self._match_masks(y)
+        full = (1 << len(y)) - 1
+        row = full
+        for token in x:
+            matched = row & masks.get(token, 0)
+            row = ((row + matched) | (row - matched)) & full
+        return len(y) - bin(row).count("1")
+
+    def _lcs_indices(self, reference: List[str], candidate: List[str], masks: Dict[str, int] = None) -> set:
+        """reference 토큰 중 candidate와의 LCS에 포함되는 위치 (ROUGE-Lsum 합집합 계산용)
+
+        역추적 순서와 동률 처리는 rouge-score의 _backtrack_norec과 같다.
+        """
+        if masks is None:
+            masks = self._match_masks(candidate)
+        rows = self._lcs_rows(reference, candidate, masks)
+
+        def value(i, j):
+            return j - bin(rows[i] & ((1 << j) - 1)).count("1")
+
+        indices = set()
+        i, j = len(reference), len(candidate)
+        while i > 0 and j > 0:
+            if reference[i - 1] not in masks:
+                # candidate에 없는 토큰의 행은 이전 행과 같음 → LCS(i-1, j) = LCS(i, j), 항상 위로 이동
+                i -= 1
+            # 토큰이 같으면 LCS(i, j) = LCS(i-1, j-1) + 1 이 항상 성립
+            elif reference[i - 1] == candidate[j - 1]:
+                indices.add(i - 1)
+                i -= 1
+                j -= 1
+            elif value(i - 1, j) >= value(i, j - 1):
+                i -= 1
+            else:
+                j -= 1
+        return indices
+
+    def _scores(self, hits: int, reference_length: int, summary_length: int) -> Dict[str, float]:
+        precision = hits / summary_length if summary_length else 0.0
+        recall = hits / reference_length if reference_length else 0.0
         f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
-        
         return {
             "precision": round(precision, 4),
             "recall": round(recall, 4),
             "f1": round(f1, 4)
         }
+
+    def _calculate_rouge_l(self, reference_tokens: List[str], summary_tokens: List[str]) -> Dict[str, float]:
+        """ROUGE-L (Longest Common Subsequence) 점수를 계산합니다."""
+        if not reference_tokens or not summary_tokens:
+            return {"precision": 0.0, "recall": 0.0, "f1": 0.0}
+
+        lcs_len = self._lcs_length(reference_tokens, summary_tokens)
+        return self._scores(lcs_len, len(reference_tokens), len(summary_tokens))
+
+    def _split_sentences(self, text: str) -> List[List[str]]:
+        """문장(줄/문장부호) 단위 토큰 목록 - 너무 긴 문장은 LSUM_MAX_SENTENCE_TOKENS 단위로 분할"""
+        sentences = []
+        for sentence in SENTENCE_SPLIT_PATTERN.split(text):
+            tokens = self._tokenize(sentence)
+            for start in range(0, len(tokens), LSUM_MAX_SENTENCE_TOKENS):
+                sentences.append(tokens[start:start + LSUM_MAX_SENTENCE_TOKENS])
+        return sentences
+
+    def _calculate_rouge_lsum(self, reference_sentences: List[List[str]], summary_sentences: List[List[str]]) -> Dict[str, float]:
+        """ROUGE-Lsum (요약 단위 union-LCS) 점수를 계산합니다.
+
+        참조 문장마다 모든 요약 문장과의 LCS 위치 합집합을 구하고,
+        토큰 빈도 한도 안에서만 적중으로 센다 (rouge-score 패키지와 같은 방식).
+        """
+        reference_length = sum(len(sentence) for sentence in reference_sentences)
+        summary_length = sum(len(sentence) for sentence in summary_sentences)
+        if not reference_length or not summary_length:
+            return {"precision": 0.0, "recall": 0.0, "f1": 0.0}
+
+        reference_counts = Counter(token for sentence in reference_sentences for token in sentence)
+        summary_counts = Counter(token for sentence in summary_sentences for token in sentence)
+
+        # 요약 문장은 그대로 LCS에 넣어야 역추적 경로(동률 처리)가 rouge-score와 같다
+        # - 겹치는 토큰이 하나도 없는 문장만 건너뜀 (LCS가 비어 합집합에 영향 없음)
+        summary_masks = [self._match_masks(sentence) for sentence in summary_sentences]
+        hits = 0
+        for reference in reference_sentences:
+            union = set()
+            for candidate, masks in zip(summary_sentences, summary_masks):
+                if not masks.keys().isdisjoint(reference):
+                    union |= self._lcs_indices(reference, candidate, masks)
+            for index in sorted(union):
+                token = reference[index]
+                if reference_counts[token] > 0 and summary_counts[token] > 0:
+                    hits += 1
+                    reference_counts[token] -= 1
+                    summary_counts[token] -= 1
+
+        return self._scores(hits, reference_length, summary_length)
     
-    def calculate_rouge_scores(self, reference_text: str, summary_text: str) -> Dict[str, Any]:
-        """ROUGE 점수들을 계산합니다."""
-        try:
-            # 텍스트 전처리
-            ref_tokens = self._tokenize(reference_text)
-            sum_tokens = self._tokenize(summary_text)
-            
-            logger.info(f"Reference tokens count: {len(ref_tokens)}")
-            logger.info(f"Summary tokens count: {len(sum_tokens)}")
-            
-            # ROUGE 점수 계산
-            rouge_1 = self._calculate_rouge_n(ref_tokens, sum_tokens, 1)
-            rouge_2 = self._calculate_rouge_n(ref_tokens, sum_tokens, 2)
-            rouge_l = self._calculate_rouge_l(ref_tokens, sum_tokens)
-            
-            scores = {
-                "ROUGE-1": rouge_1,
-                "ROUGE-2": rouge_2,
-                "ROUGE-L": rouge_l,
-                "metadata": {
-                    "reference_length": len(ref_tokens),
-                    "summary_length": len(sum_tokens),
-                    "compression_ratio": round(len(sum_tokens) / len(ref_tokens), 4) if ref_tokens else 0.0
-                }
+    def _prepare(self, text: str) -> Dict[str, Any]:
+        """점수 계산에 필요한 토큰/문장 토큰 (참조 텍스트별로 한 번만 만들어 재사용)"""
+        return {"tokens": self._tokenize(text), "sentences": self._split_sentences(text)}
+
+    def _score_prepared(self, reference: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+        ref_tokens, sum_tokens = reference["tokens"], summary["tokens"]
+        return {
+            "ROUGE-1": self._calculate_rouge_n(ref_tokens, sum_tokens, 1),
+            "ROUGE-2": self._calculate_rouge_n(ref_tokens, sum_tokens, 2),
+            "ROUGE-L": self._calculate_rouge_l(ref_tokens, sum_tokens),
+            "ROUGE-Lsum": self._calculate_rouge_lsum(reference["sentences"], summary["sentences"]),
+            "metadata": {
+                "reference_length": len(ref_tokens),
+                "summary_length": len(sum_tokens),
+                "compression_ratio": round(len(sum_tokens) / len(ref_tokens), 4) if ref_tokens else 0.0
             }
+        }
+
+    def calculate_rouge_scores(self, reference_text: str, summary_text: str, verbose: bool = False) -> Dict[str, Any]:
+        """ROUGE 점수들을 계산합니다. (verbose=True면 상세 결과를 콘솔에 출력)"""
+        try:
+            scores = self._score_prepared(self._prepare(reference_text), self._prepare(summary_text))
+            rouge_1, rouge_2 = scores["ROUGE-1"], scores["ROUGE-2"]
+            rouge_l, rouge_lsum = scores["ROUGE-L"], scores["ROUGE-Lsum"]
+            metadata = scores["metadata"]
+
+            logger.info(f"Reference tokens count: {metadata['reference_length']}")
+            logger.info(f"Summary tokens count: {metadata['summary_length']}")
+
+            if not verbose:
+                print(f"📊 ROUGE F1 - 1: {rouge_1['f1']:.4f}, 2: {rouge_2['f1']:.4f}, "
+                      f"L: {rouge_l['f1']:.4f}, Lsum: {rouge_lsum['f1']:.4f} "
+                      f"(원본 {metadata['reference_length']} / 요약 {metadata['summary_length']} 토큰)")
+                return scores
             
             # 콘솔에 출력
             print("\n" + "="*50)
             print("📊 ROUGE 평가 결과")
             print("="*50)
-            print(f"📝 원본 길이: {len(ref_tokens)} 토큰")
-            print(f"📄 요약 길이: {len(sum_tokens)} 토큰")
-            print(f"📉 압축률: {scores['metadata']['compression_ratio']:.2%}")
+            print(f"📝 원본 길이: {metadata['reference_length']} 토큰")
+            print(f"📄 요약 길이: {metadata['summary_length']} 토큰")
+            print(f"📉 압축률: {metadata['compression_ratio']:.2%}")
             print("-"*50)
             print(f"🔴 ROUGE-1 (단어 겹침)")
             print(f"   Precision: {rouge_1['precision']:.4f}")
@@ -123,6 +240,10 @@ class RougeService:
             print(f"   Precision: {rouge_l['precision']:.4f}")
             print(f"   Recall:    {rouge_l['recall']:.4f}")
             print(f"   F1-Score:  {rouge_l['f1']:.4f}")
+            print(f"🔵 ROUGE-Lsum (문장 단위 union-LCS)")
+            print(f"   Precision: {rouge_lsum['precision']:.4f}")
+            print(f"   Recall:    {rouge_lsum['recall']:.4f}")
+            print(f"   F1-Score:  {rouge_lsum['f1']:.4f}")
             print("="*50)
             
             return scores
@@ -133,8 +254,79 @@ class RougeService:
                 "ROUGE-1": {"precision": 0.0, "recall": 0.0, "f1": 0.0},
                 "ROUGE-2": {"precision": 0.0, "recall": 0.0, "f1": 0.0},
                 "ROUGE-L": {"precision": 0.0, "recall": 0.0, "f1": 0.0},
+                "ROUGE-Lsum": {"precision": 0.0, "recall": 0.0, "f1": 0.0},
                 "error": str(e)
             }
 
+    def evaluate_batch(self, pairs: List[Dict[str, str]], max_workers: int = None) -> List[Dict[str, Any]]:
+        """여러 (reference, summary) 쌍을 프로세스 풀로 평가 → 쌍별 결과 행 목록 (입력 순서 유지)
+
+        pairs: {"id", "reference", "summary"} 목록.
+        같은 참조 텍스트를 쓰는 쌍은 한 작업으로 묶어 참조 토큰화를 한 번만 한다.
+        """
+        groups = {}
+        for index, pair in enumerate(pairs):
+            digest = hashlib.sha1(pair["reference"].encode("utf-8")).hexdigest()
+            group = groups.setdefault(digest, {"reference": pair["reference"], "items": []})
+            group["items"].append((index, pair.get("id", index), pair["summary"]))
+
+        tasks = [(group["reference"], group["items"]) for group in groups.values()]
+        # 긴 참조부터 처리해 마지막에 큰 작업 하나만 남는 상황 방지
+        tasks.sort(key=lambda task: -len(task[0]) * len(task[1]))
+        if max_workers == 1 or len(tasks) == 1:
+            results = list(map(_score_reference_group, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_score_reference_group, tasks))
+
+        rows = [None] * len(pairs)
+        for group_rows in results:
+            for index, row in group_rows:
+                rows[index] = row
+
+        print(f"📊 ROUGE 일괄 평가 완료: {len(pairs)}쌍 (참조 {len(tasks)}개)")
+        return rows
+
+    def write_results(self, rows: List[Dict[str, Any]], output_path: str):
+        """평가 결과 저장 (.csv 또는 .parquet)"""
+        if output_path.endswith(".parquet"):
+            import pandas as pd
+            pd.DataFrame(rows, columns=RESULT_COLUMNS).to_parquet(output_path, index=False)
+            return
+
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+def _flatten_scores(pair_id, scores: Dict[str, Any]) -> Dict[str, Any]:
+    row = {"id": pair_id}
+    for metric, prefix in METRIC_PREFIXES.items():
+        for field in ("precision", "recall", "f1"):
+            row[f"{prefix}_{field}"] = scores.get(metric, {}).get(field, 0.0)
+    metadata = scores.get("metadata", {})
+    row["reference_length"] = metadata.get("reference_length", 0)
+    row["summary_length"] = metadata.get("summary_length", 0)
+    row["error"] = scores.get("error", "")
+    return row
+
+def _score_reference_group(task) -> List[tuple]:
+    """프로세스 풀 작업 단위 - 참조 하나와 그 참조를 쓰는 요약들 평가"""
+    reference_text, items = task
+    service = RougeService()
+    try:
+        reference = service._prepare(reference_text)
+    except Exception as e:
+        return [(index, _flatten_scores(pair_id, {"error": str(e)})) for index, pair_id, _ in items]
+
+    rows = []
+    for index, pair_id, summary_text in items:
+        try:
+            scores = service._score_prepared(reference, service._prepare(summary_text))
+        except Exception as e:
+            scores = {"error": str(e)}
+        rows.append((index, _flatten_scores(pair_id, scores)))
+    return rows
+
 # 싱글톤 인스턴스
 rouge_service = RougeService()
\ No newline at end of file
@@ -0,0 +1,229 @@
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CSV_CHUNK_ROWS = 50_000       # read_csv 청크 크기
+EXCEL_BATCH_ROWS = 5_000      # openpyxl 행을 DataFrame으로 묶는 단위
+HEAD_ROWS = 20                # 샘플: 앞쪽 행
+RANDOM_SAMPLE_ROWS = 30       # 샘플: 나머지에서 무작위 (저수지 샘플링)
+MAX_TRACKED_VALUES = 2_000    # 열별 값 빈도 추적 한도 (넘으면 상위 절반만 유지)
+TOP_VALUES = 3
+MAX_CELL_CHARS = 50
+
+class ColumnStats:
+    """열 하나의 누적 통계 (숫자 값 최소/최대/평균 + 날짜 값 최소/최대 + 텍스트 값 근사 빈도)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.non_null = 0
+        self.numeric_count = 0
+        self.numeric_sum = 0.0
+        self.numeric_min = None
+        self.numeric_max = None
+        self.date_count = 0
+        self.date_min = None
+        self.date_max = None
+        self.value_counts = Counter()
+        self.truncated = False
+
+    def update(self, series: pd.Series):
+        values = series.dropna()
+        if values.empty:
+            return
+        self.non_null += len(values)
+
+        # 날짜는 pd.to_numeric을 거치면 epoch 정수가 되므로 따로 집계
+        if pd.api.types.is_datetime64_any_dtype(values):
+            self._update_dates(values)
+            return
+        if pd.api.types.is_timedelta64_dtype(values):
+            self._update_texts(values.astype(str))
+            return
+        if values.dtype == object:
+            # openpyxl은 날짜 셀을 datetime/date 객체로 주며, 다른 값과 섞이면 object 열이 됨
+            is_date = values.map(lambda value: isinstance(value, date))
+            if is_date.any():
+                self._update_dates(values[is_date])
+                values = values[~is_date]
+                if values.empty:
+                    return
+
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            numeric = values  # 이미 숫자 열이면 변환 생략
+        else:
+            numeric = pd.to_numeric(values, errors="coerce")
+        is_numeric = numeric.notna()
+        numbers = numeric[is_numeric]
+        if not numbers.empty:
+            self.numeric_count += len(numbers)
+            self.numeric_sum += float(numbers.sum())
+            low, high = float(numbers.min()), float(numbers.max())
+            self.numeric_min = low if self.numeric_min is None else min(self.numeric_min, low)
+            self.numeric_max = high if self.numeric_max is None else max(self.numeric_max, high)
+
+        self._update_texts(values[~is_numeric])
+
+    def _update_dates(self, values: pd.Series):
+        # 시간대가 섞여도 비교할 수 있도록 UTC 기준 naive 시각으로 통일
+        dates = pd.to_datetime(values, errors="coerce", utc=True).dt.tz_convert(None)
+        self._update_texts(values[dates.isna()])  # 범위를 벗어나 변환되지 않은 날짜는 텍스트로
+        dates = dates.dropna()
+        if dates.empty:
+            return
+        self.date_count += len(dates)
+        low, high = dates.min(), dates.max()
+        self.date_min = low if self.date_min is None else min(self.date_min, low)
+        self.date_max = high if self.date_max is None else max(self.date_max, high)
+
+    def _update_texts(self, texts: pd.Series):
+        if texts.empty:
+            return
+        self.value_counts.update(texts.astype(str).value_counts().to_dict())
+        if len(self.value_counts) > MAX_TRACKED_VALUES:
+            self.value_counts = Counter(dict(self.value_counts.most_common(MAX_TRACKED_VALUES // 2)))
+            self.truncated = True
+
+    def describe(self) -> tuple:
+        """(유형, 요약 문자열)"""
+        text_count = self.non_null - self.numeric_count - self.date_count
+        if self.date_count and self.date_count >= max(self.numeric_count, text_count):
+            has_time = any(value != value.normalize() for value in (self.date_min, self.date_max))
+            fmt = "%Y-%m-%d %H:%M:%S" if has_time else "%Y-%m-%d"
+            return "날짜", f"최소 {self.date_min.strftime(fmt)}, 최대 {self.date_max.strftime(fmt)}"
+        if self.numeric_count and self.numeric_count >= text_count:
+            mean = self.numeric_sum / self.numeric_count
+            return "숫자", f"최소 {self.numeric_min:g}, 최대 {self.numeric_max:g}, 평균 {mean:.4g}"
+        if not self.non_null:
+            return "빈 열", "-"
+        distinct = f"{len(self.value_counts)}+" if self.truncated else str(len(self.value_counts))
+        top = ", ".join(
+            f"{_cell(value)}({count})" for value, count in self.value_counts.most_common(TOP_VALUES)
+        )
+        return "텍스트", f"고유값 {distinct}개, 상위: {top}"
+
+class TableSummary:
+    """청크 단위로 표를 읽으며 행 수/열 통계/샘플 행만 유지 (파일 크기와 무관하게 메모리 일정)"""
+
+    def __init__(self, name: str, seed: int = 0):
+        self.name = name
+        self.columns: List[str] = []
+        self.stats: Dict[str, ColumnStats] = {}
+        self.rows = 0
+        self.head: List[list] = []
+        self.reservoir: List[list] = []
+        self._random = np.random.default_rng(seed)
+
+    def add_chunk(self, chunk: pd.DataFrame):
+        if not self.columns:
+            self.columns = _dedupe_columns([str(column) for column in chunk.columns])
+            self.stats = {column: ColumnStats(column) for column in self.columns}
+        # 위치로 접근 - 같은 이름의 열이 있어도 chunk[name]처럼 DataFrame이 나오지 않도록
+        for index, name in enumerate(self.columns):
+            self.stats[name].update(chunk.iloc[:, index])
+
+        start, count = self.rows, len(chunk)
+        self.rows += count
+
+        take = max(0, min(HEAD_ROWS - len(self.head), count))
+        self.head.extend(list(row) for row in chunk.iloc[:take].itertuples(index=False, name=None))
+        if count == take:
+            return
+
+        # 저수지 샘플링 (벡터화) - 앞쪽 행 이후 j번째 행은 [0, j] 난수가 RANDOM_SAMPLE_ROWS 미만일 때만 선택
+        seen = np.arange(start + take - HEAD_ROWS, start + count - HEAD_ROWS)
+        slots = self._random.integers(0, seen + 1)
+        for position in np.nonzero(slots < RANDOM_SAMPLE_ROWS)[0]:
+            row = chunk.iloc[take + position].tolist()
+            if seen[position] < RANDOM_SAMPLE_ROWS:
+                self.reservoir.append(row)
+            else:
+                self.reservoir[slots[position]] = row
+
+    def to_markdown(self) -> str:
+        lines = [f"## {self.name}", f"- 행: {self.rows}, 열: {len(self.columns)}", ""]
+        if not self.columns:
+            return "\n".join(lines)
+
+        lines += ["### 열 통계", "| 열 | 유형 | 값 개수 | 요약 |", "|---|---|---|---|"]
+        for name in self.columns:
+            kind, summary = self.stats[name].describe()
+            lines.append(f"| {_cell(name)} | {kind} | {self.stats[name].non_null} | {summary} |")
+
+        sample = self.head + self.reservoir
+        if sample:
+            title = f"앞 {len(self.head)}행" + (f" + 무작위 {len(self.reservoir)}행" if self.reservoir else "")
+            lines += ["", f"### 샘플 행 ({title})",
+                      "| " + " | ".join(_cell(name) for name in self.columns) + " |",
+                      "|" + "---|" * len(self.columns)]
+            for row in sample:
+                lines.append("| " + " | ".join(_cell(value) for value in row) + " |")
+        return "\n".join(lines)
+
+def _cell(value: Any) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = str(value).replace("|", "\\|").replace("\n", " ")
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+def _dedupe_columns(columns: List[str]) -> List[str]:
+    """중복 열 이름에 ".1", ".2" 접미사 부여 (pandas read_csv와 같은 규칙)"""
+    seen = set(columns)
+    used = set()
+    counts: Counter = Counter()
+    result = []
+    for column in columns:
+        name = column
+        if name in used:
+            while name in seen:
+                counts[column] += 1
+                name = f"{column}.{counts[column]}"
+            seen.add(name)
+        used.add(name)
+        result.append(name)
+    return result
+
+def summarize_csv(file_path: str) -> TableSummary:
+    """CSV를 CSV_CHUNK_ROWS 단위로 읽어 요약"""
+    summary = TableSummary("CSV")
+    for chunk in pd.read_csv(file_path, chunksize=CSV_CHUNK_ROWS, low_memory=True):
+        summary.add_chunk(chunk)
+    return summary
+
+def _batched_rows(rows: Iterator[tuple], size: int) -> Iterable[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def summarize_excel(file_path: str) -> List[TableSummary]:
+    """xlsx를 openpyxl read-only 모드로 시트별 스트리밍 요약"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    summaries = []
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header: Optional[tuple] = next(rows, None)
+            summary = TableSummary(f"시트: {sheet.title}")
+            if header is not None:
+                columns = _dedupe_columns(
+                    [str(value) if value is not None else f"열{i + 1}" for i, value in enumerate(header)]
+                )
+                width = len(columns)
+                summary.add_chunk(pd.DataFrame([], columns=columns))  # 데이터 행이 없어도 열 정보 유지
+                for batch in _batched_rows(rows, EXCEL_BATCH_ROWS):
+                    # 머리글보다 짧은/긴 행은 머리글 너비에 맞춤 (read-only 모드는 행 길이가 들쭉날쭉할 수 있음)
+                    batch = [row[:width] + (None,) * (width - len(row)) for row in batch]
+                    summary.add_chunk(pd.DataFrame(batch, columns=columns))
+            summaries.append(summary)
+    finally:
+        workbook.close()
+    return summaries
@@ -30,6 +30,27 @@ class UserS3Service:
         except Exception as e:
             raise Exception(f"보고서 업로드 실패: {str(e)}")
     
+    def upload_analysis_result(self, user_id: str, job_id: str, result: Dict[str, Any]) -> str:
+        """
+        분석 작업 결과 전체 업로드 (analysis/{user_id}/{job_id}_result.json - Redis 핫 상태 만료 후 조회용)
+        """
+        try:
+            key = f"analysis/{user_id}/{job_id}_result.json"
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=json.dumps(result, ensure_ascii=False, default=str),
+                ContentType="application/json",
+                Metadata={
+                    "user_id": user_id,
+                    "job_id": job_id,
+                    "created_at": datetime.utcnow().isoformat()
+                }
+            )
+            return key
+        except Exception as e:
+            raise Exception(f"분석 결과 업로드 실패: {str(e)}")
+
     def upload_user_audio(self, user_id: str, job_id: str, audio_data: bytes) -> str:
         """
         사용자별 오디오 파일 업로드
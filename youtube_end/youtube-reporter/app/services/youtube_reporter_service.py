@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 
+from app.core.database import session_scope
 from app.workflows.youtube_workflow import YouTubeReporterWorkflow
 from app.services.database_service import database_service
 from app.services.user_s3_service import user_s3_service
@@ -51,8 +52,8 @@ class YouTubeReporterService:
             raise
 
     async def process_youtube_analysis(self, job_id: str, user_id: str, youtube_url: str,
-                                       db: Session, include_audio: bool = True) -> Dict[str, Any]:
-        """YouTube 분석 실행"""
+                                       include_audio: bool = True) -> Dict[str, Any]:
+        """YouTube 분석 실행 (요청 세션과 무관하게 자체 세션으로 완료 처리)"""
         try:
             logger.info(f"🎬 YouTube 분석 시작: {job_id}")
 
@@ -84,35 +85,31 @@ class YouTubeReporterService:
                     logger.warning(f"오디오 생성 실패 (무시됨): {e}")
                     audio_info = {"success": False, "error": str(e)}
 
-            # 데이터베이스 업데이트
-            database_service.update_job_status(
-                db=db,
+            # 데이터베이스 업데이트 (작업 상태 / 보고서 / 오디오를 한 트랜잭션으로)
+            report_row = None
+            if s3_info.get("success"):
+                report_row = {
+                    "title": result.get("title", "YouTube 분석 리포트"),
+                    "s3_key": s3_info["s3_key"],
+                    "file_type": "json"
+                }
+
+            audio_row = None
+            if audio_info and audio_info.get("success"):
+                audio_row = {
+                    "s3_key": audio_info["audio_s3_key"],
+                    "duration": audio_info.get("duration_estimate", 0)
+                }
+
+            self._finalize_job(
                 job_id=job_id,
+                user_id=user_id,
                 status="completed" if result.get("success") else "failed",
-                result_s3_key=s3_info.get("s3_key") if s3_info.get("success") else None
+                result_s3_key=s3_info.get("s3_key") if s3_info.get("success") else None,
+                report=report_row,
+                audio=audio_row
             )
 
-            # S3 보고서 정보를 데이터베이스에 저장
-            if s3_info.get("success"):
-                database_service.create_user_report(
-                    db=db,
-                    job_id=job_id,
-                    user_id=user_id,
-                    title=result.get("title", "YouTube 분석 리포트"),
-                    s3_key=s3_info["s3_key"],
-                    file_type="json"
-                )
-
-            # 오디오 정보를 데이터베이스에 저장
-            if audio_info and audio_info.get("success"):
-                database_service.create_user_audio(
-                    db=db,
-                    job_id=job_id,
-                    user_id=user_id,
-                    s3_key=audio_info["audio_s3_key"],
-                    duration=audio_info.get("duration_estimate", 0)
-                )
-
             # Redis 정리
             try:
                 state_manager.remove_user_active_job(user_id, job_id)
@@ -136,7 +133,10 @@ class YouTubeReporterService:
             logger.error(f"YouTube 분석 실패: {job_id} - {str(e)}")
 
             # 실패 시 데이터베이스 업데이트
-            database_service.update_job_status(db=db, job_id=job_id, status="failed")
+            try:
+                self._finalize_job(job_id=job_id, user_id=user_id, status="failed")
+            except Exception as db_error:
+                logger.error(f"실패 상태 기록 실패: {job_id} - {db_error}")
 
             # Redis 정리
             try:
@@ -146,6 +146,20 @@ class YouTubeReporterService:
 
             raise
 
+    def _finalize_job(self, job_id: str, user_id: str, status: str, result_s3_key: Optional[str] = None,
+                      report: Optional[Dict[str, Any]] = None, audio: Optional[Dict[str, Any]] = None):
+        """작업 완료 처리 단위 작업 - 자체 세션을 열고 단일 트랜잭션으로 기록"""
+        with session_scope() as db:
+            database_service.finalize_job(
+                db=db,
+                job_id=job_id,
+                user_id=user_id,
+                status=status,
+                result_s3_key=result_s3_key,
+                report=report,
+                audio=audio
+            )
+
     async def _save_report_to_s3(self, user_id: str, job_id: str, result: Dict[str, Any],
                                  youtube_url: str) -> Dict[str, Any]:
         """리포트를 S3에 저장"""
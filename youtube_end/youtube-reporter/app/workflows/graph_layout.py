@@ -0,0 +1,287 @@
+# app/workflows/graph_layout.py
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+LAYER_GAP = 220          # 계층형 배치: 계층 간 간격 (px)
+NODE_GAP = 100           # 계층형 배치: 같은 계층 안 노드 간격 (px)
+CROSSING_SWEEPS = 8      # 교차 최소화 위/아래 스윕 횟수
+COORDINATE_PASSES = 4    # 좌표 정렬(이웃 평균 위치로 당기기) 반복 횟수
+FORCE_ITERATIONS = 300   # 힘 기반 배치 반복 횟수
+FORCE_SPACING = 150      # 힘 기반 배치: 이상적인 노드 간 거리 (px)
+FORCE_REPULSION_RANGE = 4 * FORCE_SPACING  # 이 거리 밖의 노드 쌍은 밀어내지 않음 (떨어진 연결 요소가 멀리 날아가지 않게)
+FORCE_GRAVITY = 0.05     # 중심 방향 인력 계수
+
+VERTICAL_DIRECTIONS = {"TB", "TD", "UD", "BT", "DU"}
+REVERSED_DIRECTIONS = {"RL", "BT", "DU"}
+
+Position = Dict[str, float]
+
+
+def layered_layout(node_ids: List[Hashable], edges: List[Tuple[Hashable, Hashable]],
+                   direction: str = "LR") -> Dict[Hashable, Position]:
+    """Sugiyama 방식 계층형 배치 -> 노드 ID: {"x", "y"}
+
+    1) DFS 역방향 엣지를 뒤집어 순환 제거  2) 최장 경로로 계층 배정
+    3) 두 계층 이상 건너는 엣지에 더미 노드 삽입  4) barycenter 스윕으로 엣지 교차 최소화
+    5) 이웃 평균 위치로 당긴 뒤 최소 간격을 보장하는 좌표 배정
+    """
+    if not node_ids:
+        return {}
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    edges = [(source, target) for source, target in edges
+             if source != target and source in index and target in index]
+
+    acyclic = _remove_cycles(node_ids, edges)
+    layer = _longest_path_layers(node_ids, acyclic)
+
+    # 긴 엣지를 계층마다 더미 노드로 잘라 인접 계층 간 엣지만 남김
+    layers: Dict[int, List[Any]] = defaultdict(list)
+    for node_id in node_ids:
+        layers[layer[node_id]].append(node_id)
+    down, up = defaultdict(list), defaultdict(list)
+    for edge_index, (source, target) in enumerate(acyclic):
+        previous = source
+        for depth in range(layer[source] + 1, layer[target]):
+            dummy = ("__dummy__", edge_index, depth)
+            layers[depth].append(dummy)
+            down[previous].append(dummy)
+            up[dummy].append(previous)
+            previous = dummy
+        down[previous].append(target)
+        up[target].append(previous)
+
+    depth_count = max(layers) + 1
+    ordering = [list(layers[depth]) for depth in range(depth_count)]
+    ordering = _reduce_crossings(ordering, down, up)
+    coordinates = _assign_coordinates(ordering, down, up)
+
+    vertical = str(direction).upper() in VERTICAL_DIRECTIONS
+    flip = -1 if str(direction).upper() in REVERSED_DIRECTIONS else 1
+    positions = {}
+    for depth, members in enumerate(ordering):
+        for node in members:
+            if node in index:
+                along, across = flip * depth * LAYER_GAP, coordinates[node]
+                positions[node] = {"x": across, "y": along} if vertical else {"x": along, "y": across}
+    return positions
+
+
+def _remove_cycles(node_ids: List[Hashable], edges: List[Tuple[Hashable, Hashable]]) -> List[Tuple[Hashable, Hashable]]:
+    """DFS에서 스택 위 노드로 돌아가는 엣지를 뒤집어 DAG로 만듦 (연결은 유지)"""
+    successors = defaultdict(list)
+    for source, target in edges:
+        successors[source].append(target)
+
+    back_edges = set()
+    state = {}
+    for root in node_ids:
+        if root in state:
+            continue
+        state[root] = "active"
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node] = "done"
+                stack.pop()
+            elif state.get(child) == "active":
+                back_edges.add((node, child))
+            elif child not in state:
+                state[child] = "active"
+                stack.append((child, iter(successors[child])))
+
+    acyclic, seen = [], set()
+    for source, target in edges:
+        edge = (target, source) if (source, target) in back_edges else (source, target)
+        if edge not in seen:
+            seen.add(edge)
+            acyclic.append(edge)
+    return acyclic
+
+
+def _longest_path_layers(node_ids: List[Hashable], edges: List[Tuple[Hashable, Hashable]]) -> Dict[Hashable, int]:
+    successors = defaultdict(list)
+    indegree = defaultdict(int)
+    for source, target in edges:
+        successors[source].append(target)
+        indegree[target] += 1
+
+    layer = {node_id: 0 for node_id in node_ids}
+    queue = [node_id for node_id in node_ids if not indegree[node_id]]
+    while queue:
+        node = queue.pop()
+        for child in successors[node]:
+            layer[child] = max(layer[child], layer[node] + 1)
+            indegree[child] -= 1
+            if not indegree[child]:
+                queue.append(child)
+    return layer
+
+
+def _count_crossings(upper: List[Any], lower: List[Any], down: Dict[Any, list]) -> int:
+    """인접한 두 계층 사이 엣지 교차 수 (아래쪽 끝점 순서의 역전 쌍 개수)"""
+    lower_position = {node: i for i, node in enumerate(lower)}
+    targets = [lower_position[child] for node in upper for child in sorted(down[node], key=lower_position.get)]
+    return sum(1 for i in range(len(targets)) for j in range(i + 1, len(targets)) if targets[i] > targets[j])
+
+
+def _total_crossings(ordering: List[List[Any]], down: Dict[Any, list]) -> int:
+    return sum(_count_crossings(ordering[i], ordering[i + 1], down) for i in range(len(ordering) - 1))
+
+
+def _reduce_crossings(ordering: List[List[Any]], down: Dict[Any, list], up: Dict[Any, list]) -> List[List[Any]]:
+    """위→아래(선행 노드 기준), 아래→위(후속 노드 기준) barycenter 스윕을 번갈아 하며 교차가 가장 적은 순서 유지"""
+    best = [list(members) for members in ordering]
+    best_crossings = _total_crossings(best, down)
+    current = [list(members) for members in ordering]
+
+    for sweep in range(CROSSING_SWEEPS):
+        if best_crossings == 0:
+            break
+        downward = sweep % 2 == 0
+        depths = range(1, len(current)) if downward else range(len(current) - 2, -1, -1)
+        for depth in depths:
+            reference = current[depth - 1] if downward else current[depth + 1]
+            neighbours = up if downward else down
+            reference_position = {node: i for i, node in enumerate(reference)}
+            previous_position = {node: i for i, node in enumerate(current[depth])}
+
+            def barycenter(node):
+                positions = [reference_position[n] for n in neighbours[node] if n in reference_position]
+                # 이웃이 없는 노드는 현재 자리 유지
+                return (sum(positions) / len(positions) if positions else previous_position[node], previous_position[node])
+
+            current[depth].sort(key=barycenter)
+
+        crossings = _total_crossings(current, down)
+        if crossings < best_crossings:
+            best, best_crossings = [list(members) for members in current], crossings
+    return best
+
+
+def _assign_coordinates(ordering: List[List[Any]], down: Dict[Any, list], up: Dict[Any, list]) -> Dict[Any, float]:
+    """계층 안 좌표: 순서를 유지한 채 이웃 평균 위치로 당기고, NODE_GAP 최소 간격 보장 후 0 중심 정렬"""
+    coordinate = {}
+    for members in ordering:
+        for i, node in enumerate(members):
+            coordinate[node] = (i - (len(members) - 1) / 2) * NODE_GAP
+
+    for step in range(COORDINATE_PASSES):
+        downward = step % 2 == 0
+        depths = range(1, len(ordering)) if downward else range(len(ordering) - 2, -1, -1)
+        neighbours = up if downward else down
+        for depth in depths:
+            members = ordering[depth]
+            desired = []
+            for node in members:
+                linked = [coordinate[n] for n in neighbours[node]]
+                desired.append(sum(linked) / len(linked) if linked else coordinate[node])
+            placed = _place_in_order(desired)
+            for node, value in zip(members, placed):
+                coordinate[node] = value
+
+    # 전체를 0 중심으로
+    values = list(coordinate.values())
+    offset = (max(values) + min(values)) / 2
+    return {node: round(value - offset, 1) for node, value in coordinate.items()}
+
+
+def _place_in_order(desired: List[float]) -> List[float]:
+    """순서를 유지하며 간격이 NODE_GAP 이상인 좌표 중 desired에 가까운 값 (앞뒤 두 번 밀어낸 평균)"""
+    forward = []
+    for value in desired:
+        forward.append(value if not forward else max(value, forward[-1] + NODE_GAP))
+    backward = []
+    for value in reversed(desired):
+        backward.append(value if not backward else min(value, backward[-1] - NODE_GAP))
+    backward.reverse()
+    placed = [(a + b) / 2 for a, b in zip(forward, backward)]
+    # 평균 후에도 간격이 좁아지지 않도록 한 번 더 정리
+    for i in range(1, len(placed)):
+        placed[i] = max(placed[i], placed[i - 1] + NODE_GAP)
+    return placed
+
+
+def force_layout(node_ids: List[Hashable], edges: List[Tuple[Hashable, Hashable]],
+                 iterations: int = FORCE_ITERATIONS, spacing: float = FORCE_SPACING) -> Dict[Hashable, Position]:
+    """Fruchterman-Reingold 힘 기반 배치 (numpy 벡터화, 원형 초기 배치로 결과 결정적)"""
+    count = len(node_ids)
+    if count == 0:
+        return {}
+    if count == 1:
+        return {node_ids[0]: {"x": 0.0, "y": 0.0}}
+
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    adjacency = np.zeros((count, count))
+    for source, target in edges:
+        if source in index and target in index and source != target:
+            adjacency[index[source], index[target]] = adjacency[index[target], index[source]] = 1.0
+
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    radius = spacing * count / (2 * np.pi) + spacing
+    position = np.column_stack([np.cos(angles), np.sin(angles)]) * radius
+
+    temperature = radius / 2
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        delta = position[:, None, :] - position[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+        # 척력 k²/d (가까운 쌍) - 인력 d²/k (연결된 쌍)
+        repulsion = np.where(distance < FORCE_REPULSION_RANGE, spacing ** 2 / distance, 0.0)
+        force = repulsion - adjacency * distance ** 2 / spacing
+        np.fill_diagonal(force, 0.0)
+        displacement = (delta / distance[..., None] * force[..., None]).sum(axis=1)
+        displacement -= position * FORCE_GRAVITY
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 0.01)
+        position += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature = max(temperature - cooling, 1.0)
+
+    position -= position.mean(axis=0)
+    return {
+        node_id: {"x": round(float(position[i, 0]), 1), "y": round(float(position[i, 1]), 1)}
+        for node_id, i in index.items()
+    }
+
+
+def layout_visualization(visualization: Dict[str, Any]) -> Dict[str, Any]:
+    """React Flow/vis.js 시각화에 서버 측 좌표 지정 (LLM은 좌표를 만들지 않음)
+
+    - flow: 계층형 배치 -> node["position"]
+    - network: hierarchy 또는 계층 옵션이면 계층형, 나머지는 힘 기반 -> node["x"], node["y"]
+      (좌표를 그대로 쓰도록 vis.js physics/hierarchical 비활성화)
+    """
+    viz_type = visualization.get("type")
+    data = visualization.get("data")
+    if viz_type not in ("flow", "network") or not isinstance(data, dict) or not data.get("nodes"):
+        return visualization
+
+    nodes = data["nodes"]
+    options = visualization.get("options") if isinstance(visualization.get("options"), dict) else {}
+
+    if viz_type == "flow":
+        edges = [(edge["source"], edge["target"]) for edge in data.get("edges", [])]
+        positions = layered_layout([node["id"] for node in nodes], edges, options.get("direction", "LR"))
+        for node in nodes:
+            node["position"] = positions[node["id"]]
+    else:
+        edges = [(edge["from"], edge["to"]) for edge in data.get("edges", [])]
+        node_ids = [node["id"] for node in nodes]
+        hierarchical = (options.get("layout") or {}).get("hierarchical") if isinstance(options.get("layout"), dict) else None
+        if visualization.get("network_type") == "hierarchy" or (isinstance(hierarchical, dict) and hierarchical.get("enabled")):
+            direction = hierarchical.get("direction", "UD") if isinstance(hierarchical, dict) else "UD"
+            positions = layered_layout(node_ids, edges, direction)
+        else:
+            positions = force_layout(node_ids, edges)
+        for node in nodes:
+            node["x"], node["y"] = positions[node["id"]]["x"], positions[node["id"]]["y"]
+        options = {
+            **options,
+            "layout": {"hierarchical": {"enabled": False}},
+            "physics": {"enabled": False}
+        }
+
+    visualization["options"] = options
+    return visualization
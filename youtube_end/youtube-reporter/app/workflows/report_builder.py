@@ -1,6 +1,5 @@
 # app/agents/report_agent.py
 import os
-import json
 import boto3
 from typing import Dict, List, Any
 from langchain_aws import ChatBedrock
@@ -8,6 +7,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from app.core.config import settings
 from app.services.state_manager import state_manager
+from app.services.llm_json import parse_json_stream
 import logging
 
 logger = logging.getLogger(__name__)
@@ -86,38 +86,34 @@ class ReportAgent(Runnable):
 4. 너무 짧거나 긴 섹션은 피합니다 (이상적: 100-300자)
 
 **응답 형식 (JSON):**
-{
+{{
   "sections": [
-    {
+    {{
       "id": "section_1",
       "title": "섹션 제목",
       "type": "text",
       "content": "섹션 내용",
       "level": 1,
       "keywords": ["키워드1", "키워드2"]
-    }
+    }}
   ]
-}
+}}
 
 JSON만 출력하세요."""),
             ("human", "{summary}")
         ])
 
         try:
-            response = self.llm.invoke(prompt.format_messages(summary=summary))
-            content = response.content.strip()
-
-            # JSON 추출
-            start_idx = content.find('{')
-            end_idx = content.rfind('}')
-
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx + 1]
-                result = json.loads(json_str)
-                return result.get('sections', [])
-            else:
-                # 폴백: 단락 기반 섹션 생성
-                return self._fallback_sectioning(summary)
+            # 스트리밍 증분 파싱 - 토큰 한도로 잘려도 완결된 섹션까지는 사용
+            result = parse_json_stream(self.llm.stream(prompt.format_messages(summary=summary)), expect=dict)
+            sections = [
+                section for section in (result or {}).get('sections', [])
+                if isinstance(section, dict) and section.get('content')
+            ]
+            if sections:
+                return sections
+            # 폴백: 단락 기반 섹션 생성
+            return self._fallback_sectioning(summary)
 
         except Exception as e:
             logger.error(f"섹션 구조화 오류: {e}")
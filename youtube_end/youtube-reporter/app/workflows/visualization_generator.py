@@ -1,6 +1,5 @@
 # app/workflows/visualization_generator.py
 import os
-import json
 import boto3
 from typing import Dict, List, Any, Optional
 from langchain_aws import ChatBedrock
@@ -8,6 +7,9 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from app.core.config import settings
 from app.services.state_manager import state_manager
+from app.services.llm_json import parse_json_stream
+from .visualization_validator import visualization_validator, VisualizationValidationError
+from .graph_layout import layout_visualization
 import logging
 
 logger = logging.getLogger(__name__)
@@ -132,18 +134,9 @@ JSON만 출력하세요."""),
         ])
 
         try:
-            response = self.llm.invoke(prompt.format_messages(summary=summary))
-            content = response.content.strip()
-
-            # JSON 추출
-            start_idx = content.find('{')
-            end_idx = content.rfind('}')
-
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx + 1]
-                return json.loads(json_str)
-            else:
-                return {"error": "JSON 파싱 실패"}
+            # 스트리밍 증분 파싱 - JSON이 닫히면 바로 중단, 잘린 출력은 보정
+            context = parse_json_stream(self.llm.stream(prompt.format_messages(summary=summary)), expect=dict)
+            return context if context is not None else {"error": "JSON 파싱 실패"}
 
         except Exception as e:
             logger.error(f"컨텍스트 분석 오류: {e}")
@@ -207,14 +200,17 @@ JSON만 출력하세요."""),
 - 노드 속성: id, label, title, color, shape
 - 연결 속성: from, to, label, arrows, color
 - 그룹화: group 속성 사용
+- 계층 구조면 options.layout.hierarchical.enabled를 true로, 아니면 false로 지정
 
 **플로우 차트 작성 규칙 (React Flow):**
 - nodes: 노드 배열 [노드1, 노드2, ...]
 - edges: 연결 배열 [연결1, 연결2, ...]
-- 노드 속성: id, type, position, data
-- 연결 속성: id, source, target, type, label
+- 노드 속성: id, type, data
+- 연결 속성: source, target, type, label
 - 노드 타입: default, input, output, custom
 
+**좌표 규칙:** 노드 좌표(position, x, y)와 physics 설정은 서버가 자동 배치하므로 작성하지 마세요.
+
 **응답 형식 (반드시 다음 중 하나):**
 
 **옵션 1 - 차트:**
@@ -259,8 +255,7 @@ JSON만 출력하세요."""),
     ]
   }},
   "options": {{
-    "layout": {{ "hierarchical": {{ "enabled": true, "direction": "LR" }} }},
-    "physics": {{ "enabled": true }}
+    "layout": {{ "hierarchical": {{ "enabled": true, "direction": "LR" }} }}
   }},
   "insight": "이 네트워크 다이어그램이 보여주는 핵심 관계"
 }}
@@ -273,13 +268,13 @@ JSON만 출력하세요."""),
   "flow_type": "flowchart|workflow|mindmap",
   "data": {{
     "nodes": [
-      {{ "id": "1", "type": "input", "position": {{ "x": 0, "y": 0 }}, "data": {{ "label": "시작" }} }},
-      {{ "id": "2", "position": {{ "x": 100, "y": 100 }}, "data": {{ "label": "과정" }} }},
-      {{ "id": "3", "type": "output", "position": {{ "x": 200, "y": 200 }}, "data": {{ "label": "완료" }} }}
+      {{ "id": "1", "type": "input", "data": {{ "label": "시작" }} }},
+      {{ "id": "2", "data": {{ "label": "과정" }} }},
+      {{ "id": "3", "type": "output", "data": {{ "label": "완료" }} }}
     ],
     "edges": [
-      {{ "id": "e1-2", "source": "1", "target": "2", "label": "연결 1" }},
-      {{ "id": "e2-3", "source": "2", "target": "3", "label": "연결 2" }}
+      {{ "source": "1", "target": "2", "label": "연결 1" }},
+      {{ "source": "2", "target": "3", "label": "연결 2" }}
     ]
   }},
   "options": {{
@@ -351,30 +346,19 @@ JSON만 출력하세요."""),
                 key_elements=', '.join(opportunity.get('key_elements', []))
             )
 
-            response = self.llm.invoke(formatted_prompt)
-            content = response.content.strip()
-
-            # JSON 추출
-            start_idx = content.find('{')
-            end_idx = content.rfind('}')
-
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx + 1]
-                try:
-                    result = json.loads(json_str)
-                    # 시각화 데이터 후처리
-                    viz_type = result.get('type')
-                    if viz_type in ['network', 'flow', 'd3'] and 'data' in result:
-                        result['data'] = self._validate_visualization_data(result['data'], viz_type)
-                    return result
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON 파싱 오류: {e}")
-                    logger.error(f"파싱 시도한 JSON: {json_str[:500]}...")
-                    return self._create_fallback_visualization()
-            else:
-                logger.error("JSON 블록을 찾을 수 없음")
+            result = parse_json_stream(self.llm.stream(formatted_prompt), expect=dict)
+            if result is None:
+                logger.error("시각화 응답에서 JSON을 추출할 수 없음")
                 return self._create_fallback_visualization()
 
+            # 시각화 데이터 검증 + 로컬 보정 (복구 불가면 자리표시 데이터 대신 해당 시각화 생략)
+            try:
+                result = visualization_validator.repair(result)
+            except VisualizationValidationError as e:
+                return {"error": str(e)}
+            # flow/network 노드 좌표는 서버에서 배치
+            return layout_visualization(result)
+
         except Exception as e:
             logger.error(f"시각화 생성 오류: {e}")
             return self._create_fallback_visualization()
@@ -403,86 +387,6 @@ JSON만 출력하세요."""),
             "insight": "시각화 생성 중 오류가 발생하여 기본 차트를 표시합니다."
         }
 
-    def _validate_visualization_data(self, data: Dict[str, Any], viz_type: str) -> Dict[str, Any]:
-        """시각화 데이터 검증 및 수정"""
-        try:
-            if viz_type == 'network':
-                # vis.js 네트워크 데이터 검증
-                if 'nodes' not in data or not data['nodes']:
-                    data['nodes'] = [
-                        {"id": 1, "label": "노드1", "color": "#667eea"},
-                        {"id": 2, "label": "노드2", "color": "#f093fb"}
-                    ]
-                if 'edges' not in data or not data['edges']:
-                    data['edges'] = [{"from": 1, "to": 2, "label": "연결"}]
-                
-                # 노드 ID 확인
-                for node in data['nodes']:
-                    if 'id' not in node:
-                        node['id'] = hash(str(node)) % 10000
-                
-                logger.info(f"✅ 네트워크 데이터 검증 완료: {len(data['nodes'])} 노드, {len(data['edges'])} 연결")
-                
-            elif viz_type == 'flow':
-                # React Flow 데이터 검증
-                if 'nodes' not in data or not data['nodes']:
-                    data['nodes'] = [
-                        {"id": "1", "type": "input", "position": {"x": 0, "y": 0}, "data": {"label": "시작"}},
-                        {"id": "2", "position": {"x": 100, "y": 100}, "data": {"label": "과정"}},
-                        {"id": "3", "type": "output", "position": {"x": 200, "y": 200}, "data": {"label": "완료"}}
-                    ]
-                if 'edges' not in data or not data['edges']:
-                    data['edges'] = [
-                        {"id": "e1-2", "source": "1", "target": "2"},
-                        {"id": "e2-3", "source": "2", "target": "3"}
-                    ]
-                
-                # 노드 위치 확인
-                for i, node in enumerate(data['nodes']):
-                    if 'position' not in node:
-                        node['position'] = {"x": i * 100, "y": i * 100}
-                    if 'data' not in node or 'label' not in node['data']:
-                        node['data'] = {"label": f"노드 {i+1}"}
-                
-                logger.info(f"✅ 플로우 차트 데이터 검증 완료: {len(data['nodes'])} 노드, {len(data['edges'])} 연결")
-                
-            elif viz_type == 'd3':
-                # D3.js 데이터 검증
-                if 'nodes' not in data or not data['nodes']:
-                    data['nodes'] = [
-                        {"id": "node1", "name": "노드1", "value": 10},
-                        {"id": "node2", "name": "노드2", "value": 20}
-                    ]
-                if 'links' not in data and 'edges' in data:
-                    data['links'] = data['edges']
-                elif 'links' not in data:
-                    data['links'] = [{"source": "node1", "target": "node2", "value": 5}]
-                
-                logger.info(f"✅ D3 데이터 검증 완료: {len(data['nodes'])} 노드, {len(data['links'])} 연결")
-            
-            return data
-            
-        except Exception as e:
-            logger.error(f"시각화 데이터 검증 실패: {e}")
-            # 기본 데이터 반환
-            if viz_type == 'network':
-                return {
-                    "nodes": [{"id": 1, "label": "기본 노드"}],
-                    "edges": []
-                }
-            elif viz_type == 'flow':
-                return {
-                    "nodes": [{"id": "1", "position": {"x": 0, "y": 0}, "data": {"label": "기본 노드"}}],
-                    "edges": []
-                }
-            elif viz_type == 'd3':
-                return {
-                    "nodes": [{"id": "node1", "name": "기본 노드", "value": 10}],
-                    "links": []
-                }
-            else:
-                return {}
-
     def _find_best_position(self, summary: str, opportunity: Dict[str, Any]) -> Dict[str, Any]:
         """요약 내에서 시각화를 배치할 최적의 위치 찾기"""
         content = opportunity.get('content', '')
@@ -520,37 +424,9 @@ JSON만 출력하세요."""),
         }
 
     def _standardize_visualization_data(self, visualization: Dict[str, Any]) -> Dict[str, Any]:
-        """다양한 시각화 형식을 표준화"""
+        """다양한 시각화 형식을 표준화 (diagram은 visualization_validator에서 network로 변환됨)"""
         viz_type = visualization.get('type')
         
-        # diagram 타입을 network 타입으로 변환
-        if viz_type == 'diagram':
-            logger.info("Mermaid 다이어그램을 Network 다이어그램으로 변환합니다")
-            # 기본 네트워크 데이터 생성
-            nodes = [
-                {"id": 1, "label": "노드 1", "color": "#667eea"},
-                {"id": 2, "label": "노드 2", "color": "#f093fb"},
-                {"id": 3, "label": "노드 3", "color": "#4facfe"}
-            ]
-            edges = [
-                {"from": 1, "to": 2, "label": "연결 1-2"},
-                {"from": 2, "to": 3, "label": "연결 2-3"}
-            ]
-            
-            return {
-                "type": "network",
-                "library": "visjs",
-                "network_type": "relationship",
-                "data": {
-                    "nodes": nodes,
-                    "edges": edges
-                },
-                "options": {
-                    "layout": {"hierarchical": {"enabled": True, "direction": "LR"}},
-                    "physics": {"enabled": True}
-                }
-            }
-
         if viz_type == 'chart':
             return {
                 "type": "chart",
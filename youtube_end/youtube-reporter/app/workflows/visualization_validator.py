@@ -0,0 +1,577 @@
+# app/workflows/visualization_validator.py
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHART_TYPES = {"bar", "line", "pie", "doughnut", "radar", "scatter"}
+PER_SLICE_COLOR_CHARTS = {"pie", "doughnut"}
+PALETTE = ["#667eea", "#f093fb", "#4facfe", "#43e97b", "#fa709a", "#fee140", "#30cfd0", "#a18cd1"]
+
+# LLM이 세부 유형을 type에 넣는 경우 -> (시각화 타입, 세부 유형 필드)
+TYPE_ALIASES = {
+    "flowchart": ("flow", "flow_type"),
+    "workflow": ("flow", "flow_type"),
+    "mindmap": ("flow", "flow_type"),
+    "timeline": ("d3", "visualization_type"),
+    "treemap": ("d3", "visualization_type"),
+    "sankey": ("d3", "visualization_type"),
+    "force": ("d3", "visualization_type"),
+    "relationship": ("network", "network_type"),
+    "hierarchy": ("network", "network_type"),
+    "cluster": ("network", "network_type"),
+}
+LIBRARY_TYPES = {"chartjs": "chart", "visjs": "network", "reactflow": "flow", "d3js": "d3"}
+
+# 그래프 형식별 필드 이름: (엣지 목록 키, 출발 키, 도착 키)
+GRAPH_FIELDS = {
+    "network": ("edges", "from", "to"),
+    "flow": ("edges", "source", "target"),
+    "d3": ("links", "source", "target"),
+}
+
+# Mermaid flowchart 한 줄: A[라벨] -->|연결| B(라벨) --> C
+MERMAID_HEADER_RE = re.compile(r'^\s*(?:graph|flowchart)\s+(TD|TB|BT|LR|RL)\b', re.IGNORECASE)
+MERMAID_ARROW_RE = re.compile(r'\s*(?:--\s*([^\-|>][^|]*?)\s*-->|(?:-\.->|-->|---|==>)\s*(?:\|([^|]*)\|)?)\s*')
+MERMAID_NODE_RE = re.compile(r'^\s*([\w-]+)\s*(?:[\[\(\{>]+\s*"?(.*?)"?\s*[\]\)\}]+)?\s*;?\s*$')
+# 노드/엣지가 아닌 줄 - 키워드는 단어 단위로만 일치 (endpoint, end_state, subgraph_a 같은 노드 ID는 유지)
+MERMAID_SKIP_RE = re.compile(
+    r'^(?:%%|(?:style|classDef|class|linkStyle|click)\s|subgraph\b(?!-)|end\s*$|direction\s+(?:TB|TD|BT|LR|RL)\s*$)'
+)
+
+
+class VisualizationValidationError(ValueError):
+    """로컬 보정으로 복구할 수 없는 시각화 데이터"""
+
+
+class VisualizationValidator:
+    """LLM이 만든 시각화 JSON(chart/network/flow/d3/table)을 스키마 기준으로 검증하고 제자리에서 보정
+
+    끊어진 엣지 참조, 중복 ID, 레이블/데이터 길이 불일치 등
+    기계적으로 고칠 수 있는 오류는 LLM 재호출 없이 여기서 수정한다.
+    노드 좌표는 검증하지 않는다 (graph_layout.layout_visualization이 서버에서 계산).
+    핵심 데이터가 아예 없어 복구할 수 없을 때만 VisualizationValidationError를 던진다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = Counter()      # validated / repaired / rejected
+        self._repairs = Counter()    # 보정 종류별 누적 횟수
+
+    def repair(self, visualization: Dict[str, Any]) -> Dict[str, Any]:
+        """검증 + 보정된 시각화 반환 (diagram 타입은 원래 내용을 살려 network로 변환)"""
+        repairs = Counter()
+        try:
+            result = self._repair(visualization, repairs)
+        except VisualizationValidationError as e:
+            self._record(repairs, rejected=True)
+            logger.warning(f"⚠️ 시각화 데이터 보정 불가: {e}")
+            raise
+
+        self._record(repairs)
+        if repairs:
+            logger.info(f"🔧 시각화 데이터 로컬 보정 ({result['type']}): {dict(repairs)}")
+        return result
+
+    def stats(self) -> dict:
+        """보정 지표 (워커 프로세스 단위)"""
+        with self._lock:
+            stats = dict(self._stats)
+            repairs = dict(self._repairs)
+        validated = stats.get("validated", 0)
+        repaired = stats.get("repaired", 0)
+        rejected = stats.get("rejected", 0)
+        return {
+            "validated": validated,
+            "clean": validated - repaired - rejected,
+            "repaired": repaired,
+            "rejected": rejected,
+            "repair_rate": repaired / validated if validated else 0.0,
+            "repairs": repairs
+        }
+
+    def _record(self, repairs: Counter, rejected: bool = False):
+        with self._lock:
+            self._stats["validated"] += 1
+            if rejected:
+                self._stats["rejected"] += 1
+            elif repairs:
+                self._stats["repaired"] += 1
+            self._repairs.update(repairs)
+
+    def _repair(self, visualization: Any, repairs: Counter) -> Dict[str, Any]:
+        if not isinstance(visualization, dict):
+            raise VisualizationValidationError("시각화 결과가 JSON 객체가 아닙니다")
+        viz = dict(visualization)
+        viz_type = self._resolve_type(viz, repairs)
+
+        if viz_type == "diagram":
+            viz = self._diagram_to_network(viz, repairs)
+            viz_type = "network"
+
+        if viz_type == "chart":
+            return self._repair_chart(viz, repairs)
+        if viz_type == "table":
+            return self._repair_table(viz, repairs)
+        return self._repair_graph(viz, viz_type, repairs)
+
+    # --- 타입 판별 ----------------------------------------------------------
+
+    def _resolve_type(self, viz: Dict[str, Any], repairs: Counter) -> str:
+        """type 필드 정규화 (세부 유형/라이브러리 이름/데이터 모양으로 추론)"""
+        viz_type = str(viz.get("type") or "").strip().lower()
+        if viz_type in ("chart", "network", "flow", "d3", "table", "diagram"):
+            viz["type"] = viz_type
+            return viz_type
+
+        if viz_type in TYPE_ALIASES:
+            resolved, subtype_field = TYPE_ALIASES[viz_type]
+            viz.setdefault(subtype_field, viz_type)
+        elif str(viz.get("library") or "").lower() in LIBRARY_TYPES:
+            resolved = LIBRARY_TYPES[str(viz["library"]).lower()]
+        else:
+            resolved = self._infer_type_from_shape(viz)
+
+        if not resolved:
+            raise VisualizationValidationError(f"알 수 없는 시각화 타입: {viz.get('type')!r}")
+        viz["type"] = resolved
+        repairs["type"] += 1
+        return resolved
+
+    @staticmethod
+    def _infer_type_from_shape(viz: Dict[str, Any]) -> Optional[str]:
+        data = viz.get("data") if isinstance(viz.get("data"), dict) else viz
+        if "rows" in data or "rows" in viz:
+            return "table"
+        if "datasets" in data:
+            return "chart"
+        if "links" in data:
+            return "d3"
+        edges = data.get("edges")
+        if isinstance(edges, list) and edges and isinstance(edges[0], dict):
+            return "flow" if "source" in edges[0] else "network"
+        if "nodes" in data:
+            return "network"
+        return None
+
+    # --- 차트 ---------------------------------------------------------------
+
+    def _repair_chart(self, viz: Dict[str, Any], repairs: Counter) -> Dict[str, Any]:
+        chart_type = str(viz.get("chart_type") or "").strip().lower()
+        if chart_type not in CHART_TYPES:
+            chart_type = "bar"
+            repairs["chart_type"] += 1
+        viz["chart_type"] = chart_type
+
+        data = viz.get("data")
+        if not isinstance(data, dict):
+            raise VisualizationValidationError("차트 data가 없습니다")
+        data = dict(data)
+
+        raw_datasets = data.get("datasets")
+        if isinstance(raw_datasets, dict):
+            raw_datasets = [raw_datasets]
+            repairs["payload_shape"] += 1
+        if not isinstance(raw_datasets, list):
+            raise VisualizationValidationError("차트 datasets가 없습니다")
+
+        datasets = []
+        for i, dataset in enumerate(raw_datasets):
+            if not isinstance(dataset, dict) or not isinstance(dataset.get("data"), list):
+                repairs["invalid_dataset"] += 1
+                continue
+            dataset = dict(dataset)
+            if chart_type == "scatter":
+                dataset["data"] = self._scatter_points(dataset["data"], repairs)
+            else:
+                dataset["data"] = [self._chart_value(value, repairs) for value in dataset["data"]]
+            if not any(value is not None for value in dataset["data"]):
+                repairs["invalid_dataset"] += 1
+                continue
+            if not dataset.get("label"):
+                dataset["label"] = f"데이터 {i + 1}"
+                repairs["dataset_label"] += 1
+            datasets.append(dataset)
+        if not datasets:
+            raise VisualizationValidationError("숫자 데이터가 있는 dataset이 없습니다")
+
+        if chart_type != "scatter":
+            labels = data.get("labels")
+            if not isinstance(labels, list):
+                labels = []
+            labels = [str(label) for label in labels]
+            length = max([len(labels)] + [len(dataset["data"]) for dataset in datasets])
+            if len(labels) < length:
+                labels += [f"항목 {i + 1}" for i in range(len(labels), length)]
+                repairs["label_length"] += 1
+            for dataset in datasets:
+                if len(dataset["data"]) < length:
+                    dataset["data"] += [None] * (length - len(dataset["data"]))
+                    repairs["data_length"] += 1
+            data["labels"] = labels
+            self._fill_colors(chart_type, datasets, length, repairs)
+
+        data["datasets"] = datasets
+        viz["data"] = data
+        return viz
+
+    @staticmethod
+    def _chart_value(value: Any, repairs: Counter) -> Optional[float]:
+        number = _to_number(value)
+        if number is None and value is not None:
+            repairs["non_numeric_value"] += 1
+        elif number is not None and not isinstance(value, (int, float)):
+            repairs["numeric_string"] += 1
+        return number
+
+    @staticmethod
+    def _scatter_points(points: List[Any], repairs: Counter) -> List[Dict[str, float]]:
+        result = []
+        for point in points:
+            if isinstance(point, dict):
+                x, y = _to_number(point.get("x")), _to_number(point.get("y"))
+            elif isinstance(point, (list, tuple)) and len(point) >= 2:
+                x, y = _to_number(point[0]), _to_number(point[1])
+                repairs["scatter_point"] += 1
+            else:
+                x = y = None
+            if x is None or y is None:
+                repairs["non_numeric_value"] += 1
+                continue
+            result.append({"x": x, "y": y})
+        return result
+
+    @staticmethod
+    def _fill_colors(chart_type: str, datasets: List[Dict[str, Any]], length: int, repairs: Counter):
+        """파이/도넛은 조각별 색 목록 길이를 맞추고, 나머지는 dataset별 단색 지정"""
+        for i, dataset in enumerate(datasets):
+            colors = dataset.get("backgroundColor")
+            if chart_type in PER_SLICE_COLOR_CHARTS:
+                colors = colors if isinstance(colors, list) else ([colors] if colors else [])
+                if len(colors) < length:
+                    colors = colors + [PALETTE[j % len(PALETTE)] for j in range(len(colors), length)]
+                    dataset["backgroundColor"] = colors
+                    repairs["colors"] += 1
+            elif not colors:
+                dataset["backgroundColor"] = PALETTE[i % len(PALETTE)]
+                repairs["colors"] += 1
+
+    # --- 그래프 (vis.js / React Flow / D3) -------------------------------------
+
+    def _repair_graph(self, viz: Dict[str, Any], viz_type: str, repairs: Counter) -> Dict[str, Any]:
+        edge_key, source_key, target_key = GRAPH_FIELDS[viz_type]
+
+        data = viz.get("data")
+        if not isinstance(data, dict):
+            if "nodes" not in viz:
+                raise VisualizationValidationError(f"{viz_type} data가 없습니다")
+            # 노드/엣지를 최상위에 둔 응답
+            data = {"nodes": viz.pop("nodes"), edge_key: viz.pop("edges", None) or viz.pop("links", None) or []}
+            repairs["payload_shape"] += 1
+        data = dict(data)
+
+        nodes, id_map, label_map = self._repair_nodes(data.get("nodes"), viz_type, repairs)
+
+        raw_edges = data.get(edge_key)
+        for alias in ("edges", "links"):
+            if raw_edges is None and alias != edge_key and alias in data:
+                raw_edges = data.pop(alias)
+                repairs["edge_keys"] += 1
+        edges = self._repair_edges(raw_edges or [], viz_type, nodes, id_map, label_map, repairs)
+
+        data["nodes"] = nodes
+        data[edge_key] = edges
+        viz["data"] = data
+        return viz
+
+    def _repair_nodes(self, raw_nodes: Any, viz_type: str, repairs: Counter) -> Tuple[list, dict, dict]:
+        """노드 ID 보장/중복 제거 + 라벨 필드 정규화
+
+        반환: (노드 목록, str(ID) -> ID, 소문자 라벨 -> ID)
+        """
+        if not isinstance(raw_nodes, list) or not raw_nodes:
+            raise VisualizationValidationError(f"{viz_type} 노드가 없습니다")
+
+        nodes, id_map, label_map = [], {}, {}
+        for i, node in enumerate(raw_nodes):
+            if isinstance(node, (str, int, float)):
+                node = {"id": node, "label": str(node)}
+                repairs["node_shape"] += 1
+            elif not isinstance(node, dict):
+                repairs["invalid_node"] += 1
+                continue
+            node = dict(node)
+            label = _node_label(node)
+
+            node_id = node.get("id")
+            if node_id is None or node_id == "":
+                node_id = label or f"n{i + 1}"
+                repairs["missing_id"] += 1
+            if viz_type == "flow" and not isinstance(node_id, str):
+                node_id = str(node_id)  # React Flow는 문자열 ID만 허용
+
+            key = str(node_id)
+            if key in id_map:
+                existing = next(n for n in nodes if str(n["id"]) == key)
+                if _node_label(existing) == label:
+                    # 같은 노드가 두 번 나온 경우 - 빠진 속성만 합침
+                    for field, value in node.items():
+                        existing.setdefault(field, value)
+                    repairs["duplicate_node"] += 1
+                    continue
+                suffix = 2
+                while f"{key}_{suffix}" in id_map:
+                    suffix += 1
+                node_id = key = f"{key}_{suffix}"
+                repairs["duplicate_id"] += 1
+            node["id"] = node_id
+
+            if not label:
+                label = key
+                repairs["missing_label"] += 1
+            if viz_type == "flow":
+                node_data = node.get("data") if isinstance(node.get("data"), dict) else {}
+                node["data"] = {**node_data, "label": node_data.get("label") or label}
+                node.pop("label", None)
+            elif viz_type == "network":
+                node["label"] = label
+            else:
+                node["name"] = label
+                if "value" in node:
+                    node["value"] = _to_number(node["value"]) or 0
+
+            id_map[key] = node_id
+            label_map.setdefault(label.strip().lower(), node_id)
+            nodes.append(node)
+
+        if not nodes:
+            raise VisualizationValidationError(f"{viz_type} 노드가 없습니다")
+        return nodes, id_map, label_map
+
+    def _repair_edges(self, raw_edges: Any, viz_type: str, nodes: list, id_map: dict,
+                      label_map: dict, repairs: Counter) -> list:
+        """엣지 키 정규화, 라벨/인덱스 참조를 노드 ID로 변환, 끊어진 참조와 중복 제거"""
+        edge_key, source_key, target_key = GRAPH_FIELDS[viz_type]
+        if not isinstance(raw_edges, list):
+            repairs["invalid_edge"] += 1
+            return []
+
+        def resolve(ref):
+            if ref is None:
+                return None
+            if isinstance(ref, dict):  # D3가 참조를 노드 객체로 바꾼 뒤 직렬화된 경우
+                ref = ref.get("id")
+            if str(ref) in id_map:
+                return id_map[str(ref)]
+            if isinstance(ref, str) and ref.strip().lower() in label_map:
+                repairs["edge_label_ref"] += 1
+                return label_map[ref.strip().lower()]
+            if viz_type == "d3" and isinstance(ref, int) and 0 <= ref < len(nodes):
+                repairs["edge_index_ref"] += 1
+                return nodes[ref]["id"]
+            return None
+
+        edges, seen, edge_ids = [], set(), set()
+        for edge in raw_edges:
+            if not isinstance(edge, dict):
+                repairs["invalid_edge"] += 1
+                continue
+            edge = dict(edge)
+            raw_source = edge.get(source_key, edge.get("source", edge.get("from")))
+            raw_target = edge.get(target_key, edge.get("target", edge.get("to")))
+            for alias in ("from", "to", "source", "target"):
+                if alias not in (source_key, target_key) and alias in edge:
+                    edge.pop(alias)
+                    repairs["edge_keys"] += 1
+
+            source, target = resolve(raw_source), resolve(raw_target)
+            if source is None or target is None:
+                repairs["dangling_edge"] += 1
+                continue
+            signature = (str(source), str(target), str(edge.get("label", "")))
+            if signature in seen:
+                repairs["duplicate_edge"] += 1
+                continue
+            seen.add(signature)
+            edge[source_key], edge[target_key] = source, target
+
+            if viz_type == "flow":
+                edge_id = str(edge.get("id") or f"e{source}-{target}")
+                if edge_id in edge_ids:
+                    suffix = 2
+                    while f"{edge_id}_{suffix}" in edge_ids:
+                        suffix += 1
+                    edge_id = f"{edge_id}_{suffix}"
+                    repairs["duplicate_edge_id"] += 1
+                elif "id" not in edge:
+                    repairs["missing_edge_id"] += 1
+                edge["id"] = edge_id
+                edge_ids.add(edge_id)
+            elif viz_type == "d3" and "value" in edge:
+                edge["value"] = _to_number(edge["value"]) or 1
+            edges.append(edge)
+        return edges
+
+    # --- Mermaid/diagram -> vis.js network -----------------------------------
+
+    def _diagram_to_network(self, viz: Dict[str, Any], repairs: Counter) -> Dict[str, Any]:
+        """diagram 응답을 network로 변환 (노드/엣지가 있으면 그대로, Mermaid 코드면 파싱)"""
+        data = viz.get("data")
+        direction = "LR"
+        if isinstance(data, dict) and "nodes" in data:
+            network_data = data
+        else:
+            code = next(
+                (value for value in (data, viz.get("code"), viz.get("mermaid"), viz.get("diagram"))
+                 if isinstance(value, str) and value.strip()),
+                None
+            )
+            if isinstance(data, dict) and code is None:
+                code = next((value for value in (data.get("code"), data.get("mermaid")) if isinstance(value, str)), None)
+            if not code:
+                raise VisualizationValidationError("diagram에 노드나 Mermaid 코드가 없습니다")
+            network_data, direction = parse_mermaid(code)
+            if not network_data["nodes"]:
+                raise VisualizationValidationError("Mermaid 코드에서 노드를 찾지 못했습니다")
+
+        repairs["diagram_converted"] += 1
+        network = {key: value for key, value in viz.items() if key not in ("code", "mermaid", "diagram")}
+        network.update({
+            "type": "network",
+            "library": "visjs",
+            "network_type": viz.get("network_type", "relationship"),
+            "data": network_data,
+        })
+        if not isinstance(network.get("options"), dict):
+            network["options"] = {
+                "layout": {"hierarchical": {"enabled": True, "direction": direction, "sortMethod": "directed"}},
+                "physics": {"enabled": False}
+            }
+        return network
+
+    # --- 테이블 -------------------------------------------------------------
+
+    def _repair_table(self, viz: Dict[str, Any], repairs: Counter) -> Dict[str, Any]:
+        if "rows" not in viz and isinstance(viz.get("data"), dict):
+            viz.update({key: viz["data"][key] for key in ("headers", "rows") if key in viz["data"]})
+            viz.pop("data")
+            repairs["payload_shape"] += 1
+
+        headers = viz.get("headers") if isinstance(viz.get("headers"), list) else []
+        raw_rows = viz.get("rows")
+        if not isinstance(raw_rows, list) or not raw_rows:
+            raise VisualizationValidationError("테이블 rows가 없습니다")
+
+        # 행이 객체 목록이면 헤더 순서대로 펼침
+        if all(isinstance(row, dict) for row in raw_rows):
+            headers = list(dict.fromkeys(headers + [key for row in raw_rows for key in row]))
+            raw_rows = [[row.get(header) for header in headers] for row in raw_rows]
+            repairs["row_shape"] += 1
+
+        rows = []
+        for row in raw_rows:
+            if isinstance(row, dict):
+                row = list(row.values())
+                repairs["row_shape"] += 1
+            elif not isinstance(row, list):
+                row = [row]
+                repairs["row_shape"] += 1
+            rows.append([_table_cell(cell) for cell in row])
+
+        width = max([len(headers)] + [len(row) for row in rows])
+        headers = [str(header) for header in headers]
+        if len(headers) < width:
+            headers += [f"열 {i + 1}" for i in range(len(headers), width)]
+            repairs["header_length"] += 1
+        for row in rows:
+            if len(row) < width:
+                row += [""] * (width - len(row))
+                repairs["row_length"] += 1
+
+        styling = viz.get("styling") if isinstance(viz.get("styling"), dict) else {}
+        highlight = styling.get("highlight_column")
+        if highlight is not None and not (isinstance(highlight, int) and 0 <= highlight < width):
+            styling = {key: value for key, value in styling.items() if key != "highlight_column"}
+            repairs["styling"] += 1
+
+        viz.update({"headers": headers, "rows": rows, "styling": styling})
+        return viz
+
+
+def parse_mermaid(code: str) -> Tuple[Dict[str, list], str]:
+    """Mermaid flowchart 코드 -> (vis.js nodes/edges, 방향)"""
+    direction = "LR"
+    nodes, edges, node_index = [], [], {}
+
+    def add_node(token: str) -> Optional[str]:
+        match = MERMAID_NODE_RE.match(token)
+        if not match:
+            return None
+        node_id, label = match.group(1), (match.group(2) or "").strip()
+        if node_id not in node_index:
+            node_index[node_id] = {"id": node_id, "label": label or node_id}
+            nodes.append(node_index[node_id])
+        elif label:
+            node_index[node_id]["label"] = label
+        return node_id
+
+    for line in code.replace(";", "\n").splitlines():
+        line = line.strip().strip("`")
+        if not line or line.lower() == "mermaid":
+            continue
+        header = MERMAID_HEADER_RE.match(line)
+        if header:
+            direction = {"TD": "UD", "TB": "UD", "BT": "DU"}.get(header.group(1).upper(), header.group(1).upper())
+            continue
+        if MERMAID_SKIP_RE.match(line):
+            continue
+
+        # re.split 결과: [노드, 라벨1, 라벨2, 노드, 라벨1, 라벨2, 노드, ...]
+        parts = MERMAID_ARROW_RE.split(line)
+        previous = add_node(parts[0])
+        for i in range(1, len(parts) - 2, 3):
+            label = (parts[i] or parts[i + 1] or "").strip()
+            current = add_node(parts[i + 2])
+            if previous is not None and current is not None:
+                edge = {"from": previous, "to": current, "arrows": "to"}
+                if label:
+                    edge["label"] = label
+                edges.append(edge)
+            previous = current
+    return {"nodes": nodes, "edges": edges}, direction
+
+
+def _node_label(node: Dict[str, Any]) -> str:
+    data = node.get("data") if isinstance(node.get("data"), dict) else {}
+    label = node.get("label") or data.get("label") or node.get("name") or node.get("title")
+    return str(label).strip() if label is not None else ""
+
+
+def _to_number(value: Any) -> Optional[float]:
+    """숫자 또는 '1,234', '45%', '$12.5' 같은 숫자 문자열 -> 숫자 (변환 불가면 None)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        match = re.search(r'-?\d+(?:\.\d+)?', value.replace(",", ""))
+        if match:
+            number = float(match.group())
+            return int(number) if number.is_integer() else number
+    return None
+
+
+def _table_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+visualization_validator = VisualizationValidator()
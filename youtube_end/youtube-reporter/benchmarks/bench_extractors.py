@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+문서 추출기 처리량 벤치마크
+
+형식별 합성 파일(PDF/DOCX/XLSX/CSV/TXT)을 만들어 extractor_registry에 등록된
+추출기의 처리량(MB/s)을 재고, 백엔드 라이브러리의 첫 import 비용(새 프로세스 기준)을 함께 출력한다.
+새 백엔드를 register한 뒤 이 스크립트로 기존 백엔드와 비교한다.
+
+실행: python -m benchmarks.bench_extractors [--scale 1] [--formats pdf,csv] [--repeat 3]
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.services.extractors import extractor_registry
+
+BACKEND_MODULES = {
+    ".pdf": "PyPDF2",
+    ".docx": "docx",
+    ".xlsx": "openpyxl",
+    ".csv": "pandas",
+    ".txt": None,
+}
+WORDS = ["분석", "보고서", "자막", "요약", "데이터", "report", "summary", "video", "chart", "insight"]
+SEED = 42
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def make_txt(path: str, scale: int, rng: random.Random):
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(20000 * scale):
+            f.write(_sentence(rng) + "\n")
+
+def make_csv(path: str, scale: int, rng: random.Random):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "category", "value", "note"])
+        for i in range(100000 * scale):
+            writer.writerow([i, rng.choice(WORDS), rng.random() * 1000, _sentence(rng, 4)])
+
+def make_xlsx(path: str, scale: int, rng: random.Random):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    sheet.append(["id", "category", "value", "note"])
+    for i in range(20000 * scale):
+        sheet.append([i, rng.choice(WORDS), rng.random() * 1000, _sentence(rng, 4)])
+    workbook.save(path)
+
+def make_docx(path: str, scale: int, rng: random.Random):
+    from docx import Document
+
+    doc = Document()
+    for _ in range(3000 * scale):
+        doc.add_paragraph(_sentence(rng, 20))
+    doc.save(path)
+
+def make_pdf(path: str, scale: int, rng: random.Random, lines_per_page: int = 50):
+    """외부 라이브러리 없이 텍스트 PDF 생성 (Helvetica, ASCII 텍스트)"""
+    pages = 100 * scale
+    ascii_words = [word for word in WORDS if word.isascii()]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    number = 4
+    for _ in range(pages):
+        lines = " ".join(
+            "(" + " ".join(rng.choice(ascii_words) for _ in range(10)) + ") '"
+            for _ in range(lines_per_page)
+        )
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {lines} ET".encode("ascii")
+        objects[number] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (number + 1)
+        )
+        objects[number + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        kids.append(number)
+        number += 2
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode("ascii"), pages
+    )
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = {}
+        for index in sorted(objects):
+            offsets[index] = f.tell()
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (index, objects[index]))
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for index in sorted(objects):
+            f.write(b"%010d 00000 n \n" % offsets[index])
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+GENERATORS = {
+    ".pdf": make_pdf,
+    ".docx": make_docx,
+    ".xlsx": make_xlsx,
+    ".csv": make_csv,
+    ".txt": make_txt,
+}
+
+def import_cost_ms(module: str) -> float:
+    """새 인터프리터에서 모듈 첫 import 시간 (워커 콜드 스타트 비용)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return float(result.stdout.strip()) if result.returncode == 0 else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 추출기 처리량 벤치마크")
+    parser.add_argument("--scale", type=int, default=1, help="합성 파일 크기 배수")
+    parser.add_argument("--formats", default=",".join(ext.lstrip(".") for ext in GENERATORS),
+                        help="측정할 형식 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(SEED)
+    print(f"{'형식':<6} {'추출기':<8} {'크기 MB':>8} {'중앙값 s':>9} {'MB/s':>8} {'import ms':>10}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in args.formats.split(","):
+            ext = f".{name.strip().lstrip('.')}"
+            path = os.path.join(temp_dir, f"sample{ext}")
+            try:
+                GENERATORS[ext](path, args.scale, rng)
+            except ImportError as e:
+                print(f"{ext:<6} 건너뜀 (합성 파일 생성 불가: {e})")
+                continue
+
+            extractor = extractor_registry.resolve(path)
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                extractor.extract(path)
+                timings.append(time.perf_counter() - start)
+
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            median = statistics.median(timings)
+            module = BACKEND_MODULES.get(ext)
+            import_ms = f"{import_cost_ms(module):>10.0f}" if module else f"{'-':>10}"
+            print(f"{ext:<6} {extractor.label:<8} {size_mb:>8.2f} {median:>9.3f} {size_mb / median:>8.1f} {import_ms}")
+
+if __name__ == "__main__":
+    main()
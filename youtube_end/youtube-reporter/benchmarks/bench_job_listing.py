@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+작업 목록 조회 벤치마크
+
+벤치마크 전용 테이블(bench_user_analysis_jobs)에 100만 행을 시드하고
+기존 방식(LIMIT 후 Python 필터, OFFSET 페이지네이션)과
+DB 필터 + 키셋 페이지네이션을 비교한다.
+
+실행: python -m benchmarks.bench_job_listing [--rows 1000000] [--keep]
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+TABLE = "bench_user_analysis_jobs"
+USERS = 1000
+JOB_TYPES = ("youtube", "document", "youtube_reporter")
+PAGE_SIZE = 50
+PAGES = 20
+REPEAT = 5
+
+def seed(conn, rows: int):
+    """벤치마크 테이블 생성 및 시드 (generate_series)"""
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            id UUID PRIMARY KEY,
+            user_id VARCHAR(255) NOT NULL,
+            job_type VARCHAR(50) NOT NULL,
+            status VARCHAR(20),
+            created_at TIMESTAMP
+        )
+    """))
+    conn.execute(text(f"""
+        INSERT INTO {TABLE} (id, user_id, job_type, status, created_at)
+        SELECT
+            md5(i::text)::uuid,
+            'user_' || (i % {USERS}),
+            (ARRAY{list(JOB_TYPES)})[1 + (i % {len(JOB_TYPES)})],
+            'completed',
+            now() - (i || ' seconds')::interval
+        FROM generate_series(1, :rows) AS i
+    """), {"rows": rows})
+
+def create_indexes(conn):
+    """새 복합 인덱스 생성"""
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (user_id, job_type, created_at DESC, id DESC)"))
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (user_id, created_at DESC, id DESC)"))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+def timed(conn, sql: str, params: dict) -> float:
+    start = time.perf_counter()
+    conn.execute(text(sql), params).fetchall()
+    return (time.perf_counter() - start) * 1000
+
+def bench_legacy(conn, user_id: str) -> float:
+    """기존: user_id 단일 인덱스 + LIMIT 50 후 Python 필터 (결과 누락 가능)"""
+    start = time.perf_counter()
+    rows = conn.execute(text(
+        f"SELECT id, job_type, created_at FROM {TABLE} WHERE user_id = :u "
+        f"ORDER BY created_at DESC LIMIT {PAGE_SIZE}"
+    ), {"u": user_id}).fetchall()
+    [r for r in rows if r.job_type == "youtube_reporter"]
+    return (time.perf_counter() - start) * 1000
+
+def bench_offset(conn, user_id: str) -> float:
+    """OFFSET 페이지네이션으로 PAGES 페이지 순회"""
+    total = 0.0
+    for page in range(PAGES):
+        total += timed(conn,
+            f"SELECT id, created_at FROM {TABLE} WHERE user_id = :u AND job_type = :t "
+            f"ORDER BY created_at DESC, id DESC LIMIT {PAGE_SIZE} OFFSET :o",
+            {"u": user_id, "t": "youtube_reporter", "o": page * PAGE_SIZE})
+    return total
+
+def bench_keyset(conn, user_id: str) -> float:
+    """키셋 페이지네이션으로 PAGES 페이지 순회"""
+    total = 0.0
+    cursor = None
+    for _ in range(PAGES):
+        params = {"u": user_id, "t": "youtube_reporter"}
+        where = "user_id = :u AND job_type = :t"
+        if cursor:
+            where += " AND (created_at, id) < (:c, :i)"
+            params.update({"c": cursor[0], "i": cursor[1]})
+        start = time.perf_counter()
+        rows = conn.execute(text(
+            f"SELECT id, created_at FROM {TABLE} WHERE {where} "
+            f"ORDER BY created_at DESC, id DESC LIMIT {PAGE_SIZE}"
+        ), params).fetchall()
+        total += (time.perf_counter() - start) * 1000
+        if not rows:
+            break
+        cursor = (rows[-1].created_at, rows[-1].id)
+    return total
+
+def report(name: str, samples: list):
+    print(f"{name:<40} median {statistics.median(samples):8.2f} ms  max {max(samples):8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 목록 조회 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keep", action="store_true", help="벤치마크 테이블 유지")
+    args = parser.parse_args()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        print(f"시드 중: {args.rows:,} 행")
+        seed(conn, args.rows)
+        conn.execute(text(f"CREATE INDEX ON {TABLE} (user_id)"))
+        conn.execute(text(f"ANALYZE {TABLE}"))
+
+        users = [f"user_{i}" for i in range(0, USERS, USERS // REPEAT)]
+        report("legacy (user_id 인덱스, Python 필터)", [bench_legacy(conn, u) for u in users])
+        report(f"offset {PAGES}페이지 (user_id 인덱스)", [bench_offset(conn, u) for u in users])
+
+        create_indexes(conn)
+        report(f"offset {PAGES}페이지 (복합 인덱스)", [bench_offset(conn, u) for u in users])
+        report(f"keyset {PAGES}페이지 (복합 인덱스)", [bench_keyset(conn, u) for u in users])
+
+        if not args.keep:
+            conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+ROUGE-L 벤치마크
+
+합성 토큰 시퀀스(원본 자막 × 요약 보고서 길이)를 크기별로 만들어
+기존 (m+1)x(n+1) DP 표 방식과 RougeService의 비트 병렬 LCS를 비교한다.
+기존 방식은 DP 칸 수가 --legacy-max-cells를 넘으면 건너뛴다 (수 GB 메모리 사용).
+
+실행: python -m benchmarks.bench_rouge [--legacy-max-cells 10000000] [--vocab 3000]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.services.rouge_service import RougeService
+
+SIZES = [(500, 100), (2000, 300), (5000, 800), (10000, 1500), (20000, 3000), (50000, 5000)]
+SEED = 42
+
+def legacy_lcs_length(x, y):
+    """기존 RougeService._calculate_rouge_l의 DP 표 구현 (비교용)"""
+    m, n = len(x), len(y)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if x[i-1] == y[j-1]:
+                dp[i][j] = dp[i-1][j-1] + 1
+            else:
+                dp[i][j] = max(dp[i-1][j], dp[i][j-1])
+
+    return dp[m][n]
+
+def synthetic_pair(reference_length: int, summary_length: int, vocab: int, rng: random.Random):
+    """원본 토큰 + 원본에서 순서를 유지하며 일부 뽑고 잡음을 섞은 요약 토큰"""
+    reference = [f"w{rng.randrange(vocab)}" for _ in range(reference_length)]
+    picked = sorted(rng.sample(range(reference_length), summary_length))
+    summary = [
+        reference[i] if rng.random() < 0.7 else f"w{rng.randrange(vocab)}"
+        for i in picked
+    ]
+    return reference, summary
+
+def measure(func, *args):
+    """(결과, 소요 시간 ms, 최대 메모리 MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="ROUGE-L 벤치마크")
+    parser.add_argument("--legacy-max-cells", type=int, default=10_000_000,
+                        help="기존 DP 방식을 실행할 최대 DP 칸 수 (m*n)")
+    parser.add_argument("--vocab", type=int, default=3000, help="합성 어휘 크기")
+    args = parser.parse_args()
+
+    service = RougeService()
+    rng = random.Random(SEED)
+
+    print(f"{'원본':>7} {'요약':>6} | {'기존 ms':>10} {'기존 MB':>9} | {'비트병렬 ms':>11} {'비트병렬 MB':>11} | {'속도 향상':>8}")
+    print("-" * 80)
+    for reference_length, summary_length in SIZES:
+        reference, summary = synthetic_pair(reference_length, summary_length, args.vocab, rng)
+
+        lcs, fast_ms, fast_mb = measure(service._lcs_length, reference, summary)
+
+        if reference_length * summary_length <= args.legacy_max_cells:
+            legacy_lcs, legacy_ms, legacy_mb = measure(legacy_lcs_length, reference, summary)
+            assert legacy_lcs == lcs, f"LCS 불일치: {legacy_lcs} != {lcs}"
+            legacy = f"{legacy_ms:>10.1f} {legacy_mb:>9.1f}"
+            speedup = f"{legacy_ms / fast_ms:>7.0f}x"
+        else:
+            legacy = f"{'건너뜀':>10} {'-':>9}"
+            speedup = f"{'-':>8}"
+
+        print(f"{reference_length:>7} {summary_length:>6} | {legacy} | {fast_ms:>11.1f} {fast_mb:>11.2f} | {speedup}")
+
+    # ROUGE-Lsum (문장 단위) 소요 시간
+    reference, summary = synthetic_pair(20000, 3000, args.vocab, rng)
+    reference_sentences = [reference[i:i + 20] for i in range(0, len(reference), 20)]
+    summary_sentences = [summary[i:i + 20] for i in range(0, len(summary), 20)]
+    _, lsum_ms, lsum_mb = measure(service._calculate_rouge_lsum, reference_sentences, summary_sentences)
+    print(f"\nROUGE-Lsum (원본 20000 / 요약 3000 토큰, 20토큰 문장): {lsum_ms:.1f} ms, {lsum_mb:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+ROUGE 일괄 평가 스크립트
+
+(reference, summary) 쌍 목록을 프로세스 풀로 평가하고 결과를 CSV/Parquet로 저장한다.
+입력: .jsonl 또는 .csv (컬럼: id, reference, summary)
+
+실행: python evaluate_rouge.py pairs.jsonl -o rouge_results.csv [--workers 8]
+"""
+
+import argparse
+import csv
+import json
+import statistics
+import sys
+import time
+
+from app.services.rouge_service import rouge_service
+
+def load_pairs(path: str) -> list:
+    """입력 파일에서 평가 쌍 읽기"""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            pairs = [json.loads(line) for line in f if line.strip()]
+    elif path.endswith(".csv"):
+        # 자막 원문은 기본 필드 크기 제한(128KB)을 넘을 수 있음
+        csv.field_size_limit(sys.maxsize)
+        with open(path, newline="", encoding="utf-8") as f:
+            pairs = list(csv.DictReader(f))
+    else:
+        raise ValueError("입력 파일은 .jsonl 또는 .csv여야 합니다.")
+
+    missing = [i for i, pair in enumerate(pairs) if not pair.get("reference") or not pair.get("summary")]
+    if missing:
+        raise ValueError(f"reference/summary가 없는 행: {missing[:10]}")
+    return pairs
+
+def main():
+    parser = argparse.ArgumentParser(description="ROUGE 일괄 평가")
+    parser.add_argument("input", help="평가 쌍 파일 (.jsonl / .csv)")
+    parser.add_argument("-o", "--output", default="rouge_results.csv", help="결과 파일 (.csv / .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.input)
+    print(f"📥 평가 쌍 {len(pairs)}개 로드: {args.input}")
+
+    start = time.perf_counter()
+    rows = rouge_service.evaluate_batch(pairs, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    rouge_service.write_results(rows, args.output)
+    print(f"💾 결과 저장: {args.output} ({elapsed:.1f}초)")
+
+    scored = [row for row in rows if not row["error"]]
+    if scored:
+        for prefix in ("rouge1", "rouge2", "rougeL", "rougeLsum"):
+            print(f"   {prefix:<10} F1 평균: {statistics.mean(row[f'{prefix}_f1'] for row in scored):.4f}")
+    failed = len(rows) - len(scored)
+    if failed:
+        print(f"⚠️ 평가 실패: {failed}쌍 (error 컬럼 확인)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+목록 조회 인덱스 마이그레이션 스크립트
+
+create_all()은 이미 존재하는 테이블에 인덱스를 추가하지 않으므로
+운영 DB에는 이 스크립트로 인덱스를 생성한다. (CONCURRENTLY - 테이블 잠금 없음)
+"""
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+INDEX_STATEMENTS = [
+    # job_id 직접 조회
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_reports_job_id "
+    "ON user_reports (job_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_audio_files_job_id "
+    "ON user_audio_files (job_id)",
+    # 키셋 페이지네이션 (user_id [, job_type], created_at DESC, id DESC)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_analysis_jobs_user_type_created "
+    "ON user_analysis_jobs (user_id, job_type, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_analysis_jobs_user_created "
+    "ON user_analysis_jobs (user_id, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_analysis_jobs_type_created "
+    "ON user_analysis_jobs (job_type, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_reports_user_created "
+    "ON user_reports (user_id, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_audio_files_user_created "
+    "ON user_audio_files (user_id, created_at DESC, id DESC)",
+]
+
+def migrate_indexes():
+    """목록 조회용 인덱스 생성"""
+    print("인덱스 마이그레이션 중...")
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서 실행해야 함
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in INDEX_STATEMENTS:
+            print(f"- {statement}")
+            conn.execute(text(statement))
+        conn.execute(text("ANALYZE user_analysis_jobs"))
+        conn.execute(text("ANALYZE user_reports"))
+        conn.execute(text("ANALYZE user_audio_files"))
+    print("✅ 인덱스 마이그레이션 완료!")
+
+if __name__ == "__main__":
+    migrate_indexes()